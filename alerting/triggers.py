@@ -69,12 +69,18 @@ class AlertTrigger:
         ip_ident = claim.get("ip_network_identifier", "").lower() if claim.get("ip_network_identifier") else ""
         domain_ident = claim.get("domain_network_identifier", "").lower() if claim.get("domain_network_identifier") else ""
         
-        # Check domain matches manually without using the cache
+        # Check domain matches manually; the domain cache rejects domains
+        # that match nothing on the watchlist without scanning it
         if domain_ident:
             self.logger.debug(f"Checking domain: {domain_ident}")
             normalized_domain = normalize_domain(domain_ident)
             
-            for domain_info in self._cached_domain_identifiers:
+            candidates = (
+                self._cached_domain_identifiers
+                if self.domain_cache.find_matches(normalized_domain)
+                else ()
+            )
+            for domain_info in candidates:
                 domain_value = domain_info['value']
                 if is_domain_match(normalized_domain, domain_value):
                     matches.append(domain_info['original'])
@@ -122,7 +128,7 @@ class AlertTrigger:
         matches = self.check_match(claim)
         self.logger.debug(f"Found {len(matches)} matches for claim")
         
-        alerts = []
+        pending = []
         for identifier in matches:
             # Get identifier info using dictionary access
             id_type = identifier['identifier_type'] if 'identifier_type' in identifier else "unknown"
@@ -133,19 +139,32 @@ class AlertTrigger:
             message = f"ALERT: {claim['collector']} reported {claim['name_network_identifier']} " \
                     f"from threat actor {claim['threat_actor']} matches watchlist identifier " \
                     f"{id_type}:{id_value}"
-            
-            try:
-                alert_id = self.database.add_alert(identifier['id'], message)
-                if alert_id:
-                    self.logger.warning(message)
-                    alerts.append({
-                        "id": alert_id,
-                        "message": message,
-                        "identifier": identifier
-                    })
-                else:
-                    self.logger.error(f"Failed to add alert to database")
-            except Exception as e:
-                self.logger.error(f"Error creating alert: {str(e)}")
+            pending.append((identifier, message))
+        
+        if not pending:
+            return []
+        
+        # Store all alerts for this claim in one transaction
+        try:
+            alert_ids = self.database.bulk_add_alerts([
+                {"identifier_id": identifier['id'], "message": message}
+                for identifier, message in pending
+            ])
+        except Exception as e:
+            self.logger.error(f"Error creating alerts: {str(e)}")
+            return []
+        
+        if not alert_ids:
+            self.logger.error("Failed to add alerts to database")
+            return []
+        
+        alerts = []
+        for (identifier, message), alert_id in zip(pending, alert_ids):
+            self.logger.warning(message)
+            alerts.append({
+                "id": alert_id,
+                "message": message,
+                "identifier": identifier
+            })
                     
         return alerts
\ No newline at end of file
@@ -148,7 +148,7 @@ def main():
         config = Config()
         interval = args.interval or config.get_interval()
         
-        database = DatabaseService(config.get_database_path())
+        database = DatabaseService(config.get_database_path(), config.get_sqlite_synchronous())
         database.initialize()
         
         collectors = [
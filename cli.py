@@ -43,7 +43,7 @@ class CLI:
         # Load configuration
         self.config = Config()
         # Updated to use DatabaseService
-        self.database = DatabaseService(self.config.get_database_path())
+        self.database = DatabaseService(self.config.get_database_path(), self.config.get_sqlite_synchronous())
         self.database.initialize()
         
         # Set up logging
@@ -103,7 +103,7 @@ class Dashboard:
             Dict with database statistics
         """
         try:
-            return self.database.get_statistics()
+            return self.database.get_statistics(exact=False)
         except Exception as e:
             self.logger.error(f"Error getting database statistics: {str(e)}")
             return {
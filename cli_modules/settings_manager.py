@@ -27,7 +27,7 @@ class SettingsManager:
             try:
                 interval = int(new_interval)
                 if interval > 0:
-                    self.config.set_interval(interval)
+                    self.config.set_interval(interval, sync=True)
                     print(f"\nInterval updated to {interval} seconds.")
                     
                     # If collection is running, restart it with the new interval
@@ -49,7 +49,7 @@ class SettingsManager:
             log_level_choice = log_level_choice.upper()
             try:
                 if log_level_choice in ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]:
-                    self.config.set_log_level(log_level_choice)
+                    self.config.set_log_level(log_level_choice, sync=True)
                     print(f"\nLog level updated to {log_level_choice}.")
                 else:
                     print("\nInvalid log level. Must be one of: DEBUG, INFO, WARNING, ERROR, CRITICAL")
@@ -4,9 +4,18 @@ Test management for the ransomware intelligence system.
 """
 
 import logging
+import re
 import sys
 import importlib
 from .ui import clear_screen, print_header, menu
+from utils.html_utils import extract_omegalock_rows
+
+# Patterns used by the parser test replicas, compiled once
+_TITLE_RE = re.compile(r'<title>(.*?)</title>', re.IGNORECASE)
+_COMPANY_FALLBACK_RE = re.compile(
+    r'<td>([\w\s\.\,\&\;\-]+(?:Company|LLC|Inc|Ltd|GmbH|Corp|SA|AG|BV)?)</td>',
+    re.IGNORECASE
+)
 
 class TestManager:
     """Manages testing functionality"""
@@ -355,9 +364,10 @@ class TestManager:
                 # Get HTML from file
                 file_path = input("\nEnter path to HTML file: ").strip()
                 try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        html_content = f.read()
-                    print(f"\nLoaded {len(html_content)} bytes from {file_path}")
+                    with open(file_path, 'rb') as f:
+                        raw_html = f.read()
+                    html_content = raw_html.decode('utf-8')
+                    print(f"\nLoaded {len(raw_html)} bytes from {file_path}")
                 except Exception as e:
                     print(f"\nError loading file: {str(e)}")
                     input("\nPress Enter to return to the test menu...")
@@ -420,7 +430,7 @@ class TestManager:
                 
                 if html:
                     html_content = html
-                    print(f"\nFetched {len(html_content)} bytes from Omegalock site.")
+                    print(f"\nFetched {len(html_content)} characters from Omegalock site.")
                 else:
                     print(f"\nError fetching HTML: {metadata.get('error', 'Unknown error')}")
                     input("\nPress Enter to return to the test menu...")
@@ -439,36 +449,21 @@ class TestManager:
                 
                 try:
                     # Extract title
-                    title_match = re.search(r'<title>(.*?)</title>', html_content, re.IGNORECASE)
+                    title_match = _TITLE_RE.search(html_content)
                     if title_match:
                         title = title_match.group(1).strip()
                     
-                    # Find data table
-                    table_match = re.search(r'<table class="datatable center">(.*?)</table>', html_content, re.DOTALL | re.IGNORECASE)
+                    # Find data table rows as (cell texts, link)
+                    victim_rows = extract_omegalock_rows(html_content)
                     
-                    if table_match:
-                        table_content = table_match.group(1)
-                        
-                        # Extract rows
-                        victim_rows = re.findall(r'<tr class=[\'"]trow[\'"]>(.*?)</tr>', table_content, re.DOTALL | re.IGNORECASE)
-                        
+                    if victim_rows is not None:
                         print(f"\nFound {len(victim_rows)} victim rows in the table")
                         
                         # Process each row
-                        for row in victim_rows:
-                            # Extract cells
-                            cells = re.findall(r'<td.*?>(.*?)</td>', row, re.DOTALL | re.IGNORECASE)
-                            
+                        for cells, link in victim_rows:
                             if len(cells) >= 5:
                                 # Extract only essential data
-                                company_name = re.sub(r'<.*?>', '', cells[0]).strip()
-                                tags = re.sub(r'<.*?>', '', cells[2]).strip()
-                                data_size = re.sub(r'<.*?>', '', cells[3]).strip()
-                                last_updated = re.sub(r'<.*?>', '', cells[4]).strip()
-                                
-                                # Extract link
-                                link_match = re.search(r'href="([^"]+)"', cells[5] if len(cells) > 5 else "", re.IGNORECASE)
-                                link = link_match.group(1) if link_match else ""
+                                company_name, _, tags, data_size, last_updated = cells[:5]
                                 
                                 victims.append({
                                     "name": company_name,
@@ -481,11 +476,7 @@ class TestManager:
                         print("\nData table not found in HTML!")
                         
                         # Try fallback extraction
-                        company_patterns = re.findall(
-                            r'<td>([\w\s\.\,\&\;\-]+(?:Company|LLC|Inc|Ltd|GmbH|Corp|SA|AG|BV)?)</td>',
-                            html_content,
-                            re.IGNORECASE
-                        )
+                        company_patterns = _COMPANY_FALLBACK_RE.findall(html_content)
                         
                         if company_patterns:
                             print(f"\nFallback extraction found {len(company_patterns)} potential company names")
@@ -620,9 +611,10 @@ class TestManager:
                 # Get HTML from file
                 file_path = input("\nEnter path to HTML file: ").strip()
                 try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        html_content = f.read()
-                    print(f"\nLoaded {len(html_content)} bytes from {file_path}")
+                    with open(file_path, 'rb') as f:
+                        raw_html = f.read()
+                    html_content = raw_html.decode('utf-8')
+                    print(f"\nLoaded {len(raw_html)} bytes from {file_path}")
                 except Exception as e:
                     print(f"\nError loading file: {str(e)}")
                     input("\nPress Enter to return to the test menu...")
@@ -693,7 +685,7 @@ class TestManager:
                 
                 if html:
                     html_content = html
-                    print(f"\nFetched {len(html_content)} bytes from {parser_type} site.")
+                    print(f"\nFetched {len(html_content)} characters from {parser_type} site.")
                 else:
                     print(f"\nError fetching HTML: {metadata.get('error', 'Unknown error')}")
                     input("\nPress Enter to return to the test menu...")
@@ -715,39 +707,21 @@ class TestManager:
                     
                     try:
                         # Extract title
-                        title_match = re.search(r'<title>(.*?)</title>', html_content, re.IGNORECASE)
+                        title_match = _TITLE_RE.search(html_content)
                         if title_match:
                             title = title_match.group(1).strip()
                         
-                        # Find data table
-                        table_match = re.search(r'<table class="datatable center">(.*?)</table>', html_content, re.DOTALL | re.IGNORECASE)
+                        # Find data table rows as (cell texts, link)
+                        victim_rows = extract_omegalock_rows(html_content)
                         
-                        if table_match:
-                            table_content = table_match.group(1)
-                            
-                            # Extract rows
-                            victim_rows = re.findall(r'<tr class=[\'"]trow[\'"]>(.*?)</tr>', table_content, re.DOTALL | re.IGNORECASE)
-                            
+                        if victim_rows is not None:
                             print(f"\nFound {len(victim_rows)} victim rows in the table")
                             
                             # Process each row
-                            for row in victim_rows:
-                                # Extract cells
-                                cells = re.findall(r'<td.*?>(.*?)</td>', row, re.DOTALL | re.IGNORECASE)
-                                
+                            for cells, link in victim_rows:
                                 if len(cells) >= 5:
                                     # Extract fields from cells
-                                    company_name = re.sub(r'<.*?>', '', cells[0]).strip()
-                                    leak_percentage = re.sub(r'<.*?>', '', cells[1]).strip()
-                                    tags = re.sub(r'<.*?>', '', cells[2]).strip()
-                                    data_size = re.sub(r'<.*?>', '', cells[3]).strip()
-                                    last_updated = re.sub(r'<.*?>', '', cells[4]).strip()
-                                    
-                                    # Extract link
-                                    link_match = re.search(r'href="([^"]+)"', cells[5] if len(cells) > 5 else "", re.IGNORECASE)
-                                    link = link_match.group(1) if link_match else ""
-                                    
-                                    company_name = re.sub(r'<[^>]*>', '', company_name).strip()
+                                    company_name, leak_percentage, tags, data_size, last_updated = cells[:5]
                                     
                                     if company_name:  # Only add if we have a company name
                                         victims.append({
@@ -764,11 +738,7 @@ class TestManager:
                             print("\nData table not found in HTML!")
                             
                             # Try fallback extraction
-                            company_patterns = re.findall(
-                                r'<td>([\w\s\.\,\&\;\-]+(?:Company|LLC|Inc|Ltd|GmbH|Corp|SA|AG|BV)?)</td>',
-                                html_content,
-                                re.IGNORECASE
-                            )
+                            company_patterns = _COMPANY_FALLBACK_RE.findall(html_content)
                             
                             if company_patterns:
                                 print(f"\nFallback extraction found {len(company_patterns)} potential company names")
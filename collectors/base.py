@@ -1,15 +1,31 @@
 # collectors/base.py
 import logging
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Union, Iterator
 from datetime import datetime
 
-import requests
+import urllib3
 from utils.domain_utils import normalize_domain
 from utils.time_utils import parse_timestamp
+from utils.json_utils import dumps as json_dumps, loads as json_loads
 from utils.types import ClaimDict  # Import the type alias
 import abc
 from utils.error_utils import handle_exception, NetworkError
 
+try:
+    import ijson
+except ImportError:  # pragma: no cover - optional dependency
+    ijson = None
+
+# Shared connection pool for all API collectors, with retries on transient server errors.
+# Compressed responses are requested (brotli too when the brotli package is installed)
+# and decoded transparently by urllib3.
+_POOL = urllib3.PoolManager(
+    num_pools=8,
+    maxsize=32,
+    headers=urllib3.util.make_headers(accept_encoding=True),
+    retries=urllib3.Retry(total=3, backoff_factor=0.5, status_forcelist=[500, 502, 503, 504])
+)
+_REQUEST_TIMEOUT = urllib3.Timeout(connect=10.0, read=60.0)
 
 
 class BaseCollector(abc.ABC):
@@ -20,6 +36,7 @@ class BaseCollector(abc.ABC):
     - HTTP request handling
     - Domain normalization
     - Timestamp parsing
+    - Raw data serialization
     - Logging
     
     All collector implementations should inherit from this class and implement
@@ -61,13 +78,15 @@ class BaseCollector(abc.ABC):
         Returns:
             JSON response or None if error occurred
         """
+        url = f"{self.base_url}{endpoint}"
         try:
-            url = f"{self.base_url}{endpoint}"
-            self.logger.debug(f"Making request to {url}")
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
+            self.logger.debug("Making request to %s", url)
+            response = _POOL.request("GET", url, fields=params, timeout=_REQUEST_TIMEOUT)
+            if response.status >= 400:
+                raise urllib3.exceptions.HTTPError(f"HTTP {response.status} for url: {url}")
+            self.logger.debug("Response Content-Encoding: %s", response.headers.get('Content-Encoding'))
+            return json_loads(response.data)
+        except (urllib3.exceptions.HTTPError, ValueError) as e:
             return handle_exception(
                 e, 
                 self.logger, 
@@ -77,6 +96,77 @@ class BaseCollector(abc.ABC):
                 default_return=None
             )
     
+    def stream_request(self, endpoint: str) -> Optional[Iterator[Any]]:
+        """
+        Request an endpoint returning a JSON array and iterate over its items.
+        
+        When ijson is installed the body is parsed incrementally while it
+        downloads, so the full array is never held in memory. Otherwise the
+        whole body is parsed at once.
+        
+        Args:
+            endpoint: API endpoint to call
+            
+        Returns:
+            Iterator over the array items, or None if the request failed
+            
+        Raises:
+            NetworkError: While iterating, if the response breaks off midway
+        """
+        url = f"{self.base_url}{endpoint}"
+        try:
+            self.logger.debug("Streaming request to %s", url)
+            response = _POOL.request("GET", url, preload_content=False, timeout=_REQUEST_TIMEOUT)
+            if response.status >= 400:
+                response.release_conn()
+                raise urllib3.exceptions.HTTPError(f"HTTP {response.status} for url: {url}")
+            self.logger.debug("Response Content-Encoding: %s", response.headers.get('Content-Encoding'))
+            if ijson is None:
+                try:
+                    data = json_loads(response.read())
+                finally:
+                    response.release_conn()
+                return iter(data) if isinstance(data, list) else None
+        except (urllib3.exceptions.HTTPError, ValueError) as e:
+            return handle_exception(
+                e,
+                self.logger,
+                f"Error making request to {url}",
+                reraise=False,
+                reraise_as=NetworkError,
+                default_return=None
+            )
+        
+        return self._iter_json_array(response, url)
+    
+    def _iter_json_array(self, response: Any, url: str) -> Iterator[Any]:
+        """
+        Incrementally parse the items of a streamed JSON array response.
+        
+        Args:
+            response: urllib3 response opened with preload_content=False
+            url: Request URL, used for error messages
+            
+        Yields:
+            Items of the top-level JSON array
+            
+        Raises:
+            NetworkError: If the response breaks off midway, so a truncated
+                array is never mistaken for a complete one
+        """
+        try:
+            yield from ijson.items(response, "item", use_float=True)
+        except (urllib3.exceptions.HTTPError, ijson.JSONError) as e:
+            handle_exception(
+                e,
+                self.logger,
+                f"Error reading response from {url}",
+                reraise=True,
+                reraise_as=NetworkError
+            )
+        finally:
+            response.release_conn()
+    
     def normalize_domain(self, domain: Optional[str]) -> str:
         """
         Normalize domain for consistent comparison.
@@ -102,3 +192,17 @@ class BaseCollector(abc.ABC):
             Parsed datetime object or current time if parsing fails
         """
         return parse_timestamp(datetime_str)
+    
+    def serialize_raw_data(self, item: Any) -> str:
+        """
+        Serialize a source record for storage in the raw_data field.
+        
+        Uses JSON rather than repr() so the stored value can be parsed back.
+        
+        Args:
+            item: Source record (typically a dict)
+            
+        Returns:
+            JSON string representation of the record
+        """
+        return json_dumps(item)
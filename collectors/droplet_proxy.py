@@ -1,5 +1,5 @@
 # collectors/droplet_proxy.py
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from .base import BaseCollector
 import requests
 import hmac
@@ -7,11 +7,24 @@ import hashlib
 import time
 import logging
 import random
+import threading
+from urllib3.util.request import ACCEPT_ENCODING
 from utils.error_utils import handle_exception, NetworkError
 
+# hmac.digest() only takes the fast one-shot path when hashlib is backed by OpenSSL
+if not type(hashlib.sha256()).__module__.startswith("_hashlib"):
+    logging.getLogger("collector.droplet_proxy").warning(
+        "OpenSSL-backed hashlib not available, API key signing will use the slower builtin SHA-256"
+    )
+
 class DropletProxyCollector(BaseCollector):
     """Collector that delegates .onion requests to a dedicated Droplet"""
     
+    # Health check results shared by all collectors, keyed by Droplet endpoint
+    _HEALTH_CACHE: Dict[str, Tuple[float, bool]] = {}
+    _HEALTH_TTL = 30.0  # seconds
+    _HEALTH_LOCK = threading.Lock()
+    
     def __init__(self, name, onion_url, parser_type="generic"):
         """
         Initialize the Droplet proxy collector.
@@ -27,53 +40,56 @@ class DropletProxyCollector(BaseCollector):
         config = Config()
         self.endpoint = config.get_droplet_endpoint()
         self.api_secret = config.get_droplet_api_secret()
+        self._api_secret_bytes = self.api_secret.encode()
+        self._sig_cache: Tuple[Optional[str], Optional[str]] = (None, None)
         self.parser_type = parser_type
         self.max_retries = 3
-        self.retry_delay = 5  # seconds
+        self.retry_delay = 5  # seconds, base for exponential backoff
+        self.max_retry_delay = 30.0  # seconds, cap for a single backoff
+        self.retry_deadline = 120.0  # seconds, bound on total time spent retrying
         
     def collect(self):
         """Default collect method that delegates to specialized methods"""
-        self.logger.info(f"Collecting from {self.name} using {self.parser_type} parser")
+        self.logger.info("Collecting from %s using %s parser", self.name, self.parser_type)
         
         # Check if Tor proxy is available before attempting collection
         if not self._is_tor_proxy_available():
-            self.logger.warning(f"Tor proxy not available. Skipping collection for {self.name}")
+            self.logger.warning("Tor proxy not available. Skipping collection for %s", self.name)
             return []
             
         return self._process_response(self._collect_via_droplet())
         
-    def _collect_via_droplet(self):
+    def _collect_via_droplet(self, url: Optional[str] = None):
         """
         Request collection via the Droplet API with retry mechanism.
         
+        Args:
+            url: URL to collect from (defaults to self.base_url)
+            
         Returns:
             Dictionary with response data or None if error
         """
+        # Resolve the target once; never read or mutate self.base_url during retries
+        target_url = url or self.base_url
+        if not target_url.startswith(("http://", "https://")):
+            target_url = f"http://{target_url}"
+        
         retries = 0
+        deadline = time.monotonic() + self.retry_deadline
         while retries < self.max_retries:
             try:
                 # Generate a secure API key
-                timestamp = str(int(time.time()))
-                signature = hmac.new(
-                    self.api_secret.encode(), 
-                    timestamp.encode(),
-                    hashlib.sha256
-                ).hexdigest()
-                api_key = f"{timestamp}:{signature}"
+                api_key = self._generate_api_key()
                 
                 # Make request to Droplet API
-                self.logger.debug(f"Requesting {self.base_url} via Droplet with parser {self.parser_type}")
-                
-                # Ensure the URL is properly formatted
-                target_url = self.base_url
-                if not target_url.startswith(("http://", "https://")):
-                    target_url = f"http://{target_url}"
+                self.logger.debug("Requesting %s via Droplet with parser %s", target_url, self.parser_type)
                 
                 response = requests.post(
                     f"{self.endpoint}/collect",
                     headers={
                         "X-API-Key": api_key,
-                        "Content-Type": "application/json"
+                        "Content-Type": "application/json",
+                        "Accept-Encoding": ACCEPT_ENCODING
                     },
                     json={
                         "url": target_url, 
@@ -85,21 +101,18 @@ class DropletProxyCollector(BaseCollector):
                 
                 # Check for error status codes
                 if response.status_code >= 400:
-                    self.logger.error(f"Droplet API error: {response.status_code}")
+                    self.logger.error("Droplet API error: %s", response.status_code)
                     if response.headers.get('Content-Type', '').startswith('application/json'):
                         try:
                             error_details = response.json()
-                            self.logger.error(f"Error details: {error_details}")
+                            self.logger.error("Error details: %s", error_details)
                         except:
                             pass
                     
                     # Only retry on specific error codes or connection errors
                     if response.status_code in (429, 500, 502, 503, 504):
                         retries += 1
-                        if retries < self.max_retries:
-                            delay = self.retry_delay + random.uniform(0, 2)  # Add jitter
-                            self.logger.info(f"Retrying in {delay:.1f} seconds...")
-                            time.sleep(delay)
+                        if retries < self.max_retries and self._wait_before_retry(retries, deadline):
                             continue
                         else:
                             return None
@@ -108,23 +121,59 @@ class DropletProxyCollector(BaseCollector):
                         return None
                 
                 response.raise_for_status()
+                self.logger.debug("Droplet response Content-Encoding: %s", response.headers.get('Content-Encoding'))
                 return response.json()
                 
             except requests.RequestException as e:
-                self.logger.error(f"Request error: {e}")
+                self.logger.error("Request error: %s", e)
                 retries += 1
-                if retries < self.max_retries:
-                    delay = self.retry_delay + random.uniform(0, 2)  # Add jitter
-                    self.logger.info(f"Retrying in {delay:.1f} seconds...")
-                    time.sleep(delay)
-                else:
+                if retries >= self.max_retries or not self._wait_before_retry(retries, deadline):
                     return None
             except ValueError as e:
-                self.logger.error(f"Error parsing JSON response from Droplet: {e}")
+                self.logger.error("Error parsing JSON response from Droplet: %s", e)
                 return None
         
         return None
     
+    def _wait_before_retry(self, attempt: int, deadline: float) -> bool:
+        """
+        Sleep for an exponential backoff delay with full jitter.
+        
+        The delay is drawn uniformly from [0, min(max_retry_delay, retry_delay * 2**attempt)]
+        so that collectors failing at the same moment do not retry in lockstep.
+        
+        Args:
+            attempt: Number of attempts made so far
+            deadline: time.monotonic() value after which no more retries are made
+            
+        Returns:
+            True if the caller should retry, False if the deadline would be exceeded
+        """
+        delay = random.uniform(0, min(self.max_retry_delay, self.retry_delay * (2 ** attempt)))
+        if time.monotonic() + delay > deadline:
+            self.logger.warning("Retry deadline reached, giving up")
+            return False
+        self.logger.info("Retrying in %.1f seconds...", delay)
+        time.sleep(delay)
+        return True
+    
+    def _generate_api_key(self) -> str:
+        """
+        Generate a timestamped HMAC API key for the Droplet.
+        
+        The signature only depends on the current second, so it is reused
+        for repeated calls (e.g. retries) within the same second.
+        
+        Returns:
+            API key in the form "timestamp:signature"
+        """
+        timestamp = str(int(time.time()))
+        cached_timestamp, signature = self._sig_cache
+        if cached_timestamp != timestamp:
+            signature = hmac.digest(self._api_secret_bytes, timestamp.encode(), "sha256").hex()
+            self._sig_cache = (timestamp, signature)
+        return f"{timestamp}:{signature}"
+    
     def _process_response(self, data):
         """
         Process the response from the Droplet.
@@ -141,14 +190,38 @@ class DropletProxyCollector(BaseCollector):
             
         # Check for error in response
         if isinstance(data, dict) and "error" in data:
-            self.logger.error(f"Error from Droplet: {data['error']}")
+            self.logger.error("Error from Droplet: %s", data['error'])
             return []
             
         # Default processing just returns an empty list
         # Subclasses should implement their own processing
         return []
     
-    def _is_tor_proxy_available(self) -> bool:
+    def _is_tor_proxy_available(self, force: bool = False) -> bool:
+        """
+        Check if the Tor proxy is available, using a short-lived cached result.
+        
+        The health endpoint is only queried when no result for this endpoint
+        has been cached within the last _HEALTH_TTL seconds.
+        
+        Args:
+            force: Skip the cache and always query the health endpoint
+            
+        Returns:
+            bool: True if Tor proxy is available and working, False otherwise
+        """
+        cls = DropletProxyCollector
+        with cls._HEALTH_LOCK:
+            if not force:
+                cached = cls._HEALTH_CACHE.get(self.endpoint)
+                if cached and time.monotonic() - cached[0] < cls._HEALTH_TTL:
+                    return cached[1]
+            
+            tor_working = self._check_tor_proxy_health()
+            cls._HEALTH_CACHE[self.endpoint] = (time.monotonic(), tor_working)
+            return tor_working
+    
+    def _check_tor_proxy_health(self) -> bool:
         """
         Check if the Tor proxy is available by making a request to the health endpoint.
         
@@ -163,7 +236,7 @@ class DropletProxyCollector(BaseCollector):
             response = requests.get(health_url, timeout=5)
             
             if response.status_code != 200:
-                self.logger.warning(f"Tor proxy health check failed with status code: {response.status_code}")
+                self.logger.warning("Tor proxy health check failed with status code: %s", response.status_code)
                 return False
                 
             status = response.json()
@@ -175,8 +248,8 @@ class DropletProxyCollector(BaseCollector):
             return tor_working
             
         except requests.RequestException as e:
-            self.logger.warning(f"Tor proxy health check failed: {str(e)}")
+            self.logger.warning("Tor proxy health check failed: %s", e)
             return False
         except Exception as e:
-            self.logger.error(f"Unexpected error checking Tor proxy: {str(e)}")
+            self.logger.error("Unexpected error checking Tor proxy: %s", e)
             return False
\ No newline at end of file
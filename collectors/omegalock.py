@@ -1,4 +1,5 @@
 # collectors/omegalock.py
+import re
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 from .onion_base import OnionCollector
@@ -11,6 +12,9 @@ class OmegalockCollector(OnionCollector):
     and transforms it into the standardized claim format used by the application.
     """
     
+    # Names containing any of these indicators are treated as debug/placeholder rows
+    _DEBUG_RE = re.compile(r"debug:|test:|placeholder|unknown", re.IGNORECASE)
+    
     def __init__(self) -> None:
         """Initialize the Omega Lock collector"""
         # List of known addresses - primary first, fallbacks after
@@ -35,15 +39,29 @@ class OmegalockCollector(OnionCollector):
             List of processed claims that match our database schema
         """
         processed_data = []
+        collector_name = self.name
+        base_stripped = self.base_url.rstrip("/")
+        
+        skipped = 0
         
         for victim in victims:
+            if not isinstance(victim, dict):
+                skipped += 1
+                continue
+            
             try:
+                name = victim.get("name")
+                timestamp_str = victim.get("date")
+                domain_raw = victim.get("domain")
+                link = victim.get("link")
+                leak_percentage = victim.get("leak_percentage")
+                data_size = victim.get("data_size")
+                
                 # Skip debug entries 
-                if self._is_debug_entry(victim.get("name")):
+                if self._is_debug_entry(name):
                     continue
                 
                 # Parse timestamp using consistent format from the site
-                timestamp_str = victim.get("date")
                 if timestamp_str:
                     try:
                         # Site format appears to be YYYY-MM-DD
@@ -57,24 +75,23 @@ class OmegalockCollector(OnionCollector):
                 
                 # Process domain if it exists (not in current data)
                 domain = None
-                if victim.get("domain"):
-                    domain = self.normalize_domain(victim.get("domain"))
+                if domain_raw:
+                    domain = self.normalize_domain(domain_raw)
                 
                 # Build claim URL, combining base URL with specific link if available
                 claim_url = self.base_url
-                if victim.get("link") and victim.get("link").startswith("/"):
+                if link and link.startswith("/"):
                     # Handle relative URLs
-                    base = self.base_url.rstrip("/")
-                    claim_url = f"{base}{victim.get('link')}"
-                elif victim.get("link"):
-                    claim_url = victim.get("link")
+                    claim_url = f"{base_stripped}{link}"
+                elif link:
+                    claim_url = link
                 
                 # Create a comprehensive comment with all available metadata
                 comment_parts = []
-                if victim.get("leak_percentage"):
-                    comment_parts.append(f"Leak: {victim.get('leak_percentage')}")
-                if victim.get("data_size"):
-                    comment_parts.append(f"Size: {victim.get('data_size')}")  # Changed from "Data:" to "Size:" to match test
+                if leak_percentage:
+                    comment_parts.append(f"Leak: {leak_percentage}")
+                if data_size:
+                    comment_parts.append(f"Size: {data_size}")  # Changed from "Data:" to "Size:" to match test
                 if timestamp_str:
                     comment_parts.append(f"Published: {timestamp_str}")
                 
@@ -82,24 +99,28 @@ class OmegalockCollector(OnionCollector):
                 
                 # Create the processed claim with only the fields needed for our schema
                 processed_item: Dict[str, Any] = {
-                    "collector": self.name,
+                    "collector": collector_name,
                     "threat_actor": "omegalock",
-                    "name_network_identifier": victim.get("name"),
+                    "name_network_identifier": name,
                     "ip_network_identifier": None,
                     "domain_network_identifier": domain,
                     "sector": victim.get("sector"),  # Use tags as sector
                     "comment": comment,
-                    "raw_data": str(victim),  # Keep all original data in raw_data
+                    "raw_data": self.serialize_raw_data(victim),  # Keep all original data in raw_data
                     "claim_url": claim_url,
                     "timestamp": timestamp
                 }
                 
                 processed_data.append(processed_item)
-                self.logger.debug(f"Processed victim: {processed_item['name_network_identifier']}")
+                self.logger.debug("Processed victim: %s", processed_item['name_network_identifier'])
                 
-            except Exception as e:
-                self.logger.error(f"Error processing victim {victim.get('name', 'Unknown')}: {str(e)}")
+            except (ValueError, TypeError, AttributeError) as e:
+                self.logger.error("Error processing victim %s: %s", victim.get('name', 'Unknown'), e)
+                skipped += 1
                 continue
+        
+        if skipped:
+            self.logger.warning("Skipped %s malformed victim entries from %s", skipped, self.name)
                 
         return processed_data
     
@@ -113,14 +134,4 @@ class OmegalockCollector(OnionCollector):
         Returns:
             True if this appears to be a debug entry
         """
-        if not name:
-            return True
-            
-        debug_indicators = ["debug:", "test:", "placeholder", "unknown"]
-        name_lower = name.lower()
-        
-        for indicator in debug_indicators:
-            if indicator in name_lower:
-                return True
-                
-        return False
\ No newline at end of file
+        return not name or self._DEBUG_RE.search(name) is not None
\ No newline at end of file
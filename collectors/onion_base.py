@@ -2,6 +2,7 @@
 from typing import List, Dict, Any, Optional
 from .droplet_proxy import DropletProxyCollector
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import logging
 
 class OnionCollector(DropletProxyCollector):
@@ -39,87 +40,105 @@ class OnionCollector(DropletProxyCollector):
         
         Strategy:
         1. Check if Tor proxy is available
-        2. Try primary URL
-        3. If unreachable, try fallbacks in sequence
-        4. Return whatever data we can get
+        2. Try primary and fallback URLs in parallel
+        3. Return the first successful response
         
         Returns:
             List of processed claims
         """
-        self.logger.info(f"Collecting data from {self.name}")
+        self.logger.info("Collecting data from %s", self.name)
         
         # First check if the Tor proxy is running
         if not self._is_tor_proxy_available():
-            self.logger.warning(f"Tor proxy not available. Skipping collection for {self.name}")
+            self.logger.warning("Tor proxy not available. Skipping collection for %s", self.name)
             return []
             
-        # Try primary URL first
+        # Try primary and fallback URLs
         data = self._collect_with_fallbacks()
         
         if not data:
-            self.logger.warning(f"No data received from any {self.name} onion sites")
+            self.logger.warning("No data received from any %s onion sites", self.name)
             return []
             
         victims = data.get("victims", [])
-        self.logger.info(f"Processing {len(victims)} victims from {self.name}")
+        self.logger.info("Processing %s victims from %s", len(victims), self.name)
         
         # Process the victims data
         processed_data = self._process_victims(victims)
         
-        self.logger.info(f"Processed {len(processed_data)} claims from {self.name}")
+        self.logger.info("Processed %s claims from %s", len(processed_data), self.name)
         return processed_data
     
     def _collect_with_fallbacks(self) -> Optional[Dict[str, Any]]:
         """
-        Try collecting data from primary URL, falling back to alternatives if needed.
+        Try collecting data from the primary and fallback URLs in parallel.
+        
+        All URLs are requested concurrently and the first successful response
+        wins, so a slow or offline primary does not delay the fallbacks.
         
         Returns:
             Data dictionary or None if all URLs failed
         """
-        # Try primary URL first
-        self.logger.info(f"Trying primary URL: {self.base_url}")
-        data = self._collect_via_droplet()
-        
-        # If successful, return the data
-        if data and not (isinstance(data, dict) and "error" in data):
-            self.logger.info(f"Successfully collected data from primary URL")
-            return data
-            
-        # Log the failure
-        if data and isinstance(data, dict) and "error" in data:
-            self.logger.error(f"Error collecting from primary URL: {data.get('error')}")
-        else:
-            self.logger.error(f"Failed to collect data from primary URL")
-        
-        # Try fallback URLs
-        for fallback_url in self.fallback_urls:
-            self.logger.info(f"Trying fallback URL: {fallback_url}")
-            
-            # Temporarily change the base URL
-            original_url = self.base_url
-            self.base_url = fallback_url
-            
-            # Try collecting from this fallback
-            data = self._collect_via_droplet()
-            
-            # Restore original URL
-            self.base_url = original_url
-            
-            # If successful, return the data
-            if data and not (isinstance(data, dict) and "error" in data):
-                self.logger.info(f"Successfully collected data from fallback URL: {fallback_url}")
+        urls = [url for url in [self.base_url, *self.fallback_urls] if url]
+        if len(urls) <= 1:
+            self.logger.info("Trying primary URL: %s", self.base_url)
+            data = self._collect_via_droplet(self.base_url)
+            if self._is_successful_response(data):
+                self.logger.info("Successfully collected data from primary URL")
                 return data
+            self._log_failed_url(self.base_url, data)
+            self.logger.error("All %s onion URLs are unreachable", self.name)
+            return None
+        
+        self.logger.info("Trying %s URLs in parallel for %s", len(urls), self.name)
+        executor = ThreadPoolExecutor(max_workers=len(urls), thread_name_prefix=f"onion-{self.name}")
+        try:
+            futures = {executor.submit(self._collect_via_droplet, url): url for url in urls}
+            for future in as_completed(futures):
+                url = futures[future]
+                try:
+                    data = future.result()
+                except Exception as e:
+                    self.logger.error("Error collecting from %s: %s", url, e)
+                    continue
                 
-            # Log the failure
-            if data and isinstance(data, dict) and "error" in data:
-                self.logger.error(f"Error collecting from fallback URL: {data.get('error')}")
-            else:
-                self.logger.error(f"Failed to collect data from fallback URL: {fallback_url}")
+                if self._is_successful_response(data):
+                    self.logger.info("Successfully collected data from %s", url)
+                    return data
+                self._log_failed_url(url, data)
+        finally:
+            # Don't wait for the slower URLs once we have a result
+            executor.shutdown(wait=False, cancel_futures=True)
         
         # All URLs failed
-        self.logger.error(f"All {self.name} onion URLs are unreachable")
+        self.logger.error("All %s onion URLs are unreachable", self.name)
         return None
     
+    def _is_successful_response(self, data: Optional[Dict[str, Any]]) -> bool:
+        """
+        Check whether a Droplet response contains usable data.
+        
+        Args:
+            data: Response data from the Droplet
+            
+        Returns:
+            True if the response is non-empty and not an error
+        """
+        return bool(data) and not (isinstance(data, dict) and "error" in data)
+    
+    def _log_failed_url(self, url: str, data: Optional[Dict[str, Any]]) -> None:
+        """
+        Log why collection from a URL failed.
+        
+        Args:
+            url: URL that was tried
+            data: Response data from the Droplet, if any
+        """
+        if data and isinstance(data, dict) and "error" in data:
+            self.logger.error("Error collecting from %s: %s", url, data.get('error'))
+        else:
+            self.logger.error("Failed to collect data from %s", url)
+    
     def _process_victims(self, victims: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Process victim data into standardized claims.
@@ -131,11 +150,23 @@ class OnionCollector(DropletProxyCollector):
             List of processed claims
         """
         processed_data = []
+        collector_name = self.name
+        default_actor = self.name.lower()
+        base_url = self.base_url
+        
+        skipped = 0
         
         for victim in victims:
+            if not isinstance(victim, dict):
+                skipped += 1
+                continue
+            
             try:
-                # Parse timestamp using base class method
+                name = victim.get("name")
                 timestamp_str = victim.get("date")
+                domain_raw = victim.get("domain")
+                
+                # Parse timestamp using base class method
                 if not timestamp_str:
                     # Use current date if none provided
                     timestamp = datetime.now()
@@ -144,34 +175,38 @@ class OnionCollector(DropletProxyCollector):
                 
                 # Process domain if it exists
                 domain = None
-                if victim.get("domain"):
-                    domain = self.normalize_domain(victim.get("domain"))
+                if domain_raw:
+                    domain = self.normalize_domain(domain_raw)
                 
                 # Create the processed claim
                 processed_item: Dict[str, Any] = {
-                    "collector": self.name,
-                    "threat_actor": victim.get("group", self.name.lower()),
-                    "name_network_identifier": victim.get("name"),
+                    "collector": collector_name,
+                    "threat_actor": victim.get("group", default_actor),
+                    "name_network_identifier": name,
                     "ip_network_identifier": None,
                     "domain_network_identifier": domain,
                     "sector": victim.get("sector"),
-                    "comment": f"Published: {victim.get('date', 'Unknown')}" if victim.get('date') else None,
-                    "raw_data": str(victim),
-                    "claim_url": self.base_url + (victim.get("path", "") or ""),
+                    "comment": f"Published: {timestamp_str}" if timestamp_str else None,
+                    "raw_data": self.serialize_raw_data(victim),
+                    "claim_url": base_url + (victim.get("path", "") or ""),
                     "timestamp": timestamp
                 }
                 
                 # Skip entries that look like debugging info
                 if isinstance(processed_item["name_network_identifier"], str) and \
                    processed_item["name_network_identifier"].startswith("Debug:"):
-                    self.logger.debug(f"Skipping debug entry: {processed_item['name_network_identifier']}")
+                    self.logger.debug("Skipping debug entry: %s", processed_item['name_network_identifier'])
                     continue
                 
                 processed_data.append(processed_item)
-                self.logger.debug(f"Processed victim: {processed_item['name_network_identifier']}")
+                self.logger.debug("Processed victim: %s", processed_item['name_network_identifier'])
                 
-            except Exception as e:
-                self.logger.error(f"Error processing victim {victim.get('name', 'Unknown')}: {str(e)}")
+            except (ValueError, TypeError, AttributeError) as e:
+                self.logger.error("Error processing victim %s: %s", victim.get('name', 'Unknown'), e)
+                skipped += 1
                 continue
+        
+        if skipped:
+            self.logger.warning("Skipped %s malformed victim entries from %s", skipped, self.name)
                 
-        return processed_data
\ No newline at end of file
+        return processed_data
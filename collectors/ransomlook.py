@@ -30,7 +30,7 @@ class RansomlookCollector(BaseCollector):
             self.logger.warning("No data received from Ransomlook API")
             return []
             
-        self.logger.info(f"Processing {len(data)} claims from Ransomlook")
+        self.logger.info("Processing %s claims from Ransomlook", len(data))
         processed_data: List[Dict[str, Any]] = []
         
         for item in data:
@@ -50,11 +50,11 @@ class RansomlookCollector(BaseCollector):
                 "domain_network_identifier": domain,
                 "sector": None,
                 "comment": item.get("description"),
-                "raw_data": str(item),
+                "raw_data": self.serialize_raw_data(item),
                 "claim_url": item.get("link"),  # No need for NULL handling here, database will handle it
                 "timestamp": timestamp
             }
             processed_data.append(processed_item)
             
-        self.logger.info(f"Processed {len(processed_data)} claims from Ransomlook")
+        self.logger.info("Processed %s claims from Ransomlook", len(processed_data))
         return processed_data
@@ -30,7 +30,7 @@ class RansomwareLiveCollector(BaseCollector):
             self.logger.warning("No data received from Ransomware.live API")
             return []
             
-        self.logger.info(f"Processing {len(data)} claims from Ransomware.live")
+        self.logger.info("Processing %s claims from Ransomware.live", len(data))
         processed_data: List[Dict[str, Any]] = []
         
         for item in data:
@@ -48,11 +48,11 @@ class RansomwareLiveCollector(BaseCollector):
                 "domain_network_identifier": domain,
                 "sector": item.get("activity"),
                 "comment": item.get("description"),
-                "raw_data": str(item),
+                "raw_data": self.serialize_raw_data(item),
                 "claim_url": item.get("claim_url"),  # No need for NULL handling here, database will handle it
                 "timestamp": timestamp
             }
             processed_data.append(processed_item)
             
-        self.logger.info(f"Processed {len(processed_data)} claims from Ransomware.live")
+        self.logger.info("Processed %s claims from Ransomware.live", len(processed_data))
         return processed_data
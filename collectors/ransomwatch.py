@@ -1,6 +1,9 @@
 # collectors/ransomwatch.py
+import heapq
+import itertools
 from typing import List, Dict, Any, Optional
 from .base import BaseCollector
+from utils.error_utils import NetworkError
 
 
 class RansomwatchCollector(BaseCollector):
@@ -24,28 +27,41 @@ class RansomwatchCollector(BaseCollector):
             List of processed claim dictionaries (limited to 100 newest)
         """
         self.logger.info("Collecting data from Ransomwatch")
-        data = self.make_request("/posts.json")
+        items = self.stream_request("/posts.json")
         
-        if not data:
+        if items is None:
             self.logger.warning("No data received from Ransomwatch API")
             return []
-            
-        self.logger.info(f"Retrieved {len(data)} total claims from Ransomwatch")
         
-        # Convert timestamps and sort by newest first
-        for item in data:
-            item['parsed_timestamp'] = self.parse_timestamp(item.get("discovered", ""))
-            
-        # Sort by timestamp (newest first)
-        sorted_data = sorted(data, key=lambda x: x['parsed_timestamp'], reverse=True)
+        # Counts the items as they stream past; zip pulls an item before
+        # advancing the counter, so next(counter) afterwards is the total
+        counter = itertools.count()
+        items = (item for item, _ in zip(items, counter))
+        
+        # Keep only the newest 100 claims; nlargest consumes the stream with a
+        # bounded heap, so the full post list is never held in memory
+        try:
+            # "discovered" values are ISO-8601 ("YYYY-MM-DD HH:MM:SS.ffffff"), which
+            # order correctly as plain strings, so only parse the ones we keep
+            newest = heapq.nlargest(100, items, key=lambda x: x.get("discovered") or "")
+        except NetworkError:
+            # The newest 100 of a truncated list are not the newest 100 overall
+            self.logger.warning("Ransomwatch response was cut off, discarding partial results")
+            return []
         
-        # Limit to newest 100 claims
-        limited_data = sorted_data[:100]
-        self.logger.info(f"Processing {len(limited_data)} newest claims from Ransomwatch")
+        total = next(counter)
+        if not total:
+            self.logger.warning("No data received from Ransomwatch API")
+            return []
+        
+        limited_data = [(self.parse_timestamp(item.get("discovered", "")), item) for item in newest]
+            
+        self.logger.info("Retrieved %s total claims from Ransomwatch", total)
+        self.logger.info("Processing %s newest claims from Ransomwatch", len(limited_data))
         
         processed_data: List[Dict[str, Any]] = []
         
-        for item in limited_data:
+        for timestamp, item in limited_data:
             processed_item: Dict[str, Any] = {
                 "collector": self.name,
                 "threat_actor": item.get("group_name"),
@@ -54,11 +70,11 @@ class RansomwatchCollector(BaseCollector):
                 "domain_network_identifier": None,
                 "sector": None,
                 "comment": None,
-                "raw_data": str(item),
+                "raw_data": self.serialize_raw_data(item),
                 "claim_url": None,  # No URL available in the data
-                "timestamp": item['parsed_timestamp']  # Use already parsed timestamp
+                "timestamp": timestamp  # Use already parsed timestamp
             }
             processed_data.append(processed_item)
             
-        self.logger.info(f"Processed {len(processed_data)} newest claims from Ransomwatch")
+        self.logger.info("Processed %s newest claims from Ransomwatch", len(processed_data))
         return processed_data
\ No newline at end of file
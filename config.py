@@ -5,34 +5,115 @@ Configuration management for the ransomware intelligence system.
 This module handles loading, saving, and accessing configuration settings.
 """
 
+import atexit
 import configparser
+import hashlib
+import io
 import os
 import logging
+import stat
+import tempfile
+import threading
+import time
 from utils.error_utils import ConfigError, handle_exception
 
+# Accepted logging levels, in order of increasing severity
+_LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+_VALID_LEVELS = frozenset(_LOG_LEVELS)
+
+# Accepted SQLite synchronous levels, also checked by database.base
+SQLITE_SYNCHRONOUS_LEVELS = frozenset({"FULL", "NORMAL", "OFF"})
+
+# Config instances with unsaved changes, flushed on interpreter exit. The
+# references are strong, so an instance dropped before exit still gets its
+# changes written; flush() removes it once they are saved.
+_DIRTY_INSTANCES = set()
+
+
+def _flush_all():
+    """Flush pending changes of every Config instance that has any."""
+    for config in list(_DIRTY_INSTANCES):
+        try:
+            config.flush()
+        except ConfigError:
+            pass  # Already logged by save()
+
+
+atexit.register(_flush_all)
+
+# Config file text keyed by absolute path, reused while (inode, mtime, size) is
+# unchanged; the atomic save replaces the file, so a rewrite always gets a new inode
+_TEXT_CACHE = {}
+_TEXT_CACHE_LOCK = threading.Lock()
+
+
+def _read_config_file(config_path):
+    """
+    Read a configuration file, reusing a previous read if the file is unchanged.
+    
+    The raw text is cached rather than a parsed ConfigParser, so callers parse
+    it with read_string() exactly as read() would and values are interpolated
+    only once.
+    
+    Args:
+        config_path (str): Path to the configuration file
+        
+    Returns:
+        str: File contents
+        
+    Raises:
+        OSError: If the file cannot be read
+        UnicodeDecodeError: If the file is not valid text
+    """
+    path = os.path.abspath(config_path)
+    st = os.stat(path)
+    key = (st.st_ino, st.st_mtime_ns, st.st_size)
+    
+    with _TEXT_CACHE_LOCK:
+        cached = _TEXT_CACHE.get(path)
+        if cached and cached[0] == key:
+            return cached[1]
+        
+        with open(path) as f:
+            text = f.read()
+        _TEXT_CACHE[path] = (key, text)
+        return text
+
 class Config:
     """
     Configuration manager for the ransomware intelligence system.
     
     This class handles loading and saving configuration settings,
     with defaults for when a configuration file doesn't exist.
+    
+    Setters only update the in-memory configuration and mark it dirty;
+    changes are written by flush(), on leaving a ``with`` block, or at
+    interpreter exit. Pass ``sync=True`` to a setter to write immediately.
     """
     
-    def __init__(self, config_path="config.ini"):
+    def __init__(self, config_path="config.ini", durable=False, retry_on_fail=True):
         """
         Initialize the configuration manager.
         
         Args:
             config_path (str): Path to the configuration file
+            durable (bool): fsync the file on every save
+            retry_on_fail (bool): Retry a save once after a permission error
         """
         self.config_path = config_path
         self.config = configparser.ConfigParser()
         self.logger = logging.getLogger("config")
+        self._durable = durable
+        self._retry_on_fail = retry_on_fail
+        self._cache = {}
+        self._last_written_hash = None
+        self._dirty = False
         
         # Set defaults
         self.config["General"] = {
             "interval": "300",
-            "database_path": "sqlite:///ransomware_intel.db"
+            "database_path": "sqlite:///ransomware_intel.db",
+            "sqlite_synchronous": "NORMAL"
         }
         
         self.config["Logging"] = {
@@ -43,34 +124,170 @@ class Config:
         # Load configuration if exists
         if os.path.exists(config_path):
             try:
-                self.config.read(config_path)
+                self.config.read_string(_read_config_file(config_path), source=config_path)
                 self.logger.info(f"Loaded configuration from {config_path}")
-            except configparser.Error as e:
+            except (configparser.Error, OSError, ValueError) as e:
                 self.logger.error(f"Error loading configuration: {str(e)}")
                 # Continue with defaults
         else:
             self.logger.info(f"Configuration file {config_path} not found, using defaults")
             self.save()
+        
+        self._refresh_cache()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, tb):
+        self.flush()
+        return False
+    
+    def flush(self):
+        """
+        Write pending changes to disk, if there are any.
+        
+        Raises:
+            ConfigError: If the configuration cannot be saved
+        """
+        if self._dirty:
+            self.save()
+            self._dirty = False
+            _DIRTY_INSTANCES.discard(self)
+    
+    def _mark_dirty(self, sync=False):
+        """
+        Record that the configuration has unsaved changes.
+        
+        Args:
+            sync (bool): Write the changes to disk immediately
+        """
+        self._dirty = True
+        _DIRTY_INSTANCES.add(self)
+        if sync:
+            self.flush()
+    
+    def _refresh_cache(self):
+        """
+        Populate the in-memory cache of typed configuration values.
+        
+        Getters read from this cache instead of walking the ConfigParser
+        sections on every call.
+        """
+        try:
+            interval = int(self.config["General"]["interval"])
+        except (KeyError, ValueError):
+            interval = None  # get_interval() reports the error
+        
+        level = self.config["Logging"]["level"].upper()
+        if level not in _VALID_LEVELS:
+            self.logger.warning(f"Invalid log level: {level}, defaulting to INFO")
+            level = "INFO"
+        
+        synchronous = self.config.get("General", "sqlite_synchronous", fallback="NORMAL").upper()
+        if synchronous not in SQLITE_SYNCHRONOUS_LEVELS:
+            self.logger.warning(f"Invalid SQLite synchronous level: {synchronous}, defaulting to NORMAL")
+            synchronous = "NORMAL"
+        
+        self._cache = {
+            "interval": interval,
+            "database_path": self.config["General"]["database_path"],
+            "sqlite_synchronous": synchronous,
+            "log_level": level,
+            "log_file": self.config["Logging"]["file"],
+            "droplet_endpoint": self.config.get("Droplet", "endpoint", fallback="http://localhost:5000"),
+            "droplet_api_secret": self.config.get("Droplet", "api_secret", fallback="test-secret"),
+        }
             
     def save(self):
         """
         Save configuration to file.
         
+        The file is written to a temporary file in the same directory and then
+        renamed over the original, so a crash never leaves a half-written
+        config. If no temporary file can be created there, saving fails
+        rather than overwriting the file in place. A permission error is
+        retried once, as it is often transient. Nothing is written if the configuration is
+        unchanged since the last save.
+        
         Raises:
             ConfigError: If the configuration cannot be saved
         """
+        buffer = io.StringIO()
+        self.config.write(buffer)
+        content = buffer.getvalue().encode("utf-8")
+        content_hash = hashlib.sha1(content).digest()
+        if content_hash == self._last_written_hash:
+            self.logger.debug("Configuration unchanged, skipping save")
+            return
+        
+        attempts = 2 if self._retry_on_fail else 1
+        for attempt in range(1, attempts + 1):
+            try:
+                self._write_file(content)
+                break
+            except PermissionError as e:
+                if attempt < attempts:
+                    self.logger.debug(f"Permission denied saving configuration, retrying: {str(e)}")
+                    time.sleep(0.05)
+                    continue
+                self._raise_save_error(e)
+            except IOError as e:
+                self._raise_save_error(e)
+        
+        self._last_written_hash = content_hash
+        self.logger.info(f"Saved configuration to {self.config_path}")
+    
+    def _write_file(self, content):
+        """
+        Write the serialized configuration to disk.
+        
+        Args:
+            content (bytes): Serialized configuration
+            
+        Raises:
+            OSError: If the file cannot be written
+        """
+        directory = os.path.dirname(os.path.abspath(self.config_path))
+        # No in-place fallback: a torn write could lose the Droplet API secret
+        f = tempfile.NamedTemporaryFile(dir=directory, prefix=".config-", suffix=".tmp", delete=False)
+        
+        tmp_path = f.name
         try:
-            with open(self.config_path, "w") as f:
-                self.config.write(f)
-            self.logger.info(f"Saved configuration to {self.config_path}")
-        except (IOError, PermissionError) as e:
-            handle_exception(
-                e,
-                self.logger,
-                f"Error saving configuration to {self.config_path}",
-                reraise=True,
-                reraise_as=ConfigError
-            )
+            with f:
+                # Keep the permissions of an existing file; new files stay owner-only
+                # since they hold the Droplet API secret
+                if os.path.exists(self.config_path):
+                    os.chmod(tmp_path, stat.S_IMODE(os.stat(self.config_path).st_mode))
+                f.write(content)
+                if self._durable:
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(tmp_path, self.config_path)
+        except OSError:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        self.logger.debug(f"Wrote configuration atomically via {tmp_path}")
+    
+    def _raise_save_error(self, e):
+        """
+        Log a failed save and raise it as a ConfigError.
+        
+        Args:
+            e (Exception): The error that prevented saving
+            
+        Raises:
+            ConfigError: Always
+        """
+        handle_exception(
+            e,
+            self.logger,
+            f"Error saving configuration to {self.config_path}",
+            reraise=True,
+            reraise_as=ConfigError
+        )
             
     def get_interval(self) -> int:
         """
@@ -82,6 +299,10 @@ class Config:
         Raises:
             ConfigError: If the interval cannot be parsed as an integer
         """
+        interval = self._cache.get("interval")
+        if interval is not None:
+            return interval
+        
         try:
             return int(self.config["General"]["interval"])
         except (KeyError, ValueError) as e:
@@ -89,12 +310,13 @@ class Config:
             self.logger.error(error_msg)
             raise ConfigError(error_msg) from e
     
-    def set_interval(self, interval: int) -> None:
+    def set_interval(self, interval: int, sync: bool = False) -> None:
         """
         Set polling interval in seconds.
         
         Args:
             interval (int): Polling interval in seconds
+            sync (bool): Write the change to disk immediately
             
         Raises:
             ConfigError: If the interval is not a positive integer
@@ -105,7 +327,8 @@ class Config:
             raise ConfigError(error_msg)
             
         self.config["General"]["interval"] = str(interval)
-        self.save()
+        self._cache["interval"] = interval
+        self._mark_dirty(sync)
         self.logger.info(f"Set polling interval to {interval} seconds")
         
     def get_database_path(self) -> str:
@@ -115,19 +338,33 @@ class Config:
         Returns:
             str: Database connection string
         """
-        return self.config["General"]["database_path"]
+        return self._cache["database_path"]
     
-    def set_database_path(self, path: str) -> None:
+    def set_database_path(self, path: str, sync: bool = False) -> None:
         """
         Set database connection string.
         
         Args:
             path (str): Database connection string
+            sync (bool): Write the change to disk immediately
         """
         self.config["General"]["database_path"] = path
-        self.save()
+        self._cache["database_path"] = path
+        self._mark_dirty(sync)
         self.logger.info(f"Set database path to {path}")
     
+    def get_sqlite_synchronous(self) -> str:
+        """
+        Get the SQLite synchronous (fsync) level.
+        
+        FULL syncs on every commit, NORMAL syncs at WAL checkpoints and
+        OFF leaves flushing to the operating system.
+        
+        Returns:
+            str: Synchronous level (FULL, NORMAL, OFF)
+        """
+        return self._cache["sqlite_synchronous"]
+    
     def get_log_level(self) -> str:
         """
         Get logging level.
@@ -135,36 +372,31 @@ class Config:
         Returns:
             str: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         """
-        level = self.config["Logging"]["level"].upper()
-        
-        # Validate level
-        valid_levels = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
-        if level not in valid_levels:
-            self.logger.warning(f"Invalid log level: {level}, defaulting to INFO")
-            return "INFO"
-            
-        return level
+        # Validated when the cache is populated
+        return self._cache["log_level"]
     
-    def set_log_level(self, level):
+    def set_log_level(self, level, sync=False):
         """
         Set logging level.
         
         Args:
             level (str): Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
+            sync (bool): Write the change to disk immediately
             
         Raises:
             ConfigError: If the level is not valid
         """
-        level = level.upper()
-        valid_levels = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
+        if level not in _VALID_LEVELS:
+            level = level.upper()
         
-        if level not in valid_levels:
-            error_msg = f"Invalid log level: {level}, must be one of {valid_levels}"
+        if level not in _VALID_LEVELS:
+            error_msg = f"Invalid log level: {level}, must be one of {list(_LOG_LEVELS)}"
             self.logger.error(error_msg)
             raise ConfigError(error_msg)
             
         self.config["Logging"]["level"] = level
-        self.save()
+        self._cache["log_level"] = level
+        self._mark_dirty(sync)
         self.logger.info(f"Set log level to {level}")
     
     def get_log_file(self):
@@ -174,17 +406,19 @@ class Config:
         Returns:
             str: Log file path
         """
-        return self.config["Logging"]["file"]
+        return self._cache["log_file"]
     
-    def set_log_file(self, file_path):
+    def set_log_file(self, file_path, sync=False):
         """
         Set log file path.
         
         Args:
             file_path (str): Log file path
+            sync (bool): Write the change to disk immediately
         """
         self.config["Logging"]["file"] = file_path
-        self.save()
+        self._cache["log_file"] = file_path
+        self._mark_dirty(sync)
         self.logger.info(f"Set log file to {file_path}")
 
     def get_droplet_endpoint(self) -> str:
@@ -194,15 +428,7 @@ class Config:
         Returns:
             str: Droplet API endpoint URL
         """
-        try:
-            return self.config.get("Droplet", "endpoint", fallback="http://localhost:5000")
-        except (KeyError, configparser.NoSectionError):
-            # If section doesn't exist, create it with defaults
-            if "Droplet" not in self.config:
-                self.config["Droplet"] = {}
-            self.config["Droplet"]["endpoint"] = "http://localhost:5000"
-            self.save()
-            return "http://localhost:5000"
+        return self._cache["droplet_endpoint"]
 
     def get_droplet_api_secret(self) -> str:
         """
@@ -211,38 +437,34 @@ class Config:
         Returns:
             str: Droplet API secret
         """
-        try:
-            return self.config.get("Droplet", "api_secret", fallback="test-secret")
-        except (KeyError, configparser.NoSectionError):
-            # If section doesn't exist, create it with defaults
-            if "Droplet" not in self.config:
-                self.config["Droplet"] = {}
-            self.config["Droplet"]["api_secret"] = "test-secret"
-            self.save()
-            return "test-secret"
+        return self._cache["droplet_api_secret"]
 
-    def set_droplet_endpoint(self, endpoint: str) -> None:
+    def set_droplet_endpoint(self, endpoint: str, sync: bool = False) -> None:
         """
         Set the endpoint URL for the Droplet API.
         
         Args:
             endpoint: URL for the Droplet API
+            sync: Write the change to disk immediately
         """
         if "Droplet" not in self.config:
             self.config["Droplet"] = {}
         self.config["Droplet"]["endpoint"] = endpoint
-        self.save()
+        self._cache["droplet_endpoint"] = endpoint
+        self._mark_dirty(sync)
         self.logger.info(f"Set Droplet endpoint to {endpoint}")
 
-    def set_droplet_api_secret(self, secret: str) -> None:
+    def set_droplet_api_secret(self, secret: str, sync: bool = False) -> None:
         """
         Set the API secret for authenticating with the Droplet API.
         
         Args:
             secret: API secret
+            sync: Write the change to disk immediately
         """
         if "Droplet" not in self.config:
             self.config["Droplet"] = {}
         self.config["Droplet"]["api_secret"] = secret
-        self.save()
+        self._cache["droplet_api_secret"] = secret
+        self._mark_dirty(sync)
         self.logger.info("Updated Droplet API secret")
\ No newline at end of file
@@ -3,19 +3,28 @@
 Database components for the ransomware intelligence system.
 """
 
+import importlib
 import logging
 
-from database.models import Base
+# SQLAlchemy-backed names, imported on first access so that importing this
+# package stays cheap for code that never touches the database
+_LAZY_IMPORTS = {
+    "Base": ".models",
+    "Database": ".base",
+    "ClaimRepository": ".repositories.claim_repository",
+    "ClientRepository": ".repositories.client_repository",
+    "IdentifierRepository": ".repositories.identifier_repository",
+    "AlertRepository": ".repositories.alert_repository",
+}
 
-# Now import the Database class
-from .models import Base
-from .base import Database
-
-# Import repository classes
-from .repositories.claim_repository import ClaimRepository
-from .repositories.client_repository import ClientRepository
-from .repositories.identifier_repository import IdentifierRepository
-from .repositories.alert_repository import AlertRepository
+def __getattr__(name):
+    """Resolve SQLAlchemy-backed names lazily (PEP 562)."""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
 
 class DatabaseError(Exception):
     """Custom exception for database errors"""
@@ -32,6 +41,13 @@ def create_database_context(connection_string="sqlite:///ransomware_intel.db"):
     Returns:
         Dictionary with database and repository instances
     """
+    from .models import Base
+    from .base import Database
+    from .repositories.claim_repository import ClaimRepository
+    from .repositories.client_repository import ClientRepository
+    from .repositories.identifier_repository import IdentifierRepository
+    from .repositories.alert_repository import AlertRepository
+    
     db = Database(connection_string, Base)
     
     return {
@@ -49,15 +65,23 @@ class DatabaseService:
     to the original Database class.
     """
     
-    def __init__(self, connection_string="sqlite:///ransomware_intel.db"):
+    def __init__(self, connection_string="sqlite:///ransomware_intel.db", sqlite_synchronous="NORMAL"):
         """
         Initialize the database service.
         
         Args:
             connection_string: SQLAlchemy connection string
+            sqlite_synchronous: SQLite fsync mode (FULL, NORMAL or OFF)
         """
+        from .models import Base
+        from .base import Database
+        from .repositories.claim_repository import ClaimRepository
+        from .repositories.client_repository import ClientRepository
+        from .repositories.identifier_repository import IdentifierRepository
+        from .repositories.alert_repository import AlertRepository
+        
         self.connection_string = connection_string
-        self.db = Database(connection_string, Base)
+        self.db = Database(connection_string, Base, sqlite_synchronous)
         
         # Initialize repositories
         self.client_repo = ClientRepository(self.db)
@@ -74,7 +98,10 @@ class DatabaseService:
         Returns:
             True if successful, False otherwise
         """
-        return self.db.initialize()
+        if not self.db.initialize():
+            return False
+        self.claim_repo.backfill_claim_hashes()
+        return True
     
     # === Client methods ===
     
@@ -82,6 +109,10 @@ class DatabaseService:
         """Add a new client to the database."""
         return self.client_repo.add_client(client_name)
     
+    def bulk_add_clients(self, client_names):
+        """Add multiple clients to the database in a batch."""
+        return self.client_repo.bulk_add_clients(client_names)
+    
     def get_clients(self):
         """Get all clients from the database."""
         return self.client_repo.get_clients()
@@ -136,35 +167,61 @@ class DatabaseService:
         """Add a new alert to the database."""
         return self.alert_repo.add_alert(identifier_id, message)
     
+    def bulk_add_alerts(self, alerts):
+        """Add multiple alerts to the database in a batch."""
+        return self.alert_repo.bulk_add_alerts(alerts)
+    
     def get_recent_alerts(self, limit=100):
         """Get the most recent alerts."""
         return self.alert_repo.get_recent_alerts(limit)
     
     # === Statistics methods ===
     
-    def get_statistics(self):
+    def get_statistics(self, exact=True):
         """
         Get database statistics.
         
+        Args:
+            exact: Count every row; when False, SQLite table counts come from
+                the planner statistics in sqlite_stat1 where available, which
+                is instant but only as fresh as the last ANALYZE
+        
         Returns:
             Dictionary with counts of entities
         """
         # Use a session directly for complex query
         session = self.db.get_session()
         try:
+            from sqlalchemy import func, literal, select, union_all
             from database.models import Client, Identifier, Claim, Alert
             
+            models = {"client": Client, "identifier": Identifier, "claim": Claim, "alert": Alert}
+            
+            table_counts = {}
+            if not exact and self.db.engine.dialect.name == "sqlite":
+                table_counts = self._estimate_table_counts(models)
+            
+            # One round trip for every table without an estimate
+            missing = [name for name in models if name not in table_counts]
+            if missing:
+                table_counts.update(session.execute(union_all(*[
+                    select(literal(name), func.count()).select_from(models[name])
+                    for name in missing
+                ])).all())
+            
+            # A single scan of identifiers grouped by type
+            type_counts = dict(session.query(
+                Identifier.identifier_type, func.count()
+            ).group_by(Identifier.identifier_type).all())
+            
             stats = {
-                "client_count": session.query(Client).count(),
-                "identifier_count": session.query(Identifier).count(),
-                "claim_count": session.query(Claim).count(),
-                "alert_count": session.query(Alert).count(),
-                "domain_identifier_count": session.query(Identifier).filter(
-                    Identifier.identifier_type == "domain").count(),
-                "name_identifier_count": session.query(Identifier).filter(
-                    Identifier.identifier_type == "name").count(),
-                "ip_identifier_count": session.query(Identifier).filter(
-                    Identifier.identifier_type == "ip").count()
+                "client_count": table_counts.get("client", 0),
+                "identifier_count": table_counts.get("identifier", 0),
+                "claim_count": table_counts.get("claim", 0),
+                "alert_count": table_counts.get("alert", 0),
+                "domain_identifier_count": type_counts.get("domain", 0),
+                "name_identifier_count": type_counts.get("name", 0),
+                "ip_identifier_count": type_counts.get("ip", 0)
             }
             return stats
         except Exception as e:
@@ -181,6 +238,38 @@ class DatabaseService:
         finally:
             session.close()
             
+    def _estimate_table_counts(self, models):
+        """
+        Read approximate row counts from SQLite's sqlite_stat1 table.
+        
+        Args:
+            models: Dictionary mapping statistic names to model classes
+            
+        Returns:
+            Dictionary mapping statistic names to estimated row counts; names
+            without statistics are omitted
+        """
+        from sqlalchemy import exc, text
+        
+        names_by_table = {model.__tablename__: name for name, model in models.items()}
+        try:
+            with self.db.engine.connect() as conn:
+                rows = conn.execute(text("SELECT tbl, stat FROM sqlite_stat1")).all()
+        except exc.OperationalError:
+            return {}  # ANALYZE has never run
+        
+        estimates = {}
+        for table, stat in rows:
+            name = names_by_table.get(table)
+            if name is None or name in estimates or not stat:
+                continue
+            # The first field of stat is the number of rows in the table
+            try:
+                estimates[name] = int(stat.split()[0])
+            except ValueError:
+                continue
+        return estimates
+    
     # This is a special method used by some parts of the system to access Session directly
     def Session(self):
         """
@@ -4,27 +4,97 @@ Base database connection management for the ransomware intelligence system.
 """
 
 import logging
-from sqlalchemy import create_engine, exc, inspect
+from sqlalchemy import create_engine, event, exc, inspect
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.schema import CreateIndex
+from sqlalchemy.pool import StaticPool
+from config import SQLITE_SYNCHRONOUS_LEVELS
+
+# Column attribute names per mapped class, filled on first conversion
+_COLUMN_NAMES = {}
+
+
+def _column_names(model_class):
+    """
+    Get the column attribute names of a mapped class.
+    
+    Args:
+        model_class: SQLAlchemy mapped class
+        
+    Returns:
+        Tuple of column attribute names
+    """
+    names = _COLUMN_NAMES.get(model_class)
+    if names is None:
+        names = tuple(inspect(model_class).column_attrs.keys())
+        _COLUMN_NAMES[model_class] = names
+    return names
 
 class Database:
     """
     Base database class that handles connection management and session creation.
     """
     
-    def __init__(self, connection_string="sqlite:///ransomware_intel.db", base_class=None):
+    def __init__(self, connection_string="sqlite:///ransomware_intel.db", base_class=None,
+                 sqlite_synchronous="NORMAL"):
         """
         Initialize the database connection.
         
         Args:
             connection_string: SQLAlchemy connection string
             base_class: SQLAlchemy declarative base class (passed in to avoid circular imports)
+            sqlite_synchronous: SQLite fsync mode (FULL, NORMAL or OFF)
         """
         self.connection_string = connection_string
-        self.engine = create_engine(connection_string)
-        self.Session = sessionmaker(bind=self.engine)
         self.logger = logging.getLogger("database")
         self.Base = base_class  # Store the base class for initialize()
+        
+        if connection_string.startswith("sqlite"):
+            self.engine = self._create_sqlite_engine(connection_string, sqlite_synchronous)
+        else:
+            self.engine = create_engine(connection_string)
+        # Keep loaded state after commit so results stay readable once the session closes
+        self.Session = sessionmaker(bind=self.engine, expire_on_commit=False)
+    
+    def _create_sqlite_engine(self, connection_string, synchronous):
+        """
+        Create a SQLite engine tuned for the collector's write-heavy workload.
+        
+        Every connection uses WAL journaling, so readers don't block the
+        writer, and the given synchronous level, which with WAL only risks
+        the last transactions on power loss when set to NORMAL.
+        
+        Args:
+            connection_string: SQLAlchemy SQLite connection string
+            synchronous: SQLite fsync mode (FULL, NORMAL or OFF)
+            
+        Returns:
+            SQLAlchemy engine
+        """
+        synchronous = synchronous.upper()
+        if synchronous not in SQLITE_SYNCHRONOUS_LEVELS:
+            self.logger.warning(f"Invalid SQLite synchronous level: {synchronous}, defaulting to NORMAL")
+            synchronous = "NORMAL"
+        
+        kwargs = {"connect_args": {"check_same_thread": False}}
+        if connection_string in ("sqlite://", "sqlite:///:memory:"):
+            # An in-memory database only exists on its own connection, so share one
+            kwargs["poolclass"] = StaticPool
+        engine = create_engine(connection_string, **kwargs)
+        
+        @event.listens_for(engine, "connect")
+        def _set_sqlite_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            try:
+                cursor.execute("PRAGMA journal_mode=WAL")
+                cursor.execute(f"PRAGMA synchronous={synchronous}")
+                cursor.execute("PRAGMA temp_store=MEMORY")
+                cursor.execute("PRAGMA mmap_size=268435456")
+                cursor.execute("PRAGMA cache_size=-65536")
+            finally:
+                cursor.close()
+        
+        return engine
     
     def initialize(self):
         """
@@ -33,6 +103,12 @@ class Database:
         try:
             if self.Base:
                 self.Base.metadata.create_all(self.engine)
+                self._add_missing_columns()
+                self._create_missing_indexes()
+                if self.engine.dialect.name == "sqlite":
+                    # Refresh planner statistics that need it; cheap when they are current
+                    with self.engine.connect() as conn:
+                        conn.exec_driver_sql("PRAGMA optimize")
                 self.logger.info("Database initialized successfully")
                 return True
             else:
@@ -42,6 +118,43 @@ class Database:
             self.logger.error(f"Failed to initialize database: {str(e)}")
             return False
     
+    def _add_missing_columns(self):
+        """
+        Add nullable model columns missing from existing tables.
+        
+        create_all() never alters existing tables, so databases created
+        before a column was declared need it added here. Only nullable
+        columns can be added this way; existing rows get NULL.
+        """
+        inspector = inspect(self.engine)
+        with self.engine.begin() as conn:
+            for table in self.Base.metadata.sorted_tables:
+                existing = {column["name"] for column in inspector.get_columns(table.name)}
+                for column in table.columns:
+                    if column.name in existing or not column.nullable:
+                        continue
+                    preparer = self.engine.dialect.identifier_preparer
+                    column_type = column.type.compile(dialect=self.engine.dialect)
+                    conn.exec_driver_sql(
+                        f"ALTER TABLE {preparer.format_table(table)} "
+                        f"ADD COLUMN {preparer.format_column(column)} {column_type}"
+                    )
+                    self.logger.info(f"Added column {table.name}.{column.name}")
+    
+    def _create_missing_indexes(self):
+        """
+        Create any model indexes missing from existing tables.
+        
+        create_all() only emits indexes for tables it creates, so databases
+        created before an index was declared need it added here. IF NOT
+        EXISTS is used instead of checkfirst because reflection cannot see
+        expression indexes.
+        """
+        with self.engine.begin() as conn:
+            for table in self.Base.metadata.sorted_tables:
+                for index in table.indexes:
+                    conn.execute(CreateIndex(index, if_not_exists=True))
+    
     def get_session(self):
         """
         Get a new database session. Remember to close it when done!
@@ -55,6 +168,42 @@ class Database:
         """
         Execute an operation with session handling.
         
+        Kept for compatibility; equivalent to execute_write().
+        
+        Args:
+            operation: Function that takes a session parameter
+            
+        Returns:
+            Result of the operation
+        """
+        return self.execute_write(operation)
+    
+    def execute_read(self, operation):
+        """
+        Execute a read-only operation without committing.
+        
+        Closing the session ends the transaction without a commit, and unlike
+        an explicit rollback it leaves loaded objects unexpired.
+        
+        Args:
+            operation: Function that takes a session parameter
+            
+        Returns:
+            Result of the operation
+        """
+        session = self.Session()
+        try:
+            return operation(session)
+        except exc.SQLAlchemyError as e:
+            self.logger.error(f"Database error: {str(e)}")
+            raise
+        finally:
+            session.close()
+    
+    def execute_write(self, operation):
+        """
+        Execute an operation and commit its changes.
+        
         Args:
             operation: Function that takes a session parameter
             
@@ -88,11 +237,8 @@ class Database:
         """
         if model_instance is None:
             return None
-            
-        result = {}
-        for key in inspect(model_instance).mapper.column_attrs.keys():
-            result[key] = getattr(model_instance, key)
-        return result
+        
+        return {key: getattr(model_instance, key) for key in _column_names(type(model_instance))}
     
     def to_dict_list(self, model_instances):
         """
@@ -104,4 +250,15 @@ class Database:
         Returns:
             List of dictionaries of model attributes
         """
-        return [self.to_dict(instance) for instance in model_instances]
\ No newline at end of file
+        instances = list(model_instances)
+        if not instances:
+            return []
+        
+        # Rows of one query share a class, so resolve its columns once
+        model_class = type(instances[0])
+        keys = _column_names(model_class)
+        return [
+            {key: getattr(instance, key) for key in keys}
+            if type(instance) is model_class else self.to_dict(instance)
+            for instance in instances
+        ]
\ No newline at end of file
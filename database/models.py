@@ -10,7 +10,7 @@ This module defines the SQLAlchemy ORM models for storing:
 """
 
 from typing import List, Dict, Any, Optional, Union, Type, TypeVar
-from sqlalchemy import String, ForeignKey, create_engine
+from sqlalchemy import String, ForeignKey, Index, LargeBinary, create_engine, func
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import Mapped, mapped_column, relationship, sessionmaker, Session
 import uuid
@@ -52,8 +52,8 @@ class Identifier(Base):
     __tablename__ = 'identifiers'
     
     id: Mapped[int] = mapped_column(primary_key=True)
-    client_id: Mapped[int] = mapped_column(ForeignKey('clients.id'))
-    identifier_type: Mapped[str] = mapped_column(String)  # "name", "ip", or "domain"
+    client_id: Mapped[int] = mapped_column(ForeignKey('clients.id'), index=True)
+    identifier_type: Mapped[str] = mapped_column(String, index=True)  # "name", "ip", or "domain"
     identifier_value: Mapped[str] = mapped_column(String)
     
     client: Mapped["Client"] = relationship(back_populates="identifiers")
@@ -79,8 +79,14 @@ class Claim(Base):
         timestamp: When the claim was made
         claim_url: URL to the claim
         key: Unique UUID to identify the record
+        claim_hash: Digest of the normalized source, threat actor and name,
+            used for duplicate checks
     """
     __tablename__ = 'claims'
+    __table_args__ = (
+        Index('ix_claims_source_ts', 'source', 'timestamp'),
+        Index('ix_claims_hash_ts', 'claim_hash', 'timestamp'),
+    )
     
     id: Mapped[int] = mapped_column(primary_key=True)
     threat_actor: Mapped[str] = mapped_column(String)
@@ -91,13 +97,25 @@ class Claim(Base):
     sector: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     comment: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     raw_data: Mapped[str] = mapped_column(String)
-    timestamp: Mapped[datetime] = mapped_column()
+    timestamp: Mapped[datetime] = mapped_column(index=True)
     claim_url: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     key: Mapped[str] = mapped_column(String, unique=True, default=lambda: str(uuid.uuid4()))
+    claim_hash: Mapped[Optional[bytes]] = mapped_column(LargeBinary(16), nullable=True)
     
     def __repr__(self) -> str:
         return f"<Claim(threat_actor='{self.threat_actor}', name='{self.name_network_identifier}')>"
 
+# Expression index matching the case-insensitive domain duplicate check in
+# ClaimRepository, so lower(column) comparisons are index seeks. The check
+# only selects the id, so including it makes it an index-only scan (SQLite
+# indexes already carry the rowid)
+Index(
+    'ix_claims_domain_lc',
+    func.lower(Claim.source), func.lower(Claim.threat_actor),
+    func.lower(Claim.domain_network_identifier), Claim.timestamp,
+    postgresql_include=['id']
+)
+
 class Alert(Base):
     """
     Represents an alert generated when a claim matches a watchlist identifier.
@@ -110,10 +128,13 @@ class Alert(Base):
         identifier: The identifier that triggered the alert
     """
     __tablename__ = 'alerts'
+    __table_args__ = (
+        Index('ix_alerts_identifier_ts', 'identifier_id', 'timestamp'),
+    )
     
     id: Mapped[int] = mapped_column(primary_key=True)
     identifier_id: Mapped[int] = mapped_column(ForeignKey('identifiers.id'))
-    timestamp: Mapped[datetime] = mapped_column(default=datetime.now)
+    timestamp: Mapped[datetime] = mapped_column(index=True, default=datetime.now)
     message: Mapped[str] = mapped_column(String)
     
     identifier: Mapped["Identifier"] = relationship(back_populates="alerts")
@@ -4,10 +4,11 @@ Repository for alert operations in the ransomware intelligence system.
 """
 
 import logging
-from typing import List, Optional
-from sqlalchemy import exc
-from database.models import Alert
-from datetime import datetime
+from typing import Any, Dict, List, Optional
+from sqlalchemy import delete, exc
+from sqlalchemy.orm import joinedload
+from database.models import Alert, Identifier
+from datetime import datetime, timedelta
 
 class AlertRepository:
     """Repository for alert-related database operations"""
@@ -45,12 +46,45 @@ class AlertRepository:
             return alert.id
         
         try:
-            return self.db.execute_with_session(_add_alert)
+            return self.db.execute_write(_add_alert)
         except exc.SQLAlchemyError as e:
             self.logger.error(f"Error adding alert: {str(e)}")
             return None
     
-    def get_recent_alerts(self, limit: int = 100) -> List[Alert]:
+    def bulk_add_alerts(self, alerts: List[Dict[str, Any]]) -> List[int]:
+        """
+        Add multiple alerts to the database in a single transaction.
+        
+        Args:
+            alerts: List of dictionaries with identifier_id, message and an
+                optional timestamp
+            
+        Returns:
+            IDs of the added alerts in input order, or an empty list if error
+        """
+        if not alerts:
+            return []
+        
+        def _bulk_add(session):
+            now = datetime.now()
+            rows = [
+                {
+                    "identifier_id": alert["identifier_id"],
+                    "message": alert["message"],
+                    "timestamp": alert.get("timestamp", now)
+                }
+                for alert in alerts
+            ]
+            session.bulk_insert_mappings(Alert, rows, return_defaults=True)
+            return [row["id"] for row in rows]
+        
+        try:
+            return self.db.execute_write(_bulk_add)
+        except exc.SQLAlchemyError as e:
+            self.logger.error(f"Error adding alerts: {str(e)}")
+            return []
+    
+    def get_recent_alerts(self, limit: int = 100) -> List[Dict[str, Any]]:
         """
         Get recent alerts from the database.
         
@@ -58,18 +92,21 @@ class AlertRepository:
             limit: Maximum number of alerts to retrieve
             
         Returns:
-            List of recent alert objects
+            List of recent alert dictionaries
         """
         def _get_recent(session):
-            return session.query(Alert).order_by(Alert.timestamp.desc()).limit(limit).all()
+            alerts = session.query(Alert).options(
+                joinedload(Alert.identifier).joinedload(Identifier.client)
+            ).order_by(Alert.timestamp.desc()).limit(limit).all()
+            return [self._to_dict(alert) for alert in alerts]
         
         try:
-            return self.db.execute_with_session(_get_recent)
+            return self.db.execute_read(_get_recent)
         except exc.SQLAlchemyError as e:
             self.logger.error(f"Error getting recent alerts: {str(e)}")
             return []
     
-    def get_alerts_by_identifier(self, identifier_id: int) -> List[Alert]:
+    def get_alerts_by_identifier(self, identifier_id: int) -> List[Dict[str, Any]]:
         """
         Get all alerts for a specific identifier.
         
@@ -77,13 +114,16 @@ class AlertRepository:
             identifier_id: ID of the identifier
             
         Returns:
-            List of alert objects for the identifier
+            List of alert dictionaries for the identifier
         """
         def _get_alerts(session):
-            return session.query(Alert).filter(Alert.identifier_id == identifier_id).order_by(Alert.timestamp.desc()).all()
+            alerts = session.query(Alert).options(
+                joinedload(Alert.identifier).joinedload(Identifier.client)
+            ).filter(Alert.identifier_id == identifier_id).order_by(Alert.timestamp.desc()).all()
+            return [self._to_dict(alert) for alert in alerts]
         
         try:
-            return self.db.execute_with_session(_get_alerts)
+            return self.db.execute_read(_get_alerts)
         except exc.SQLAlchemyError as e:
             self.logger.error(f"Error getting alerts by identifier: {str(e)}")
             return []
@@ -99,7 +139,7 @@ class AlertRepository:
             return session.query(Alert).count()
         
         try:
-            return self.db.execute_with_session(_get_count)
+            return self.db.execute_read(_get_count)
         except exc.SQLAlchemyError as e:
             self.logger.error(f"Error getting alert count: {str(e)}")
             return 0
@@ -123,7 +163,7 @@ class AlertRepository:
             return True
         
         try:
-            return self.db.execute_with_session(_delete_alert)
+            return self.db.execute_write(_delete_alert)
         except exc.SQLAlchemyError as e:
             self.logger.error(f"Error deleting alert: {str(e)}")
             return False
@@ -139,14 +179,36 @@ class AlertRepository:
             Number of alerts deleted
         """
         def _clear_old(session):
-            cutoff_date = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-            cutoff_date = cutoff_date.replace(day=cutoff_date.day - days)
+            cutoff_date = datetime.now() - timedelta(days=days)
             
-            deleted = session.query(Alert).filter(Alert.timestamp < cutoff_date).delete()
-            return deleted
+            # Single DELETE statement; no need to load or sync the rows
+            result = session.execute(
+                delete(Alert).where(Alert.timestamp < cutoff_date)
+                .execution_options(synchronize_session=False)
+            )
+            return result.rowcount
         
         try:
-            return self.db.execute_with_session(_clear_old)
+            return self.db.execute_write(_clear_old)
         except exc.SQLAlchemyError as e:
             self.logger.error(f"Error clearing old alerts: {str(e)}")
-            return 0
\ No newline at end of file
+            return 0
+    
+    def _to_dict(self, alert: Alert) -> Dict[str, Any]:
+        """
+        Convert an Alert with its eagerly loaded identifier and client to a dictionary.
+        
+        Args:
+            alert: Alert object loaded in the current session
+            
+        Returns:
+            Alert dictionary with a nested identifier dictionary
+        """
+        result = self.db.to_dict(alert)
+        identifier = alert.identifier
+        if identifier is not None:
+            result["identifier"] = self.db.to_dict(identifier)
+            result["identifier"]["client_name"] = identifier.client.client_name if identifier.client else None
+        else:
+            result["identifier"] = None
+        return result
@@ -3,13 +3,73 @@
 Repository for claim operations in the ransomware intelligence system.
 """
 
+import bisect
+import collections
+import io
 import logging
 import hashlib
+import sys
+import threading
+import uuid
 from typing import Dict, List, Any, Optional, Tuple
-from sqlalchemy import exc, or_, and_, func
+from sqlalchemy import exc, or_, and_, bindparam, func, insert, select, update
+from sqlalchemy.orm import aliased
 from database.models import Claim
+from utils.bloom_filter import BloomFilter
 from datetime import datetime, timedelta
 
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - optional dependency
+    ahocorasick = None
+
+# Minimum batch size for which PostgreSQL ingests use COPY instead of INSERT
+COPY_THRESHOLD = 100
+
+# Number of recently confirmed duplicate claims remembered by _is_duplicate
+DUP_CACHE_SIZE = 50000
+
+# Claim fields checked and sanitized by _validate_claim
+_REQUIRED_FIELDS = ("threat_actor", "collector", "name_network_identifier", "timestamp")
+_STRING_FIELDS = (
+    "threat_actor", "collector", "name_network_identifier",
+    "ip_network_identifier", "domain_network_identifier",
+    "sector", "comment", "claim_url", "raw_data"
+)
+# Low-cardinality fields repeated across many claims, interned so equal
+# values share one string object
+_INTERNED_FIELDS = ("collector", "threat_actor", "sector")
+
+# Columns read for claim dictionaries and their keys (source is exposed as collector),
+# selected directly to skip ORM object creation
+_CLAIM_COLS = (
+    Claim.id, Claim.source, Claim.threat_actor, Claim.name_network_identifier,
+    Claim.ip_network_identifier, Claim.domain_network_identifier, Claim.sector,
+    Claim.comment, Claim.raw_data, Claim.timestamp, Claim.claim_url, Claim.key
+)
+_CLAIM_KEYS = (
+    "id", "collector", "threat_actor", "name_network_identifier",
+    "ip_network_identifier", "domain_network_identifier", "sector",
+    "comment", "raw_data", "timestamp", "claim_url", "key"
+)
+
+# Statements used on every ingest, built once with bound parameters
+_CLAIM_INSERT = insert(Claim).returning(Claim.id, sort_by_parameter_order=True)
+_DUP_NAME_MATCH = select(Claim.id).where(
+    Claim.claim_hash == bindparam("claim_hash"),
+    Claim.timestamp.between(bindparam("start"), bindparam("end"))
+).limit(1)
+_DUP_DOMAIN_MATCH = select(Claim.id).where(
+    func.lower(Claim.source) == bindparam("source"),
+    func.lower(Claim.threat_actor) == bindparam("threat_actor"),
+    func.lower(Claim.domain_network_identifier) == bindparam("value"),
+    Claim.timestamp.between(bindparam("start"), bindparam("end"))
+).limit(1)
+_CLAIMS_SINCE = select(
+    Claim.id, Claim.source, Claim.threat_actor, Claim.name_network_identifier,
+    Claim.domain_network_identifier, Claim.timestamp
+).where(Claim.id > bindparam("max_id"))
+
 class ClaimRepository:
     """Repository for claim-related database operations"""
     
@@ -17,6 +77,17 @@ class ClaimRepository:
         """Initialize the claim repository with database instance"""
         self.db = database
         self.logger = logging.getLogger("claim_repository")
+        
+        # Bloom filter of every stored claim's duplicate keys, built on first
+        # use and topped up with rows above the highest ID it has seen
+        self._seen = None
+        self._seen_max_id = 0
+        self._seen_lock = threading.Lock()
+        
+        # Claims known to be stored, keyed by normalized identity in LRU order.
+        # Claims are never deleted, so a cached hit stays valid.
+        self._dup_cache = collections.OrderedDict()
+        self._dup_cache_lock = threading.Lock()
     
     def add_claim(self, claim_data: Dict[str, Any]) -> Optional[int]:
         """
@@ -37,27 +108,20 @@ class ClaimRepository:
                 self.logger.debug(f"Duplicate claim found, skipping: {sanitized_data['name_network_identifier']}")
                 return None
             
-            # Create and add new claim
-            new_claim = Claim(
-                threat_actor=sanitized_data["threat_actor"],
-                source=sanitized_data["collector"],
-                ip_network_identifier=sanitized_data.get("ip_network_identifier"),
-                domain_network_identifier=sanitized_data.get("domain_network_identifier"),
-                name_network_identifier=sanitized_data["name_network_identifier"],
-                sector=sanitized_data.get("sector"),
-                comment=sanitized_data.get("comment"),
-                raw_data=sanitized_data.get("raw_data", ""),
-                timestamp=sanitized_data["timestamp"],
-                claim_url=sanitized_data.get("claim_url", "")
-            )
-            
-            session.add(new_claim)
-            session.flush()  # Flush to get the ID
+            # Insert the new claim and get its ID
+            new_id = session.scalars(_CLAIM_INSERT, [self._to_row(sanitized_data)]).one()
+            added.append(sanitized_data)
             self.logger.info(f"Added new claim: {sanitized_data['name_network_identifier']} from {sanitized_data['threat_actor']}")
-            return new_claim.id
+            return new_id
         
+        added = []
         try:
-            return self.db.execute_with_session(_add_claim)
+            claim_id = self.db.execute_write(_add_claim)
+            # Only cache once committed, so a failed insert is not treated as stored
+            for sanitized_data in added:
+                name_key, domain_key = self._duplicate_keys(sanitized_data)
+                self._remember_duplicate(self._dup_cache_key(name_key, domain_key, sanitized_data["timestamp"]))
+            return claim_id
         except exc.SQLAlchemyError as e:
             self.logger.error(f"Error adding claim: {str(e)}")
             return None
@@ -73,50 +137,347 @@ class ClaimRepository:
             List of IDs for added claims (None for duplicates)
         """
         def _bulk_add(session):
-            added_ids = []
+            added_ids = [None] * len(claims_data)
+            rows = []
+            row_positions = []
+            accepted = []
             
-            # Process each claim
-            for claim_data in claims_data:
+            # Pass 1: validate
+            valid = []
+            for position, claim_data in enumerate(claims_data):
                 try:
-                    sanitized_data = self._validate_claim(claim_data)
-                    
-                    # Check for duplicates using enhanced detection
-                    if self._is_duplicate(session, sanitized_data):
-                        self.logger.debug(f"Duplicate claim in bulk add, skipping: {sanitized_data['name_network_identifier']}")
-                        added_ids.append(None)  # Mark as duplicate
-                        continue
-                    
-                    # Create and add new claim
-                    new_claim = Claim(
-                        threat_actor=sanitized_data["threat_actor"],
-                        source=sanitized_data["collector"],
-                        ip_network_identifier=sanitized_data.get("ip_network_identifier"),
-                        domain_network_identifier=sanitized_data.get("domain_network_identifier"),
-                        name_network_identifier=sanitized_data["name_network_identifier"],
-                        sector=sanitized_data.get("sector"),
-                        comment=sanitized_data.get("comment"),
-                        raw_data=sanitized_data.get("raw_data", ""),
-                        timestamp=sanitized_data["timestamp"],
-                        claim_url=sanitized_data.get("claim_url", "")
-                    )
-                    
-                    session.add(new_claim)
-                    session.flush()
-                    added_ids.append(new_claim.id)
-                    self.logger.info(f"Added new claim (bulk): {sanitized_data['name_network_identifier']} from {sanitized_data['threat_actor']}")
-                    
+                    valid.append((position, self._validate_claim(claim_data)))
                 except ValueError as e:
                     self.logger.warning(f"Skipping invalid claim: {str(e)}")
-                    added_ids.append(None)
             
+            # Pass 2: drop duplicates against one prefetch of existing claims;
+            # accepted claims are added to the index so in-batch repeats are caught too
+            name_index, domain_index = self._load_duplicate_index(
+                session, [sanitized_data for _, sanitized_data in valid])
+            
+            for position, sanitized_data in valid:
+                name_key, domain_key = self._duplicate_keys(sanitized_data)
+                timestamp = sanitized_data["timestamp"]
+                
+                if self._in_window(name_index.get(name_key), timestamp, timedelta(hours=1)) or \
+                        (domain_key and self._in_window(domain_index.get(domain_key), timestamp, timedelta(days=1))):
+                    self.logger.debug("Duplicate claim in bulk add, skipping: %s", sanitized_data['name_network_identifier'])
+                    continue
+                
+                bisect.insort(name_index.setdefault(name_key, []), timestamp)
+                if domain_key:
+                    bisect.insort(domain_index.setdefault(domain_key, []), timestamp)
+                
+                accepted.append(sanitized_data)
+                rows.append(self._to_row(sanitized_data, name_key))
+                row_positions.append(position)
+            
+            if not rows:
+                self.logger.info(f"Added 0 claims (skipped {len(valid)} duplicates, {len(claims_data) - len(valid)} invalid)")
+                return added_ids
+            
+            # Pass 3: insert every new claim in one statement
+            if session.bind.dialect.name == "postgresql" and len(rows) >= COPY_THRESHOLD:
+                new_ids = self._copy_rows(session, rows)
+            else:
+                new_ids = session.scalars(_CLAIM_INSERT, rows).all()
+            
+            for position, new_id, sanitized_data in zip(row_positions, new_ids, accepted):
+                added_ids[position] = new_id
+                self.logger.debug("Added new claim (bulk): %s from %s",
+                                  sanitized_data['name_network_identifier'], sanitized_data['threat_actor'])
+            
+            self.logger.info(f"Added {len(rows)} claims (skipped {len(valid) - len(rows)} duplicates, "
+                             f"{len(claims_data) - len(valid)} invalid)")
             return added_ids
         
         try:
-            return self.db.execute_with_session(_bulk_add)
+            return self.db.execute_write(_bulk_add)
         except exc.SQLAlchemyError as e:
             self.logger.error(f"Error in bulk add claims: {str(e)}")
             return []
     
+    def _to_row(self, sanitized_data: Dict[str, Any], name_key: Optional[tuple] = None) -> Dict[str, Any]:
+        """
+        Map validated claim data to Claim column values.
+        
+        Args:
+            sanitized_data: Claim data as returned by _validate_claim()
+            name_key: Normalized name key, when the caller already built it
+        """
+        if name_key is None:
+            name_key, _ = self._duplicate_keys(sanitized_data)
+        return {
+            "threat_actor": sanitized_data["threat_actor"],
+            "source": sanitized_data["collector"],
+            "ip_network_identifier": sanitized_data.get("ip_network_identifier"),
+            "domain_network_identifier": sanitized_data.get("domain_network_identifier"),
+            "name_network_identifier": sanitized_data["name_network_identifier"],
+            "sector": sanitized_data.get("sector"),
+            "comment": sanitized_data.get("comment"),
+            "raw_data": sanitized_data.get("raw_data", ""),
+            "timestamp": sanitized_data["timestamp"],
+            "claim_url": sanitized_data.get("claim_url", ""),
+            "claim_hash": self._claim_hash(name_key)
+        }
+    
+    def _copy_rows(self, session, rows: List[Dict[str, Any]]) -> List[int]:
+        """
+        Load claim rows with PostgreSQL COPY.
+        
+        COPY does not return generated IDs, so each row gets its unique key
+        up front and the IDs are looked up by key afterwards.
+        
+        Args:
+            session: Active session bound to a PostgreSQL engine
+            rows: Claim column values, as produced by _to_row()
+            
+        Returns:
+            IDs of the inserted claims in input order
+        """
+        for row in rows:
+            row["key"] = str(uuid.uuid4())
+        columns = list(rows[0].keys())
+        
+        # CSV with every value quoted except None, which is left as an
+        # unquoted empty field so COPY reads it as NULL; bytes use bytea hex
+        buffer = io.StringIO()
+        for row in rows:
+            buffer.write(",".join(
+                "" if row[column] is None
+                else "\\x" + row[column].hex() if isinstance(row[column], bytes)
+                else '"' + str(row[column]).replace('"', '""') + '"'
+                for column in columns
+            ))
+            buffer.write("\n")
+        buffer.seek(0)
+        
+        cursor = session.connection().connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY {Claim.__tablename__} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+                buffer
+            )
+        finally:
+            cursor.close()
+        
+        keys = [row["key"] for row in rows]
+        ids_by_key = dict(session.execute(
+            select(Claim.key, Claim.id).where(Claim.key.in_(keys))
+        ).all())
+        return [ids_by_key[key] for key in keys]
+    
+    def _duplicate_keys(self, claim_data: Dict[str, Any]) -> Tuple[tuple, Optional[tuple]]:
+        """
+        Build the normalized keys used by the duplicate index.
+        
+        Returns:
+            Tuple of (source, actor, name) key and (source, actor, domain)
+            key, the latter None when the claim has no domain
+        """
+        source = claim_data["collector"].lower().strip()
+        threat_actor = claim_data["threat_actor"].lower().strip()
+        name = claim_data["name_network_identifier"].lower().strip()
+        domain = (claim_data.get("domain_network_identifier") or "").lower().strip()
+        return (source, threat_actor, name), ((source, threat_actor, domain) if domain else None)
+    
+    @staticmethod
+    def _claim_hash(name_key: tuple) -> bytes:
+        """
+        Digest a normalized (source, actor, name) key for the claim_hash column.
+        
+        Args:
+            name_key: Key as returned by _duplicate_keys()
+            
+        Returns:
+            16-byte BLAKE2b digest
+        """
+        return hashlib.blake2b("\0".join(name_key).encode("utf-8"), digest_size=16).digest()
+    
+    def backfill_claim_hashes(self, batch_size: int = 5000) -> int:
+        """
+        Fill in claim_hash for claims stored before the column existed.
+        
+        Args:
+            batch_size: Number of claims updated per statement
+            
+        Returns:
+            Number of claims updated
+        """
+        def _backfill(session):
+            rows = session.execute(
+                select(Claim.id, Claim.source, Claim.threat_actor, Claim.name_network_identifier)
+                .where(Claim.claim_hash.is_(None))
+            ).all()
+            updates = []
+            for claim_id, source, threat_actor, name in rows:
+                name_key, _ = self._duplicate_keys({
+                    "collector": source or "",
+                    "threat_actor": threat_actor or "",
+                    "name_network_identifier": name or ""
+                })
+                updates.append({"id": claim_id, "claim_hash": self._claim_hash(name_key)})
+            for start in range(0, len(updates), batch_size):
+                session.execute(update(Claim), updates[start:start + batch_size])
+            return len(updates)
+        
+        try:
+            updated = self.db.execute_write(_backfill)
+            if updated:
+                self.logger.info(f"Backfilled claim hashes for {updated} claims")
+            return updated
+        except exc.SQLAlchemyError as e:
+            self.logger.error(f"Error backfilling claim hashes: {str(e)}")
+            return 0
+    
+    def _load_duplicate_index(self, session, claims: List[Dict[str, Any]]) -> Tuple[Dict[tuple, list], Dict[tuple, list]]:
+        """
+        Prefetch existing claims near a batch and index them for duplicate checks.
+        
+        Applies the same criteria as _is_duplicate() with one query for the
+        whole batch instead of up to three per claim.
+        
+        Args:
+            session: Active database session
+            claims: Validated claims of the batch
+            
+        Returns:
+            Tuple of (name index, domain index), each mapping a normalized key
+            to a sorted list of claim timestamps
+        """
+        name_index = {}
+        domain_index = {}
+        if not claims:
+            return name_index, domain_index
+        
+        timestamps = [claim["timestamp"] for claim in claims]
+        window_start = min(timestamps) - timedelta(days=1)
+        window_end = max(timestamps) + timedelta(days=1)
+        
+        existing = session.query(
+            Claim.source, Claim.threat_actor, Claim.name_network_identifier,
+            Claim.domain_network_identifier, Claim.timestamp
+        ).filter(Claim.timestamp.between(window_start, window_end)).all()
+        
+        for source, threat_actor, name, domain, timestamp in existing:
+            name_key, domain_key = self._duplicate_keys({
+                "collector": source or "",
+                "threat_actor": threat_actor or "",
+                "name_network_identifier": name or "",
+                "domain_network_identifier": domain
+            })
+            name_index.setdefault(name_key, []).append(timestamp)
+            if domain_key:
+                domain_index.setdefault(domain_key, []).append(timestamp)
+        
+        for index in (name_index, domain_index):
+            for timestamps in index.values():
+                timestamps.sort()
+        
+        return name_index, domain_index
+    
+    @staticmethod
+    def _in_window(timestamps: Optional[list], timestamp: datetime, delta: timedelta) -> bool:
+        """Check whether a sorted timestamp list has an entry within delta of timestamp"""
+        if not timestamps:
+            return False
+        i = bisect.bisect_left(timestamps, timestamp - delta)
+        return i < len(timestamps) and timestamps[i] <= timestamp + delta
+    
+    @staticmethod
+    def _bloom_keys(name_key: tuple, domain_key: Optional[tuple], timestamp: datetime,
+                    neighbours: bool = False) -> List[str]:
+        """
+        Build Bloom filter keys from duplicate keys and a time bucket.
+        
+        Names are bucketed by hour and domains by day. With neighbours, the
+        adjacent buckets are included too, covering the +/-1 hour and
+        +/-1 day duplicate windows. Buckets are plain integers (days since
+        the epoch of the proleptic calendar, and hours since then), which is
+        much cheaper than building and formatting datetimes per key.
+        """
+        day = timestamp.toordinal()
+        hour = day * 24 + timestamp.hour
+        offsets = (-1, 0, 1) if neighbours else (0,)
+        
+        name_prefix = "n|" + "|".join(name_key) + "|"
+        keys = [name_prefix + str(hour + offset) for offset in offsets]
+        if domain_key:
+            domain_prefix = "d|" + "|".join(domain_key) + "|"
+            keys.extend(domain_prefix + str(day + offset) for offset in offsets)
+        return keys
+    
+    def _may_be_duplicate(self, session, name_key: tuple, domain_key: Optional[tuple], timestamp: datetime) -> bool:
+        """
+        Check the Bloom filter for stored claims that could duplicate this one.
+        
+        First adds any claims stored since the last check. That is a single
+        primary key range query, normally returning nothing. The filter has no
+        false negatives, so a False result means no duplicate can exist. This
+        assumes IDs are committed in order; callers check _ids_commit_in_order
+        first.
+        
+        Args:
+            session: Active database session
+            name_key: Normalized (source, actor, name) key of the claim
+            domain_key: Normalized (source, actor, domain) key, or None
+            timestamp: Claim timestamp
+            
+        Returns:
+            False if the claim is definitely new, True if SQL checks are needed
+        """
+        with self._seen_lock:
+            if self._seen is None:
+                self._seen = BloomFilter(capacity=1_000_000, error_rate=1e-6)
+                self._seen_max_id = 0
+            
+            rows = session.execute(_CLAIMS_SINCE, {"max_id": self._seen_max_id}).all()
+            for claim_id, source, threat_actor, name, domain, stored_at in rows:
+                stored_name_key, stored_domain_key = self._duplicate_keys({
+                    "collector": source or "",
+                    "threat_actor": threat_actor or "",
+                    "name_network_identifier": name or "",
+                    "domain_network_identifier": domain
+                })
+                for key in self._bloom_keys(stored_name_key, stored_domain_key, stored_at):
+                    self._seen.add(key)
+                self._seen_max_id = max(self._seen_max_id, claim_id)
+            
+            return any(
+                key in self._seen
+                for key in self._bloom_keys(name_key, domain_key, timestamp, neighbours=True)
+            )
+    
+    @staticmethod
+    def _ids_commit_in_order(session) -> bool:
+        """
+        Check whether claim IDs become visible in increasing order.
+        
+        Holds for SQLite's single writer. With concurrent writers, e.g. on
+        PostgreSQL, a lower ID can commit after a higher one has been read,
+        and the Bloom filter would never see it.
+        
+        Args:
+            session: Active database session
+            
+        Returns:
+            True if the Bloom filter prefilter can be used
+        """
+        return session.bind.dialect.name == "sqlite"
+    
+    @staticmethod
+    def _dup_cache_key(name_key: tuple, domain_key: Optional[tuple], timestamp: datetime) -> tuple:
+        """Build the duplicate cache key: the normalized identity of a claim"""
+        return name_key + ((domain_key[2] if domain_key else ""), timestamp)
+    
+    def _remember_duplicate(self, cache_key: tuple) -> None:
+        """Record that a claim is stored, so identical claims are duplicates"""
+        with self._dup_cache_lock:
+            self._dup_cache[cache_key] = True
+            self._dup_cache.move_to_end(cache_key)
+            if len(self._dup_cache) > DUP_CACHE_SIZE:
+                self._dup_cache.popitem(last=False)
+    
     def _is_duplicate(self, session, claim_data: Dict[str, Any]) -> bool:
         """
         Enhanced duplicate detection using multiple criteria.
@@ -126,38 +487,41 @@ class ClaimRepository:
         2. Same source, threat_actor, name, and timestamp within 1 hour
         3. Same source, threat_actor, domain, and timestamp within 1 day
         """
-        # Normalize fields for comparison
-        source = claim_data["collector"].lower().strip()
-        threat_actor = claim_data["threat_actor"].lower().strip()
-        name = claim_data["name_network_identifier"].lower().strip()
-        domain = claim_data.get("domain_network_identifier", "").lower().strip()
+        # Normalize once; the caches and all queries below share these values
+        name_key, domain_key = self._duplicate_keys(claim_data)
+        source, threat_actor, name = name_key
+        domain = domain_key[2] if domain_key else ""
         timestamp = claim_data["timestamp"]
         
-        # 1. Check for exact match
-        exact_match = session.query(Claim).filter(
-            func.lower(Claim.source) == source,
-            func.lower(Claim.threat_actor) == threat_actor,
-            func.lower(Claim.name_network_identifier) == name,
-            Claim.timestamp == timestamp
-        ).first()
-        
-        if exact_match:
-            self.logger.debug(f"Exact duplicate found for {name} from {threat_actor}")
+        # Collectors resubmit the same claims every cycle: answer those from memory
+        cache_key = self._dup_cache_key(name_key, domain_key, timestamp)
+        with self._dup_cache_lock:
+            cached = cache_key in self._dup_cache
+            if cached:
+                self._dup_cache.move_to_end(cache_key)
+        if cached:
+            self.logger.debug(f"Cached duplicate found for {name} from {threat_actor}")
             return True
         
-        # 2. Check for same data within time window
+        # Most incoming claims are new: skip the queries when the filter has
+        # never seen anything close to this claim
+        if self._ids_commit_in_order(session) and \
+                not self._may_be_duplicate(session, name_key, domain_key, timestamp):
+            return False
+        
+        # 1 and 2. Same name within the time window; the window includes
+        # the exact timestamp, so one query covers both rules
         time_window_start = timestamp - timedelta(hours=1)
         time_window_end = timestamp + timedelta(hours=1)
         
-        time_match = session.query(Claim).filter(
-            func.lower(Claim.source) == source,
-            func.lower(Claim.threat_actor) == threat_actor,
-            func.lower(Claim.name_network_identifier) == name,
-            Claim.timestamp.between(time_window_start, time_window_end)
-        ).first()
+        time_match = session.execute(_DUP_NAME_MATCH, {
+            "claim_hash": self._claim_hash(name_key),
+            "start": time_window_start, "end": time_window_end
+        }).scalar()
         
         if time_match:
             self.logger.debug(f"Time-based duplicate found for {name} from {threat_actor}")
+            self._remember_duplicate(cache_key)
             return True
         
         # 3. Check for domain match within larger time window
@@ -165,15 +529,14 @@ class ClaimRepository:
             domain_time_window_start = timestamp - timedelta(days=1)
             domain_time_window_end = timestamp + timedelta(days=1)
             
-            domain_match = session.query(Claim).filter(
-                func.lower(Claim.source) == source,
-                func.lower(Claim.threat_actor) == threat_actor,
-                func.lower(Claim.domain_network_identifier) == domain,
-                Claim.timestamp.between(domain_time_window_start, domain_time_window_end)
-            ).first()
+            domain_match = session.execute(_DUP_DOMAIN_MATCH, {
+                "source": source, "threat_actor": threat_actor, "value": domain,
+                "start": domain_time_window_start, "end": domain_time_window_end
+            }).scalar()
             
             if domain_match:
                 self.logger.debug(f"Domain-based duplicate found for {domain} from {threat_actor}")
+                self._remember_duplicate(cache_key)
                 return True
         
         return False
@@ -187,7 +550,7 @@ class ClaimRepository:
             return None
         
         try:
-            return self.db.execute_with_session(_get_claim)
+            return self.db.execute_read(_get_claim)
         except exc.SQLAlchemyError as e:
             self.logger.error(f"Error getting claim: {str(e)}")
             return None
@@ -195,11 +558,13 @@ class ClaimRepository:
     def get_recent_claims(self, limit: int = 100) -> List[Dict[str, Any]]:
         """Get recent claims from the database"""
         def _get_recent(session):
-            claims = session.query(Claim).order_by(Claim.timestamp.desc()).limit(limit).all()
-            return [self._to_dict(claim) for claim in claims]
+            rows = session.execute(
+                select(*_CLAIM_COLS).order_by(Claim.timestamp.desc()).limit(limit)
+            ).all()
+            return [dict(zip(_CLAIM_KEYS, row)) for row in rows]
         
         try:
-            return self.db.execute_with_session(_get_recent)
+            return self.db.execute_read(_get_recent)
         except exc.SQLAlchemyError as e:
             self.logger.error(f"Error getting recent claims: {str(e)}")
             return []
@@ -208,12 +573,12 @@ class ClaimRepository:
         """Convert a Claim object to a dictionary"""
         return {
             "id": claim.id,
-            "collector": claim.source,
-            "threat_actor": claim.threat_actor,
+            "collector": sys.intern(claim.source) if claim.source else claim.source,
+            "threat_actor": sys.intern(claim.threat_actor) if claim.threat_actor else claim.threat_actor,
             "name_network_identifier": claim.name_network_identifier,
             "ip_network_identifier": claim.ip_network_identifier,
             "domain_network_identifier": claim.domain_network_identifier,
-            "sector": claim.sector,
+            "sector": sys.intern(claim.sector) if claim.sector else claim.sector,
             "comment": claim.comment,
             "raw_data": claim.raw_data,
             "timestamp": claim.timestamp,
@@ -225,47 +590,161 @@ class ClaimRepository:
         """
         Validate and sanitize claim data.
         
+        Builds a new dictionary holding only the claim fields, so the input
+        is never modified.
+        
         Raises:
             ValueError: If required fields are missing
         """
-        # Create copy to avoid modifying original
-        sanitized = claim_data.copy()
-        
         # Check required fields
-        required_fields = ["threat_actor", "collector", "name_network_identifier", "timestamp"]
-        for field in required_fields:
-            if field not in sanitized or sanitized[field] is None:
+        for field in _REQUIRED_FIELDS:
+            if claim_data.get(field) is None:
                 raise ValueError(f"Missing required field: {field}")
         
-        # Sanitize string fields
-        string_fields = [
-            "threat_actor", "collector", "name_network_identifier", 
-            "ip_network_identifier", "domain_network_identifier", 
-            "sector", "comment", "claim_url", "raw_data"
-        ]
+        # Sanitize string fields present in the input: None becomes an empty
+        # string, other values are converted to str, and whitespace is stripped
+        sanitized = {"timestamp": claim_data["timestamp"], "claim_url": ""}
+        for field in _STRING_FIELDS:
+            if field in claim_data:
+                value = claim_data[field]
+                if value is None:
+                    sanitized[field] = ""
+                elif isinstance(value, str):
+                    sanitized[field] = value.strip()
+                else:
+                    sanitized[field] = str(value).strip()
         
-        for field in string_fields:
+        for field in _INTERNED_FIELDS:
             if field in sanitized:
-                # Convert None to empty string
-                if sanitized[field] is None:
-                    sanitized[field] = ""
-                # Ensure it's a string
-                elif not isinstance(sanitized[field], str):
-                    sanitized[field] = str(sanitized[field])
-                # Strip whitespace
-                sanitized[field] = sanitized[field].strip()
+                sanitized[field] = sys.intern(sanitized[field])
         
-        # Ensure raw_data is string
-        if "raw_data" in sanitized and not isinstance(sanitized["raw_data"], str):
-            sanitized["raw_data"] = str(sanitized["raw_data"])
+        return sanitized
+    
+    def _find_duplicates_sql(self, session, start_date: datetime, end_date: datetime) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """
+        Find potential duplicate claims with a PostgreSQL self-join.
         
-        # Default empty string for optional fields
-        if "claim_url" not in sanitized:
-            sanitized["claim_url"] = ""
+        Applies the same rules as the Python path in find_duplicates(), but
+        only matching pairs leave the database.
         
-        return sanitized
+        Args:
+            session: Active session bound to a PostgreSQL engine
+            start_date: Start of the time window
+            end_date: End of the time window
+            
+        Returns:
+            List of (earlier claim, later claim) dictionary pairs
+        """
+        c1 = aliased(Claim)
+        c2 = aliased(Claim)
+        
+        def contains(outer, inner):
+            # strpos rather than LIKE, so % and _ in names are matched literally
+            return func.strpos(func.lower(outer), func.lower(inner)) > 0
+        
+        name_match = and_(
+            c1.name_network_identifier != "", c2.name_network_identifier != "",
+            or_(contains(c2.name_network_identifier, c1.name_network_identifier),
+                contains(c1.name_network_identifier, c2.name_network_identifier))
+        )
+        domain_match = and_(
+            c1.domain_network_identifier != "", c2.domain_network_identifier != "",
+            or_(contains(c2.domain_network_identifier, c1.domain_network_identifier),
+                contains(c1.domain_network_identifier, c2.domain_network_identifier))
+        )
+        
+        pairs = session.execute(
+            select(c1, c2).join(c2, and_(
+                func.lower(c1.threat_actor) == func.lower(c2.threat_actor),
+                # c1 is the earlier claim of the pair, ties broken by ID
+                or_(c1.timestamp < c2.timestamp, and_(c1.timestamp == c2.timestamp, c1.id < c2.id)),
+                c2.timestamp <= c1.timestamp + timedelta(days=1),
+                or_(name_match, domain_match)
+            )).where(
+                c1.timestamp.between(start_date, end_date),
+                c2.timestamp.between(start_date, end_date)
+            ).order_by(func.lower(c1.threat_actor), c1.timestamp, c2.timestamp)
+        ).all()
+        
+        return [(self._to_dict(claim1), self._to_dict(claim2)) for claim1, claim2 in pairs]
     
-    def find_duplicates(self, time_window_days: int = 7) -> List[Tuple[Claim, Claim]]:
+    def _pair_duplicates(self, actor_claims: List[Tuple[Claim, str, str]],
+                         duplicates: List[Tuple[Dict[str, Any], Dict[str, Any]]]) -> None:
+        """
+        Append likely duplicate pairs from one actor's claims.
+        
+        Args:
+            actor_claims: (claim, lowercased name, lowercased domain) tuples sorted by timestamp
+            duplicates: List to append matching pairs to
+        """
+        max_gap = timedelta(days=1)
+        timestamps = [entry[0].timestamp for entry in actor_claims]
+        
+        if ahocorasick is not None:
+            # Find every substring pair with one automaton scan per field,
+            # then keep the pairs within the time window
+            pairs = self._substring_pairs([entry[1] for entry in actor_claims])
+            pairs |= self._substring_pairs([entry[2] for entry in actor_claims])
+            for i, j in sorted(pairs):
+                if timestamps[j] - timestamps[i] <= max_gap:
+                    duplicates.append((self._to_dict(actor_claims[i][0]), self._to_dict(actor_claims[j][0])))
+            return
+        
+        for i in range(len(actor_claims)):
+            claim1, name1, domain1 = actor_claims[i]
+            
+            # Sorted by time, so binary search for the last claim within 1 day
+            window_end = bisect.bisect_right(timestamps, timestamps[i] + max_gap, i + 1)
+            for j in range(i+1, window_end):
+                claim2, name2, domain2 = actor_claims[j]
+                
+                # Check for name similarity
+                if name1 and name2 and (name1 in name2 or name2 in name1):
+                    duplicates.append((self._to_dict(claim1), self._to_dict(claim2)))
+                    continue
+                
+                # Check for domain match
+                if domain1 and domain2 and (domain1 in domain2 or domain2 in domain1):
+                    duplicates.append((self._to_dict(claim1), self._to_dict(claim2)))
+    
+    @staticmethod
+    def _substring_pairs(values: List[str]) -> set:
+        """
+        Find index pairs where one value is a substring of the other.
+        
+        Builds an Aho-Corasick automaton of all values and scans each value
+        once, instead of comparing every pair.
+        
+        Args:
+            values: Lowercased strings; empty strings never match
+            
+        Returns:
+            Set of (i, j) index pairs with i < j
+        """
+        positions = collections.defaultdict(list)
+        for index, value in enumerate(values):
+            if value:
+                positions[value].append(index)
+        
+        pairs = set()
+        if not positions:
+            return pairs
+        
+        automaton = ahocorasick.Automaton()
+        for value in positions:
+            automaton.add_word(value, value)
+        automaton.make_automaton()
+        
+        for index, value in enumerate(values):
+            if not value:
+                continue
+            for _, found in automaton.iter(value):
+                for other in positions[found]:
+                    if other != index:
+                        pairs.add((min(index, other), max(index, other)))
+        return pairs
+    
+    def find_duplicates(self, time_window_days: int = 7) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
         """Find potential duplicate claims in the database"""
         def _find_duplicates(session):
             duplicates = []
@@ -274,49 +753,37 @@ class ClaimRepository:
             end_date = datetime.now()
             start_date = end_date - timedelta(days=time_window_days)
             
-            claims = session.query(Claim).filter(
+            if session.bind.dialect.name == "postgresql":
+                return self._find_duplicates_sql(session, start_date, end_date)
+            
+            # Ordering by the normalized actor keeps each group contiguous, so
+            # claims can be streamed and paired one actor at a time
+            stmt = select(Claim).where(
                 Claim.timestamp.between(start_date, end_date)
-            ).order_by(Claim.threat_actor, Claim.timestamp).all()
+            ).order_by(func.lower(Claim.threat_actor), Claim.timestamp)
             
-            # Group by threat actor
-            claims_by_actor = {}
-            for claim in claims:
+            current_actor = None
+            actor_claims = []
+            for claim in session.execute(
+                stmt.execution_options(stream_results=True)
+            ).yield_per(5000).scalars():
                 actor = claim.threat_actor.lower()
-                if actor not in claims_by_actor:
-                    claims_by_actor[actor] = []
-                claims_by_actor[actor].append(claim)
-            
-            # Check each group
-            for actor, actor_claims in claims_by_actor.items():
-                for i in range(len(actor_claims)):
-                    for j in range(i+1, len(actor_claims)):
-                        claim1 = actor_claims[i]
-                        claim2 = actor_claims[j]
-                        
-                        # Check if timestamps are close
-                        time_diff = abs((claim1.timestamp - claim2.timestamp).total_seconds())
-                        if time_diff > 86400:  # More than 1 day apart
-                            continue
-                            
-                        # Check for name similarity
-                        name1 = claim1.name_network_identifier.lower() if claim1.name_network_identifier else ""
-                        name2 = claim2.name_network_identifier.lower() if claim2.name_network_identifier else ""
-                        
-                        if name1 and name2 and (name1 in name2 or name2 in name1):
-                            duplicates.append((claim1, claim2))
-                            continue
-                            
-                        # Check for domain match
-                        domain1 = claim1.domain_network_identifier.lower() if claim1.domain_network_identifier else ""
-                        domain2 = claim2.domain_network_identifier.lower() if claim2.domain_network_identifier else ""
-                        
-                        if domain1 and domain2 and (domain1 in domain2 or domain2 in domain1):
-                            duplicates.append((claim1, claim2))
+                if actor != current_actor:
+                    self._pair_duplicates(actor_claims, duplicates)
+                    current_actor = actor
+                    actor_claims = []
+                # Normalize names and domains once per claim
+                actor_claims.append((
+                    claim,
+                    claim.name_network_identifier.lower() if claim.name_network_identifier else "",
+                    claim.domain_network_identifier.lower() if claim.domain_network_identifier else ""
+                ))
+            self._pair_duplicates(actor_claims, duplicates)
             
             return duplicates
             
         try:
-            return self.db.execute_with_session(_find_duplicates)
+            return self.db.execute_read(_find_duplicates)
         except exc.SQLAlchemyError as e:
             self.logger.error(f"Error finding duplicates: {str(e)}")
             return []
\ No newline at end of file
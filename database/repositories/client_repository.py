@@ -4,8 +4,8 @@ Repository for client operations in the ransomware intelligence system.
 """
 
 import logging
-from typing import List, Optional
-from sqlalchemy import exc
+from typing import Dict, List, Optional
+from sqlalchemy import exc, insert
 from database.models import Client
 
 class ClientRepository:
@@ -52,11 +52,52 @@ class ClientRepository:
             return client.id
         
         try:
-            return self.db.execute_with_session(_add_client)
+            return self.db.execute_write(_add_client)
         except exc.SQLAlchemyError as e:
             self.logger.error(f"Error adding client: {str(e)}")
             return None
     
+    def bulk_add_clients(self, client_names: List[str]) -> Dict[str, int]:
+        """
+        Add multiple clients to the database in a single transaction.
+        
+        Existing clients and empty names are skipped.
+        
+        Args:
+            client_names: Names of the clients
+            
+        Returns:
+            Dictionary mapping each newly added client name to its ID
+        """
+        # Clean names and drop repeats, keeping input order
+        names = list(dict.fromkeys(name.strip() for name in client_names if name and name.strip()))
+        if not names:
+            return {}
+        
+        def _bulk_add(session):
+            existing = {
+                row.client_name for row in
+                session.query(Client.client_name).filter(Client.client_name.in_(names)).all()
+            }
+            for name in existing:
+                self.logger.warning(f"Client already exists: {name}")
+            
+            new_names = [name for name in names if name not in existing]
+            if not new_names:
+                return {}
+            
+            rows = session.execute(
+                insert(Client).returning(Client.client_name, Client.id),
+                [{"client_name": name} for name in new_names]
+            ).all()
+            return dict(rows)
+        
+        try:
+            return self.db.execute_write(_bulk_add)
+        except exc.SQLAlchemyError as e:
+            self.logger.error(f"Error adding clients: {str(e)}")
+            return {}
+    
     def get_clients(self) -> List[dict]:
         """
         Get all clients from the database.
@@ -70,7 +111,7 @@ class ClientRepository:
             return [{"id": client.id, "client_name": client.client_name} for client in clients]
         
         try:
-            return self.db.execute_with_session(_get_clients)
+            return self.db.execute_read(_get_clients)
         except exc.SQLAlchemyError as e:
             self.logger.error(f"Error getting clients: {str(e)}")
             return []
@@ -92,7 +133,7 @@ class ClientRepository:
             return None
         
         try:
-            return self.db.execute_with_session(_get_client)
+            return self.db.execute_read(_get_client)
         except exc.SQLAlchemyError as e:
             self.logger.error(f"Error getting client by ID: {str(e)}")
             return None
@@ -114,7 +155,7 @@ class ClientRepository:
             return None
         
         try:
-            return self.db.execute_with_session(_get_client)
+            return self.db.execute_read(_get_client)
         except exc.SQLAlchemyError as e:
             self.logger.error(f"Error getting client by name: {str(e)}")
             return None
@@ -156,7 +197,7 @@ class ClientRepository:
             return True
         
         try:
-            return self.db.execute_with_session(_update_client)
+            return self.db.execute_write(_update_client)
         except exc.SQLAlchemyError as e:
             self.logger.error(f"Error updating client name: {str(e)}")
             return False
@@ -185,7 +226,7 @@ class ClientRepository:
             return True
         
         try:
-            return self.db.execute_with_session(_delete_client)
+            return self.db.execute_write(_delete_client)
         except exc.SQLAlchemyError as e:
             self.logger.error(f"Error deleting client: {str(e)}")
             return False
\ No newline at end of file
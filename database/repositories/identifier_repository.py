@@ -4,10 +4,20 @@ Repository for identifier operations in the ransomware intelligence system.
 """
 
 import logging
+import threading
+import time
 from typing import List, Optional, Dict, Any
-from sqlalchemy import exc
+from sqlalchemy import exc, select
 from database.models import Identifier
 
+# Columns read for identifier dictionaries, selected directly to skip ORM object creation
+_IDENTIFIER_COLS = (Identifier.id, Identifier.client_id, Identifier.identifier_type, Identifier.identifier_value)
+_IDENTIFIER_KEYS = ('id', 'client_id', 'identifier_type', 'identifier_value')
+
+# Seconds a cached identifier list is trusted; bounds staleness when another
+# process changes the watchlist
+CACHE_TTL = 30.0
+
 class IdentifierRepository:
     """Repository for identifier-related database operations"""
     
@@ -20,6 +30,47 @@ class IdentifierRepository:
         """
         self.db = database
         self.logger = logging.getLogger("identifier_repository")
+        
+        # Identifier lists by query key; cleared whenever this process writes
+        self._cache = {}
+        self._version = 0
+        self._cache_lock = threading.Lock()
+    
+    def _invalidate_cache(self) -> None:
+        """Drop all cached identifier lists after a write"""
+        with self._cache_lock:
+            self._version += 1
+            self._cache.clear()
+    
+    def _cached_read(self, key: tuple, operation, error_message: str) -> List[Dict[str, Any]]:
+        """
+        Run a read operation, reusing its result until the cache is invalidated.
+        
+        Args:
+            key: Cache key identifying the query
+            operation: Function that takes a session and returns identifier dicts
+            error_message: Log message prefix for database errors
+            
+        Returns:
+            List of identifier dictionaries (copies, safe to modify)
+        """
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            version = self._version
+        if entry is not None and time.monotonic() - entry[0] < CACHE_TTL:
+            return [dict(identifier) for identifier in entry[1]]
+        
+        try:
+            result = self.db.execute_read(operation)
+        except exc.SQLAlchemyError as e:
+            self.logger.error(f"{error_message}: {str(e)}")
+            return []
+        
+        with self._cache_lock:
+            # Don't cache a result read before a concurrent write
+            if version == self._version:
+                self._cache[key] = (time.monotonic(), result)
+        return [dict(identifier) for identifier in result]
     
     def add_identifier(self, client_id: int, identifier_type: str, identifier_value: str) -> Optional[int]:
         """
@@ -62,7 +113,10 @@ class IdentifierRepository:
             return identifier.id
         
         try:
-            return self.db.execute_with_session(_add_identifier)
+            identifier_id = self.db.execute_write(_add_identifier)
+            if identifier_id is not None:
+                self._invalidate_cache()
+            return identifier_id
         except exc.SQLAlchemyError as e:
             self.logger.error(f"Error adding identifier: {str(e)}")
             return None
@@ -75,23 +129,10 @@ class IdentifierRepository:
             List of all identifier dictionaries
         """
         def _get_all(session):
-            identifiers = session.query(Identifier).all()
-            # Extract data to avoid detached instance issues
-            return [
-                {
-                    'id': identifier.id,
-                    'client_id': identifier.client_id,
-                    'identifier_type': identifier.identifier_type,
-                    'identifier_value': identifier.identifier_value,
-                }
-                for identifier in identifiers
-            ]
+            rows = session.execute(select(*_IDENTIFIER_COLS)).all()
+            return [dict(zip(_IDENTIFIER_KEYS, row)) for row in rows]
         
-        try:
-            return self.db.execute_with_session(_get_all)
-        except exc.SQLAlchemyError as e:
-            self.logger.error(f"Error getting all identifiers: {str(e)}")
-            return []
+        return self._cached_read(("all",), _get_all, "Error getting all identifiers")
     
     def get_client_identifiers(self, client_id: int) -> List[Dict[str, Any]]:
         """
@@ -104,23 +145,12 @@ class IdentifierRepository:
             List of identifier dictionaries for the client
         """
         def _get_client_identifiers(session):
-            identifiers = session.query(Identifier).filter(Identifier.client_id == client_id).all()
-            # Extract data to avoid detached instance issues
-            return [
-                {
-                    'id': identifier.id,
-                    'client_id': identifier.client_id,
-                    'identifier_type': identifier.identifier_type,
-                    'identifier_value': identifier.identifier_value,
-                }
-                for identifier in identifiers
-            ]
+            rows = session.execute(
+                select(*_IDENTIFIER_COLS).where(Identifier.client_id == client_id)
+            ).all()
+            return [dict(zip(_IDENTIFIER_KEYS, row)) for row in rows]
         
-        try:
-            return self.db.execute_with_session(_get_client_identifiers)
-        except exc.SQLAlchemyError as e:
-            self.logger.error(f"Error getting client identifiers: {str(e)}")
-            return []
+        return self._cached_read(("client", client_id), _get_client_identifiers, "Error getting client identifiers")
     
     def get_identifier_by_id(self, identifier_id: int) -> Optional[Dict[str, Any]]:
         """
@@ -144,7 +174,7 @@ class IdentifierRepository:
             return None
         
         try:
-            return self.db.execute_with_session(_get_identifier)
+            return self.db.execute_read(_get_identifier)
         except exc.SQLAlchemyError as e:
             self.logger.error(f"Error getting identifier: {str(e)}")
             return None
@@ -168,7 +198,10 @@ class IdentifierRepository:
             return True
         
         try:
-            return self.db.execute_with_session(_delete_identifier)
+            deleted = self.db.execute_write(_delete_identifier)
+            if deleted:
+                self._invalidate_cache()
+            return deleted
         except exc.SQLAlchemyError as e:
             self.logger.error(f"Error deleting identifier: {str(e)}")
             return False
@@ -184,20 +217,9 @@ class IdentifierRepository:
             List of identifier dictionaries of the specified type
         """
         def _get_by_type(session):
-            identifiers = session.query(Identifier).filter(Identifier.identifier_type == identifier_type).all()
-            # Extract data to avoid detached instance issues
-            return [
-                {
-                    'id': identifier.id,
-                    'client_id': identifier.client_id,
-                    'identifier_type': identifier.identifier_type,
-                    'identifier_value': identifier.identifier_value,
-                }
-                for identifier in identifiers
-            ]
+            rows = session.execute(
+                select(*_IDENTIFIER_COLS).where(Identifier.identifier_type == identifier_type)
+            ).all()
+            return [dict(zip(_IDENTIFIER_KEYS, row)) for row in rows]
         
-        try:
-            return self.db.execute_with_session(_get_by_type)
-        except exc.SQLAlchemyError as e:
-            self.logger.error(f"Error getting identifiers by type: {str(e)}")
-            return []
\ No newline at end of file
+        return self._cached_read(("type", identifier_type), _get_by_type, "Error getting identifiers by type")
\ No newline at end of file
@@ -1,18 +1,26 @@
 # collection_agent.py - updated Tor handling
-from flask import Flask, request, jsonify
+from flask import Flask, request
 import requests
-import socks
-import socket
+from requests.adapters import HTTPAdapter
+from selectolax.lexbor import LexborHTMLParser
 import json
+import gzip
 import os
 import re
 import time
+import threading
+import functools
 import hmac
-import hashlib
 import logging
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
 app = Flask(__name__)
 
 # Configure logging with UTF-8 support
@@ -30,69 +38,97 @@ logger = logging.getLogger("collection_agent")
 TOR_HOST = os.environ.get('TOR_HOST', 'tor')
 TOR_PORT = int(os.environ.get('TOR_PORT', '9150'))
 API_SECRET = os.environ.get('API_SECRET', 'test-secret')
+# HMAC keyed with the API secret; each verification copies it instead of
+# redoing the key setup
+_HMAC_TEMPLATE = hmac.new(API_SECRET.encode(), digestmod="sha256")
+BATCH_MAX_CONCURRENCY = int(os.environ.get('BATCH_MAX_CONCURRENCY', '8'))
+GZIP_MIN_SIZE = 1024  # Smallest response body worth compressing, in bytes
+
+# Last result of the check.torproject.org probe, reused for _TOR_CHECK_TTL
+# seconds so frequent health checks don't each make a request through Tor
+_TOR_CHECK_TTL = 60
+_tor_last_check_ts = 0.0
+_tor_last_result = False
+_tor_check_lock = threading.Lock()
+
+# Shared HTTP session, so repeated requests to the same site reuse
+# keep-alive connections (and their Tor circuits) instead of reconnecting
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(pool_connections=20, pool_maxsize=50, max_retries=0)
+_SESSION.mount('http://', _ADAPTER)
+_SESSION.mount('https://', _ADAPTER)
 
-# Keep track of whether Tor is set up
-tor_setup_complete = False
+# Proxy settings passed with every request, so all scraping goes through Tor
+# without patching the process-wide socket class; socks5h resolves hostnames
+# through Tor too
+_TOR_PROXIES = {
+    'http': f'socks5h://{TOR_HOST}:{TOR_PORT}',
+    'https': f'socks5h://{TOR_HOST}:{TOR_PORT}'
+}
+
+# API keys are "<unix timestamp>:<hex HMAC-SHA256 of the timestamp>"
+_API_KEY_RE = re.compile(r'([0-9]{1,11}):([0-9a-f]{64})')
 
-def setup_tor():
-    """Configure requests to use Tor"""
-    global tor_setup_complete
+# Patterns used by the site parsers, compiled once at import
+_TITLE_RE = re.compile(r'<title>(.*?)</title>', re.IGNORECASE)
+_GENERIC_VICTIM_RE = re.compile(
+    r'<div class="[^"]*victim[^"]*".*?>.*?<h\d>(.*?)</h\d>.*?<span class="[^"]*date[^"]*">(.*?)</span>',
+    re.DOTALL | re.IGNORECASE
+)
+_COMPANY_FALLBACK_RE = re.compile(
+    r'<td>([\w\s\.\,\&\;\-]+(?:Company|LLC|Inc|Ltd|GmbH|Corp|SA|AG|BV)?)</td>',
+    re.IGNORECASE
+)
+
+def _tor_probe():
+    """Check through check.torproject.org that traffic is leaving via Tor"""
+    test_url = "https://check.torproject.org"
+    logger.info(f"Testing Tor connection with {test_url}")
     
-    if tor_setup_complete:
-        logger.debug("Tor already configured, skipping setup")
-        return True
-        
     try:
-        # Configure for SOCKS proxy
-        logger.info(f"Setting up Tor SOCKS proxy at {TOR_HOST}:{TOR_PORT}")
-        
-        # Backup the original socket implementation
-        orig_socket = socket.socket
-        
-        # Configure socks
-        socks.set_default_proxy(socks.SOCKS5, TOR_HOST, TOR_PORT)
-        socket.socket = socks.socksocket
-        
-        logger.info(f"Tor proxy configured at {TOR_HOST}:{TOR_PORT}")
-        
-        # Test the Tor connection to verify it's working
-        test_url = "https://check.torproject.org"
-        logger.info(f"Testing Tor connection with {test_url}")
-        
-        response = requests.get(test_url, timeout=30)
+        response = _SESSION.get(test_url, timeout=30, proxies=_TOR_PROXIES)
         
         if "Congratulations" in response.text and "Tor" in response.text:
             logger.info("Tor connection confirmed working!")
-            tor_setup_complete = True
             return True
-        else:
-            logger.warning("Connected to proxy but not confirmed as Tor")
-            logger.debug(f"Response content: {response.text[:200]}...")
-            socket.socket = orig_socket  # Restore original socket
-            tor_setup_complete = False
-            return False
+        
+        logger.warning("Connected to proxy but not confirmed as Tor")
+        logger.debug(f"Response content: {response.text[:200]}...")
+        return False
     except Exception as e:
-        logger.error(f"Failed to configure Tor proxy: {e}")
-        logger.error(traceback.format_exc())
-        # Try to restore original socket if available
-        if 'orig_socket' in locals():
-            socket.socket = orig_socket
-        tor_setup_complete = False
+        logger.error(f"Tor connection test failed: {e}")
         return False
 
+def get_tor_status():
+    """
+    Report whether Tor is working, probing at most once per _TOR_CHECK_TTL seconds.
+    
+    Returns:
+        Result of the most recent probe
+    """
+    global _tor_last_check_ts, _tor_last_result
+    
+    with _tor_check_lock:
+        if time.time() - _tor_last_check_ts < _TOR_CHECK_TTL:
+            return _tor_last_result
+        
+        _tor_last_result = _tor_probe()
+        _tor_last_check_ts = time.time()
+        return _tor_last_result
+
 def verify_api_key(api_key):
     """Verify the API key using HMAC"""
     if not api_key:
         return False
         
     try:
-        # Extract timestamp and signature
-        parts = api_key.split(":", 1)
-        if len(parts) != 2:
+        # Reject malformed keys before any parsing or hashing
+        match = _API_KEY_RE.fullmatch(api_key)
+        if not match:
             logger.warning("Invalid API key format")
             return False
             
-        timestamp, signature = parts
+        timestamp, signature = match.groups()
         
         # Check if timestamp is reasonably recent (within 15 minutes)
         now = int(time.time())
@@ -102,11 +138,9 @@ def verify_api_key(api_key):
             return False
             
         # Verify signature
-        expected = hmac.new(
-            API_SECRET.encode(), 
-            timestamp.encode(),
-            hashlib.sha256
-        ).hexdigest()
+        mac = _HMAC_TEMPLATE.copy()
+        mac.update(timestamp.encode())
+        expected = mac.hexdigest()
         
         # Constant-time comparison to prevent timing attacks
         return hmac.compare_digest(signature, expected)
@@ -114,10 +148,10 @@ def verify_api_key(api_key):
         logger.error(f"API key verification error: {e}")
         return False
 
-def parse_generic(html_content, url=None):
-    """Generic parser for any website"""
+def parse_generic(html_content, url=None, include_raw=False):
+    """Generic parser for any website; the page itself is only returned with include_raw"""
     # Extract title
-    title_match = re.search(r'<title>(.*?)</title>', html_content, re.IGNORECASE)
+    title_match = _TITLE_RE.search(html_content)
     title = title_match.group(1) if title_match else "Unknown"
     
     # For testing with check.torproject.org
@@ -126,12 +160,14 @@ def parse_generic(html_content, url=None):
     # Basic victim extraction (placeholder - customize based on site patterns)
     victims = []
     
-    # Just a simple extraction for testing
-    item_pattern = re.findall(
-        r'<div class="[^"]*victim[^"]*".*?>.*?<h\d>(.*?)</h\d>.*?<span class="[^"]*date[^"]*">(.*?)</span>',
-        html_content, 
-        re.DOTALL | re.IGNORECASE
-    )
+    # Just a simple extraction for testing. The pattern needs both literals
+    # (case-insensitively); checking for them first skips the expensive
+    # DOTALL scan on pages that cannot match
+    lowered = html_content.lower()
+    if 'victim' in lowered and 'date' in lowered:
+        item_pattern = _GENERIC_VICTIM_RE.findall(html_content)
+    else:
+        item_pattern = []
     
     for name, date in item_pattern:
         victims.append({
@@ -146,70 +182,69 @@ def parse_generic(html_content, url=None):
             "date": time.strftime("%Y-%m-%d %H:%M:%S")
         })
     
-    return {
+    result = {
         "title": title,
         "is_using_tor": is_using_tor,
         "victims": victims,
-        "url": url,
-        "raw_html": html_content  # Add the raw HTML content to the response
+        "url": url
     }
+    if include_raw:
+        result["raw_html"] = html_content
+    return result
 
-def parse_omegalock(html_content, url=None):
+def parse_omegalock(html_content, url=None, include_raw=False):
     """
     Custom parser for Omega Lock ransomware site.
     
     This parser extracts victim information from the data table structure
     on the Omegalock leak site, focusing only on essential data needed
-    for our schema.
+    for our schema. The page itself is only returned with include_raw.
     """
     title = "Omega Lock"
     victims = []
+    now = datetime.now()  # One clock read for every date and timestamp below
     
     try:
         # Extract title if available
-        title_match = re.search(r'<title>(.*?)</title>', html_content, re.IGNORECASE)
+        title_match = _TITLE_RE.search(html_content)
         if title_match:
             title = title_match.group(1).strip()
             
-        # Find the data table
-        table_match = re.search(r'<table class="datatable center">(.*?)</table>', html_content, re.DOTALL | re.IGNORECASE)
+        # Find the data table in a single parse of the page
+        table = LexborHTMLParser(html_content).css_first('table.datatable.center')
         
-        if table_match:
-            table_content = table_match.group(1)
-            
-            # Extract rows with class 'trow' (these contain victim data)
-            victim_rows = re.findall(r'<tr class=[\'"]trow[\'"]>(.*?)</tr>', table_content, re.DOTALL | re.IGNORECASE)
+        if table:
+            # Rows with class 'trow' contain victim data
+            victim_rows = table.css('tr.trow')
             
             logger.info(f"Found {len(victim_rows)} victim rows in the Omegalock table")
             
             # Process each victim row
             for row in victim_rows:
                 try:
-                    # Extract all table cells
-                    cells = re.findall(r'<td.*?>(.*?)</td>', row, re.DOTALL | re.IGNORECASE)
+                    cell_nodes = row.css('td')
+                    # Text content of each cell, without markup
+                    cells = [cell.text().strip() for cell in cell_nodes]
                     
                     if len(cells) >= 5:  # Ensure we have enough cells
                         # Column 0: Company name
-                        company_name = re.sub(r'<.*?>', '', cells[0]).strip()
+                        company_name = cells[0]
                         
                         # Column 1: Leak percentage (not used in schema but useful for comment)
-                        leak_percentage = re.sub(r'<.*?>', '', cells[1]).strip()
+                        leak_percentage = cells[1]
                         
                         # Column 2: Tags/sector information
-                        tags = re.sub(r'<.*?>', '', cells[2]).strip()
+                        tags = cells[2]
                         
                         # Column 3: Data size
-                        data_size = re.sub(r'<.*?>', '', cells[3]).strip()
+                        data_size = cells[3]
                         
                         # Column 4: Last updated date
-                        last_updated = re.sub(r'<.*?>', '', cells[4]).strip()
+                        last_updated = cells[4]
                         
                         # Column 5: Link (if available)
-                        link_match = re.search(r'href="([^"]+)"', cells[5] if len(cells) > 5 else "", re.IGNORECASE)
-                        link = link_match.group(1) if link_match else ""
-                        
-                        # Clean up any remaining HTML tags
-                        company_name = re.sub(r'<[^>]*>', '', company_name).strip()
+                        link_node = cell_nodes[5].css_first('a[href]') if len(cell_nodes) > 5 else None
+                        link = (link_node.attributes.get('href') or "") if link_node else ""
                         
                         if company_name:  # Only add if we have a company name
                             victims.append({
@@ -230,37 +265,37 @@ def parse_omegalock(html_content, url=None):
         else:
             logger.warning("Data table not found in Omegalock HTML")
             
-            # Fallback: try to extract companies from table cells
-            company_patterns = re.findall(
-                r'<td>([\w\s\.\,\&\;\-]+(?:Company|LLC|Inc|Ltd|GmbH|Corp|SA|AG|BV)?)</td>',
-                html_content,
-                re.IGNORECASE
-            )
+            # Fallback: try to extract companies from table cells, one match at a time
+            today = now.strftime("%Y-%m-%d")
+            candidates = 0
+            for match in _COMPANY_FALLBACK_RE.finditer(html_content):
+                candidates += 1
+                company_name = match.group(1).strip()
+                if company_name and len(company_name) > 5:
+                    # Create a minimal victim entry
+                    victims.append({
+                        "name": company_name,
+                        "date": today,
+                        "group": "omegalock"
+                    })
             
-            if company_patterns:
-                logger.debug(f"Fallback found {len(company_patterns)} potential company names")
-                for company in company_patterns:
-                    company_name = company.strip()
-                    if company_name and len(company_name) > 5:
-                        # Create a minimal victim entry
-                        victims.append({
-                            "name": company_name,
-                            "date": datetime.now().strftime("%Y-%m-%d"),
-                            "group": "omegalock"
-                        })
+            if candidates:
+                logger.debug(f"Fallback found {candidates} potential company names")
     
     except Exception as e:
         logger.error(f"Error parsing Omega Lock site: {str(e)}")
         logger.error(traceback.format_exc())
     
-    return {
+    result = {
         "title": title,
         "victims": victims,
         "url": url,
         "is_using_tor": True,
-        "timestamp": datetime.now().isoformat(),
-        "raw_html": html_content
+        "timestamp": now.isoformat()
     }
+    if include_raw:
+        result["raw_html"] = html_content
+    return result
 
 # Parser registry - map parser names to functions
 PARSERS = {
@@ -268,17 +303,140 @@ PARSERS = {
     "omegalock": parse_omegalock,
 }
 
+# URL substrings that select a parser when 'auto' is requested, checked in order
+AUTO_PARSERS = (
+    ("omegalock", "omegalock"),
+)
+
+@functools.lru_cache(maxsize=256)
+def _resolve_parser(url, requested):
+    """
+    Pick the parser for a URL; cached because the same sites are collected repeatedly.
+    
+    Args:
+        url: Target URL
+        requested: Parser name from the request, or 'auto' to choose from the URL
+        
+    Returns:
+        Tuple of (parser name, parser function)
+    """
+    parser_type = requested
+    if parser_type == 'auto':
+        parser_type = next((name for token, name in AUTO_PARSERS if token in url), 'generic')
+    
+    parser = PARSERS.get(parser_type)
+    if not parser:
+        logger.warning(f"Unknown parser type: {parser_type}, falling back to generic")
+        parser = parse_generic
+    return parser_type, parser
+
+def _json(obj, status=200):
+    """Build a JSON response, encoded with orjson when it is installed"""
+    if orjson is not None:
+        body = orjson.dumps(obj, default=str)
+    else:
+        body = json.dumps(obj, default=str)
+    return app.response_class(body, status=status, mimetype='application/json')
+
+def _request_json():
+    """Decode the request body with orjson when it is installed; None unless it is a JSON object"""
+    # cache=False: the body is only read here, so Flask need not keep a copy
+    body = request.get_data(cache=False)
+    try:
+        data = orjson.loads(body) if orjson is not None else json.loads(body)
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+@app.after_request
+def compress_response(response):
+    """Gzip larger responses for clients that accept it"""
+    if (response.status_code < 200 or response.is_streamed
+            or 'Content-Encoding' in response.headers
+            or 'gzip' not in request.headers.get('Accept-Encoding', '')
+            or (response.content_length or 0) < GZIP_MIN_SIZE):
+        return response
+    
+    response.set_data(gzip.compress(response.get_data(), compresslevel=1))
+    response.headers['Content-Encoding'] = 'gzip'
+    response.vary.add('Accept-Encoding')
+    return response
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    tor_status = setup_tor()
-    return jsonify({
+    tor_status = get_tor_status()
+    return _json({
         "status": "ok", 
         "timestamp": time.time(),
         "tor_configured": (TOR_HOST, TOR_PORT),
         "tor_working": tor_status
     })
 
+def _collect_one(target_url, parser_type='generic', request_timeout=120, include_raw=False):
+    """
+    Fetch one URL through Tor and parse it.
+    
+    Args:
+        target_url: URL to fetch
+        parser_type: Key into PARSERS, or 'auto' to choose from the URL
+        request_timeout: Request timeout in seconds
+        include_raw: Whether to return the page HTML as raw_html
+        
+    Returns:
+        Tuple of (response dict, HTTP status code)
+    """
+    parser_type, parser = _resolve_parser(target_url, parser_type)
+    logger.info(f"Collecting from: {target_url} using parser: {parser_type}")
+    
+    # Make the request via Tor
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; rv:102.0) Gecko/20100101 Firefox/102.0'
+    }
+    
+    try:
+        if '.onion' in target_url:
+            logger.info(f"Requesting .onion domain via Tor: {target_url}")
+            
+            # Ensure the URL is properly formatted
+            if not target_url.startswith(("http://", "https://")):
+                target_url = f"http://{target_url}"
+                
+        response = _SESSION.get(
+            target_url, 
+            headers=headers, 
+            timeout=request_timeout,
+            proxies=_TOR_PROXIES
+        )
+            
+        response.raise_for_status()
+        logger.info(f"Successfully retrieved {len(response.text)} bytes from {target_url}")
+        
+        # Parse the content
+        result = parser(response.text, target_url, include_raw=include_raw)
+        
+        # Add metadata
+        result['metadata'] = {
+            'timestamp': time.time(),
+            'target': target_url,
+            'status_code': response.status_code,
+            'content_length': len(response.text),
+            'parser_used': parser_type
+        }
+        
+        logger.info(f"Successfully collected data from {target_url}")
+        return result, 200
+        
+    except requests.RequestException as e:
+        logger.error(f"Request error: {e}")
+        return {
+            "error": f"Failed to retrieve URL: {str(e)}",
+            "metadata": {
+                'timestamp': time.time(),
+                'target': target_url
+            }
+        }, 500
+
 @app.route('/collect', methods=['POST'])
 def collect():
     """Collect data from a target website"""
@@ -286,100 +444,65 @@ def collect():
     api_key = request.headers.get('X-API-Key')
     if not verify_api_key(api_key):
         logger.warning("Unauthorized API request")
-        return jsonify({"error": "Unauthorized"}), 403
+        return _json({"error": "Unauthorized"}, 403)
     
     # Get request data
     try:
-        data = request.json
+        data = _request_json()
         if not data or 'url' not in data:
-            return jsonify({"error": "Missing required parameters"}), 400
+            return _json({"error": "Missing required parameters"}, 400)
+        
+        result, status = _collect_one(
+            data['url'],
+            data.get('parser', 'generic'),
+            int(data.get('timeout', 120)),
+            bool(data.get('include_raw', False))
+        )
+        return _json(result, status)
             
-        target_url = data['url']
-        parser_type = data.get('parser', 'generic')
+    except Exception as e:
+        logger.error(f"Error processing request: {e}")
+        logger.error(traceback.format_exc())
+        return _json({"error": f"Server error: {str(e)}"}, 500)
+
+@app.route('/collect_batch', methods=['POST'])
+def collect_batch():
+    """Collect data from several target websites concurrently"""
+    # Get API key and verify
+    api_key = request.headers.get('X-API-Key')
+    if not verify_api_key(api_key):
+        logger.warning("Unauthorized API request")
+        return _json({"error": "Unauthorized"}, 403)
+    
+    try:
+        data = _request_json()
+        if not data or not isinstance(data.get('urls'), list) or not data['urls']:
+            return _json({"error": "Missing required parameters"}, 400)
+        
+        urls = data['urls']
+        parser_type = data.get('parser', 'auto')
         request_timeout = int(data.get('timeout', 120))
+        include_raw = bool(data.get('include_raw', False))
+        max_concurrency = max(1, min(int(data.get('max_concurrency', BATCH_MAX_CONCURRENCY)), BATCH_MAX_CONCURRENCY))
         
-        # Auto-select parser based on URL if set to 'auto'
-        if parser_type == 'auto':
-            if 'omegalock' in target_url:
-                parser_type = 'omegalock'
-            else:
-                parser_type = 'generic'
-                
-        logger.info(f"Collecting from: {target_url} using parser: {parser_type}")
+        logger.info(f"Collecting batch of {len(urls)} URLs with up to {max_concurrency} concurrent requests")
         
-        # Configure Tor
-        if not setup_tor():
-            return jsonify({"error": "Failed to configure Tor"}), 500
+        # Requests share _SESSION's connection pool; results keep the input order
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            outcomes = list(executor.map(
+                lambda url: _collect_one(url, parser_type, request_timeout, include_raw), urls
+            ))
         
-        # Make the request via Tor
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; rv:102.0) Gecko/20100101 Firefox/102.0'
-        }
+        return _json({
+            "results": [result for result, _ in outcomes],
+            "succeeded": sum(1 for _, status in outcomes if status == 200),
+            "failed": sum(1 for _, status in outcomes if status != 200)
+        })
         
-        try:
-            # For .onion domains, make sure we're using the Tor proxy properly
-            if '.onion' in target_url:
-                logger.info(f"Requesting .onion domain via Tor: {target_url}")
-                
-                # Ensure the URL is properly formatted
-                if not target_url.startswith(("http://", "https://")):
-                    target_url = f"http://{target_url}"
-                    
-                response = requests.get(
-                    target_url, 
-                    headers=headers, 
-                    timeout=request_timeout,
-                    proxies={
-                        'http': f'socks5h://{TOR_HOST}:{TOR_PORT}',
-                        'https': f'socks5h://{TOR_HOST}:{TOR_PORT}'
-                    }
-                )
-            else:
-                # For regular domains, the default Tor setup should work
-                response = requests.get(
-                    target_url, 
-                    headers=headers, 
-                    timeout=request_timeout
-                )
-                
-            response.raise_for_status()
-            logger.info(f"Successfully retrieved {len(response.text)} bytes from {target_url}")
-            
-            # Get the appropriate parser function
-            parser = PARSERS.get(parser_type)
-            if not parser:
-                logger.warning(f"Unknown parser type: {parser_type}, falling back to generic")
-                parser = parse_generic
-                
-            # Parse the content
-            result = parser(response.text, target_url)
-            
-            # Add metadata
-            result['metadata'] = {
-                'timestamp': time.time(),
-                'target': target_url,
-                'status_code': response.status_code,
-                'content_length': len(response.text),
-                'parser_used': parser_type
-            }
-            
-            logger.info(f"Successfully collected data from {target_url}")
-            return jsonify(result)
-            
-        except requests.RequestException as e:
-            logger.error(f"Request error: {e}")
-            return jsonify({
-                "error": f"Failed to retrieve URL: {str(e)}",
-                "metadata": {
-                    'timestamp': time.time(),
-                    'target': target_url
-                }
-            }), 500
-            
     except Exception as e:
-        logger.error(f"Error processing request: {e}")
+        logger.error(f"Error processing batch request: {e}")
         logger.error(traceback.format_exc())
-        return jsonify({"error": f"Server error: {str(e)}"}), 500
+        return _json({"error": f"Server error: {str(e)}"}, 500)
 
 if __name__ == '__main__':
     # Set debug mode only in development
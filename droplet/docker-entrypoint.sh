@@ -4,5 +4,11 @@ set -e
 # Print what server we're using
 echo "Starting collection agent using production WSGI server (Gunicorn)"
 
-# Start with Gunicorn
-exec gunicorn --bind 0.0.0.0:5000 --workers 4 collection_agent:app
\ No newline at end of file
+# Start with Gunicorn. Threaded workers let each process wait on several slow
+# Tor requests at once; the counts and timeout can be overridden from the environment
+exec gunicorn --bind 0.0.0.0:5000 \
+    --workers "${GUNICORN_WORKERS:-4}" \
+    --worker-class gthread \
+    --threads "${GUNICORN_THREADS:-16}" \
+    --timeout "${WORKER_TIMEOUT:-240}" \
+    collection_agent:app
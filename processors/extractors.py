@@ -13,6 +13,9 @@ from utils.processor_utils import extract_ips_from_text
 
 logger = logging.getLogger("extractors")
 
+# Basic domain pattern (simplified)
+_DOMAIN_RE = re.compile(r'(?:https?://)?(?:www\.)?(?:[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?\.)+[a-zA-Z]{2,}')
+
 class NetworkIdentifierExtractor:
     """
     Utility for extracting network identifiers from data.
@@ -76,16 +79,11 @@ class NetworkIdentifierExtractor:
         if not text:
             return []
             
-        # Basic domain pattern (simplified)
-        pattern = r'(?:https?://)?(?:www\.)?([a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?\.)+[a-zA-Z]{2,}'
-        matches = re.findall(pattern, text)
+        matches = _DOMAIN_RE.findall(text)
         
-        # Normalize the domains
-        domains = []
-        for match in matches:
-            normalized = normalize_domain(match)
-            if normalized and normalized not in domains:
-                domains.append(normalized)
+        # Normalize the domains, dropping empty results and keeping the first
+        # occurrence of each (dict keys dedupe in insertion order)
+        domains = list(dict.fromkeys(filter(None, map(normalize_domain, matches))))
                 
         logger.debug(f"Extracted {len(domains)} potential domains from text")
         return domains
@@ -9,10 +9,23 @@ This module provides validation functions for different types of data:
 """
 
 import logging
+import re
+import string
 from utils.processor_utils import validate_ip, extract_ips_from_text
 
 logger = logging.getLogger("validators")
 
+# Fields every claim must provide
+_REQUIRED_FIELDS = ("collector", "threat_actor", "name_network_identifier", "timestamp")
+
+# Two or more dot-separated labels of alphanumerics and hyphens
+# ([^\W_] is exactly the characters for which str.isalnum() is true)
+_DOMAIN_LABELS_RE = re.compile(r'(?:[^\W_]|-)+(?:\.(?:[^\W_]|-)+)+')
+
+# Deletes every character allowed in an ASCII domain, so a valid one
+# translates to an empty string
+_DELETE_ASCII_DOMAIN_CHARS = str.maketrans('', '', string.ascii_letters + string.digits + '-.')
+
 class DataValidator:
     """
     Utility class for validating different types of data.
@@ -64,23 +77,17 @@ class DataValidator:
         if not domain:
             return False
             
-        # Simple validation - more complex validation would use regex
-        parts = domain.split('.')
-        
-        # Must have at least two parts and all parts must be valid
-        if len(parts) < 2:
-            return False
-            
-        for part in parts:
-            # Each part must contain at least one character and only valid chars
-            if not part or not all(c.isalnum() or c == '-' for c in part):
+        # At least two non-empty labels, each containing only valid chars
+        if domain.isascii():
+            # Common case: one C-level translate pass instead of the regex
+            if (domain.translate(_DELETE_ASCII_DOMAIN_CHARS) or '.' not in domain
+                    or domain[0] == '.' or domain[-1] == '.' or '..' in domain):
                 return False
+        elif _DOMAIN_LABELS_RE.fullmatch(domain) is None:
+            return False
                 
         # Top level domain can't be all numeric
-        if parts[-1].isdigit():
-            return False
-            
-        return True
+        return not domain.rpartition('.')[2].isdigit()
         
     @staticmethod
     def validate_claim_data(claim_data):
@@ -93,15 +100,8 @@ class DataValidator:
         Returns:
             tuple: (is_valid, error_message)
         """
-        required_fields = [
-            "collector", 
-            "threat_actor", 
-            "name_network_identifier", 
-            "timestamp"
-        ]
-        
-        for field in required_fields:
-            if field not in claim_data or claim_data[field] is None:
+        for field in _REQUIRED_FIELDS:
+            if claim_data.get(field) is None:
                 return False, f"Missing required field: {field}"
                 
-        return True, None
\ No newline at end of file
+        return True, None
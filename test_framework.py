@@ -7,36 +7,112 @@ for writing and running tests against system components without
 external dependencies.
 """
 
-import inspect
+import atexit
+import contextlib
+import hashlib
+import importlib
+import io
+import json
+import os
+import queue
 import time
 import logging
-import traceback
+import logging.handlers
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List, Callable, Any, Optional, Tuple, Type
-from datetime import datetime
 
-# Configure logger for tests
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-    handlers=[
-        logging.FileHandler("test_results.log"),
-        logging.StreamHandler()
-    ]
-)
+# Configure logger for tests. Records are queued and written to the
+# log file and console by a background listener, so the test loop never
+# waits on disk I/O.
+_log_formatter = logging.Formatter("%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+_log_handlers = [logging.FileHandler("test_results.log"), logging.StreamHandler()]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+_log_queue = queue.SimpleQueue()
+_queue_handler = logging.handlers.QueueHandler(_log_queue)
+_queue_handler.setFormatter(logging.Formatter("%(message)s"))
+logging.basicConfig(level=logging.INFO, handlers=[_queue_handler])
+_log_listener = logging.handlers.QueueListener(_log_queue, *_log_handlers)
+_log_listener.start()
+atexit.register(_log_listener.stop)
 logger = logging.getLogger("test_framework")
 
+# Compact, batched console output: one line per test written once per test
+# case, without banners or live progress; on when stdout is not a terminal
+# (CI logs, pipes) or TEST_QUIET is set
+_QUIET = bool(os.environ.get("TEST_QUIET")) or not sys.stdout.isatty()
+
+# Per-class pass/fail record reused by cached runs, in the working directory
+# next to test_results.log
+RESULTS_CACHE_FILE = ".testcache.json"
+
+# Project root; modules loaded from below it are the sources a cached
+# result depends on
+_PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def _project_sources() -> List[str]:
+    """Get the source paths of every loaded project module, test modules included"""
+    prefix = _PROJECT_ROOT + os.sep
+    paths = set()
+    for module in list(sys.modules.values()):
+        path = getattr(module, "__file__", None)
+        if path and path.endswith(".py"):
+            path = os.path.abspath(path)
+            if path.startswith(prefix) and "site-packages" not in path:
+                paths.add(path)
+    return sorted(paths)
+
+# (method name, display description) pairs per TestCase class, filled on
+# first run of each class
+_test_methods_cache: Dict[type, Tuple[Tuple[str, str], ...]] = {}
+
+
+def _get_test_methods(test_case_class: type) -> Tuple[Tuple[str, str], ...]:
+    """
+    Get the test methods of a test case class, in sorted name order.
+    
+    Each entry pairs the method name with the description shown while it
+    runs, e.g. ("test_parse_date", "Parse date").
+    
+    Only the class dictionaries along the MRO are scanned, skipping
+    TestCase and object, which define no tests, so the many inherited
+    assert* helpers are never looked at.
+    """
+    methods = _test_methods_cache.get(test_case_class)
+    if methods is None:
+        names = set()
+        for klass in test_case_class.__mro__:
+            if klass is TestCase or klass is object:
+                continue
+            names.update(
+                name for name, value in vars(klass).items()
+                if name.startswith('test_') and callable(value)
+            )
+        methods = _test_methods_cache[test_case_class] = tuple(
+            (name, name.replace('test_', '').replace('_', ' ').capitalize())
+            for name in sorted(names)
+        )
+    return methods
+
 
 class TestResult:
     """Represents the result of a single test"""
     
+    __slots__ = ('test_name', 'test_class', 'success', 'error_message', 'execution_time_ns')
+    
     def __init__(self, test_name: str, test_class: str):
         self.test_name = test_name
         self.test_class = test_class
         self.success = False
         self.error_message: Optional[str] = None
-        self.execution_time = 0.0
-        self.timestamp = datetime.now()
+        self.execution_time_ns = 0
+    
+    @property
+    def execution_time(self) -> float:
+        """Execution time in seconds"""
+        return self.execution_time_ns * 1e-9
     
     def __str__(self) -> str:
         """
@@ -57,6 +133,10 @@ class TestResult:
 class TestCase:
     """Base class for all tests"""
     
+    # Whether the runner may run this class in a worker process; set to
+    # False for tests that need the terminal (e.g. prompt with input())
+    parallel = True
+    
     def __init__(self):
         self.logger = logging.getLogger(f"test.{self.__class__.__name__}")
     
@@ -70,6 +150,11 @@ class TestCase:
     
     def assertEqual(self, first: Any, second: Any, msg: Optional[str] = None):
         """Assert that two objects are equal"""
+        # Identical objects (interned strings, small ints, shared fixtures)
+        # are equal without a rich comparison; floats still compare so NaN
+        # is never equal to itself
+        if first is second and type(first) is not float:
+            return
         if first != second:
             raise AssertionError(msg or f"{first} != {second}")
     
@@ -108,6 +193,10 @@ class TestCase:
         if member in container:
             raise AssertionError(msg or f"{member} in {container}")
     
+    def fail(self, msg: Optional[str] = None):
+        """Fail the test immediately"""
+        raise AssertionError(msg or "Test failed")
+    
     def assertRaises(self, exception_class, callable_obj=None, *args, **kwargs):
         """Assert that an exception is raised"""
         if callable_obj is None:
@@ -122,6 +211,8 @@ class TestCase:
 class _AssertRaisesContext:
     """Context manager for assertRaises"""
     
+    __slots__ = ('expected', 'test_case')
+    
     def __init__(self, expected, test_case):
         self.expected = expected
         self.test_case = test_case
@@ -132,6 +223,8 @@ class _AssertRaisesContext:
     def __exit__(self, exc_type, exc_value, tb):
         if exc_type is None:
             raise AssertionError(f"{self.expected.__name__} not raised")
+        if exc_type is self.expected:
+            return True
         if not issubclass(exc_type, self.expected):
             raise AssertionError(f"Expected {self.expected.__name__}, got {exc_type.__name__}")
         return True
@@ -140,9 +233,23 @@ class _AssertRaisesContext:
 class TestRunner:
     """Discovers and runs tests"""
     
-    def __init__(self):
+    def __init__(self, workers: Optional[int] = None, cached: bool = False):
+        """
+        Initialize the runner.
+        
+        Args:
+            workers: Worker processes for running test case classes in
+                parallel; defaults to all but two CPUs, 1 runs serially
+            cached: Reuse the last passing result of test case classes
+                whose sources have not changed since (see RESULTS_CACHE_FILE)
+        """
         self.results = []
+        self._failed: List[TestResult] = []
+        # (mtime_ns, sha1) per source path, read at most once per run
+        self._file_states: Dict[str, Tuple[int, str]] = {}
         self.logger = logging.getLogger("test_runner")
+        self.workers = workers if workers is not None else max((os.cpu_count() or 1) - 2, 1)
+        self.cached = cached
     
     def run_test_case(self, test_case_class) -> List[TestResult]:
         """Run all test methods in a test case class"""
@@ -150,119 +257,295 @@ class TestRunner:
         instance = test_case_class()
         
         # Find all test methods (start with 'test_')
-        test_methods = [
-            method for method in dir(instance)
-            if method.startswith('test_') and callable(getattr(instance, method))
-        ]
+        test_methods = _get_test_methods(test_case_class)
+        
+        # Skip the fixture hooks entirely when the class keeps the no-op defaults
+        has_setup = test_case_class.setUp is not TestCase.setUp
+        has_teardown = test_case_class.tearDown is not TestCase.tearDown
+        
+        # In quiet mode only the compact per-test lines are collected and
+        # written once per test case; interactive mode shows banners and
+        # progress as they happen
+        out_lines: List[str] = []
+        if _QUIET:
+            def write(text: str):
+                pass
+        else:
+            def write(text: str):
+                sys.stdout.write(text)
+                sys.stdout.flush()
         
         # Print header for test case
         class_name = test_case_class.__name__
-        print(f"\n{'=' * 70}")
-        print(f"Test Case: {class_name}")
-        print(f"{'-' * 70}")
+        write(f"\n{'=' * 70}\nTest Case: {class_name}\n{'-' * 70}\n")
         
-        for method_name in test_methods:
-            result = TestResult(method_name, test_case_class.__name__)
+        for method_name, test_desc in test_methods:
+            result = TestResult(method_name, class_name)
             test_method = getattr(instance, method_name)
             
             # Display test method name
-            test_desc = method_name.replace('test_', '').replace('_', ' ').capitalize()
-            print(f"Running: {test_desc}...", end='', flush=True)
+            write(f"Running: {test_desc}...")
             
             try:
                 # Run setUp
-                instance.setUp()
+                if has_setup:
+                    instance.setUp()
                 
                 # Run test and measure time
-                start_time = time.time()
+                start_ns = time.perf_counter_ns()
                 test_method()
-                result.execution_time = time.time() - start_time
+                result.execution_time_ns = time.perf_counter_ns() - start_ns
                 
                 # Test passed
                 result.success = True
-                print("\r✓ " + " " * 60)  # Clear the line and mark as passed
+                write("\r✓ " + " " * 60 + "\n")  # Clear the line and mark as passed
             except Exception as e:
                 # Test failed
                 result.success = False
                 result.error_message = str(e)
-                self.logger.error(f"Error in {test_case_class.__name__}.{method_name}: {str(e)}")
-                self.logger.debug(traceback.format_exc())
-                print(f"\r✗ FAILED: {str(e)}" + " " * 20)  # Clear the line and mark as failed
+                self.logger.error("Error in %s.%s: %s", class_name, method_name, e,
+                                  exc_info=self.logger.isEnabledFor(logging.DEBUG))
+                write(f"\r✗ FAILED: {str(e)}" + " " * 20 + "\n")  # Clear the line and mark as failed
             finally:
                 # Run tearDown
                 try:
-                    instance.tearDown()
+                    if has_teardown:
+                        instance.tearDown()
                 except Exception as e:
-                    self.logger.error(f"Error in tearDown for {test_case_class.__name__}: {str(e)}")
+                    self.logger.error("Error in tearDown for %s: %s", class_name, e)
                     if result.success:  # Only override if test was successful
                         result.success = False
-                        result.error_message = f"Error in tearDown: {str(e)}"
-                        print(f"\r✗ FAILED in tearDown: {str(e)}" + " " * 20)
+                        result.error_message = f"Error in tearDown: {e}"
+                        write(f"\r✗ FAILED in tearDown: {e}" + " " * 20 + "\n")
+            
+            if _QUIET:
+                out_lines.append(f"{'P' if result.success else 'F'} {class_name}.{method_name} "
+                                 f"{result.execution_time * 1000:.1f}ms\n")
             
             # Add result
             test_case_results.append(result)
             self.results.append(result)
+            if not result.success:
+                self._failed.append(result)
             
             # Log result
             self.logger.info(str(result))
         
+        if out_lines:
+            sys.stdout.write(''.join(out_lines))
+            sys.stdout.flush()
+        
         return test_case_results
     
     def run_test_cases(self, test_case_classes: List[Type]) -> List[TestResult]:
         """Run all test methods in a list of test case classes"""
         self.results = []
+        self._failed = []
         
-        total_start_time = time.time()
-        for test_case_class in test_case_classes:
-            self.run_test_case(test_case_class)
-        total_time = time.time() - total_start_time
+        total_start_ns = time.perf_counter_ns()
+        cache = self._load_results_cache() if self.cached else None
+        if cache is not None:
+            test_case_classes = [
+                cls for cls in test_case_classes
+                if not self._reuse_cached_result(cache, cls)
+            ]
+        
+        parallel_classes = [cls for cls in test_case_classes if getattr(cls, "parallel", True)]
+        if self.workers > 1 and len(parallel_classes) > 1:
+            self._run_in_workers(test_case_classes, parallel_classes)
+        else:
+            for test_case_class in test_case_classes:
+                self.run_test_case(test_case_class)
+        total_time = (time.perf_counter_ns() - total_start_ns) * 1e-9
+        
+        if cache is not None:
+            self._save_results_cache(cache, test_case_classes)
         
         # Print summary
         self._print_summary(total_time)
         
         return self.results
     
+    def _run_in_workers(self, test_case_classes: List[Type], parallel_classes: List[Type]):
+        """
+        Run test case classes across worker processes.
+        
+        Each worker buffers its console output, which is printed here in the
+        original class order so output from different classes never
+        interleaves. Classes with parallel = False run in this process
+        while the workers continue.
+        """
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(parallel_classes)),
+                                 initializer=_init_worker_logging) as pool:
+            # Workers are started by the submits; the log listener is stopped
+            # meanwhile so no thread holds a handler lock when they fork
+            _log_listener.stop()
+            try:
+                futures = {cls: pool.submit(_run_test_case_captured, cls) for cls in parallel_classes}
+            finally:
+                _log_listener.start()
+            for test_case_class in test_case_classes:
+                future = futures.get(test_case_class)
+                if future is None:
+                    self.run_test_case(test_case_class)
+                    continue
+                results, output = future.result()
+                print(output, end='')
+                self.results.extend(results)
+                self._failed.extend(r for r in results if not r.success)
+    
+    @staticmethod
+    def _source_key(test_case_class: Type) -> Optional[str]:
+        """Get the cache key of a test case class, or None if it has no source file"""
+        path = getattr(sys.modules.get(test_case_class.__module__), "__file__", None)
+        if not path:
+            return None
+        return f"{os.path.abspath(path)}::{test_case_class.__qualname__}"
+    
+    def _file_state(self, path: str, mtime_ns: Optional[int] = None) -> Tuple[int, str]:
+        """
+        Get the (mtime_ns, sha1) of a source file, hashing it once per run.
+        
+        Raises:
+            OSError: If the file cannot be read
+        """
+        state = self._file_states.get(path)
+        if state is None:
+            if mtime_ns is None:
+                mtime_ns = os.stat(path).st_mtime_ns
+            with open(path, "rb") as f:
+                state = (mtime_ns, hashlib.sha1(f.read()).hexdigest())
+            self._file_states[path] = state
+        return state
+    
+    @staticmethod
+    def _load_results_cache() -> Dict[str, Dict[str, Any]]:
+        """Load the results cache, starting empty if it is missing or unreadable"""
+        try:
+            with open(RESULTS_CACHE_FILE, "r", encoding="utf-8") as f:
+                cache = json.load(f)
+            return cache if isinstance(cache, dict) else {}
+        except (OSError, ValueError):
+            return {}
+    
+    def _reuse_cached_result(self, cache: Dict[str, Dict[str, Any]], test_case_class: Type) -> bool:
+        """
+        Record passing results for a test case class from the cache.
+        
+        An entry records every project module that was loaded when the class
+        last ran, so editing the code under test invalidates it as well as
+        editing the test module. Each file's mtime is compared first; only
+        when it differs is the file hashed, so touching a file without
+        editing it keeps the entry.
+        
+        Returns:
+            True if the class passed last time and none of its sources changed
+        """
+        key = self._source_key(test_case_class)
+        entry = cache.get(key) if key else None
+        if not entry or not entry.get("passed") or not isinstance(entry.get("files"), dict):
+            return False
+        try:
+            for path, (mtime_ns, sha1) in entry["files"].items():
+                current_mtime_ns = os.stat(path).st_mtime_ns
+                if current_mtime_ns != mtime_ns:
+                    if self._file_state(path, current_mtime_ns)[1] != sha1:
+                        return False
+                    entry["files"][path] = [current_mtime_ns, sha1]
+        except (OSError, TypeError, ValueError):
+            return False
+        
+        class_name = test_case_class.__name__
+        for method_name, _ in _get_test_methods(test_case_class):
+            result = TestResult(method_name, class_name)
+            result.success = True
+            self.results.append(result)
+        print(f"Cached: {class_name} passed on a previous run, sources unchanged")
+        return True
+    
+    def _save_results_cache(self, cache: Dict[str, Dict[str, Any]], test_case_classes: List[Type]):
+        """Update the results cache with the outcome of the classes that just ran"""
+        files = {}
+        for path in _project_sources():
+            try:
+                files[path] = list(self._file_state(path))
+            except OSError:
+                continue
+        
+        failed_classes = {result.test_class for result in self._failed}
+        for test_case_class in test_case_classes:
+            key = self._source_key(test_case_class)
+            if key is None:
+                continue
+            cache[key] = {
+                "files": files,
+                "passed": test_case_class.__name__ not in failed_classes,
+            }
+        try:
+            with open(RESULTS_CACHE_FILE, "w", encoding="utf-8") as f:
+                json.dump(cache, f, indent=2)
+        except OSError as e:
+            self.logger.warning("Could not write results cache %s: %s", RESULTS_CACHE_FILE, e)
+    
     def _print_summary(self, total_time: float):
         """Print a summary of test results with improved formatting"""
         total = len(self.results)
-        passed = sum(1 for r in self.results if r.success)
-        failed = total - passed
+        failed = len(self._failed)
+        passed = total - failed
         
-        print("\n" + "=" * 70)
-        print("TEST RESULTS SUMMARY")
-        print("-" * 70)
-        print(f"Total tests:    {total}")
-        print(f"Passed:         {passed}")
-        print(f"Failed:         {failed}")
-        print(f"Success rate:   {(passed / total * 100) if total > 0 else 0:.1f}%")
-        print(f"Total time:     {total_time:.3f}s")
-        print("=" * 70)
+        lines = [
+            "\n" + "=" * 70,
+            "TEST RESULTS SUMMARY",
+            "-" * 70,
+            f"Total tests:    {total}",
+            f"Passed:         {passed}",
+            f"Failed:         {failed}",
+            f"Success rate:   {(passed / total * 100) if total > 0 else 0:.1f}%",
+            f"Total time:     {total_time:.3f}s",
+            "=" * 70,
+        ]
         
         if failed > 0:
-            print("\nFAILED TESTS:")
-            print("-" * 70)
-            for result in self.results:
-                if not result.success:
-                    print(f"  • {result.test_class}.{result.test_name}")
-                    print(f"    Error: {result.error_message}")
-                    print()
+            lines.append("\nFAILED TESTS:")
+            lines.append("-" * 70)
+            for result in self._failed:
+                lines.append(f"  • {result.test_class}.{result.test_name}")
+                lines.append(f"    Error: {result.error_message}")
+                lines.append("")
         else:
-            print("\nAll tests passed successfully!")
+            lines.append("\nAll tests passed successfully!")
         
-        print()
+        lines.append("")
+        sys.stdout.writelines(line + "\n" for line in lines)
+
+
+def _init_worker_logging():
+    """Log straight to the handlers in worker processes, which have no queue listener"""
+    logging.getLogger().handlers[:] = _log_handlers
+
+
+def _run_test_case_captured(test_case_class: Type) -> Tuple[List[TestResult], str]:
+    """Run one test case class in a worker process, returning its results and console output"""
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        results = TestRunner(workers=1).run_test_case(test_case_class)
+    return results, output.getvalue()
 
 
-def run_tests(test_modules: Optional[List[str]] = None) -> bool:
+def run_tests(test_modules: Optional[List[str]] = None, cached: bool = False) -> bool:
     """
     Run tests from specified modules or discover all test modules.
     
     Args:
         test_modules: List of module names to run tests from
+        cached: Skip test case classes that passed last time and whose
+            sources (the test module and the project modules loaded
+            with it) are unchanged
         
     Returns:
         bool: True if all tests passed, False otherwise
     """
-    runner = TestRunner()
+    runner = TestRunner(cached=cached)
     
     print("\n" + "=" * 70)
     print("RANSOMWARE INTELLIGENCE SYSTEM - TEST RUNNER")
@@ -270,17 +553,17 @@ def run_tests(test_modules: Optional[List[str]] = None) -> bool:
     
     if test_modules is None:
         # Import test registry to find test cases
-        from tests import test_registry
-        test_case_classes = test_registry.get_all_test_cases()
+        from tests import all_test_cases
+        test_case_classes = all_test_cases()
         
         print(f"Discovered {len(test_case_classes)} test case classes")
     else:
         test_case_classes = []
         for module_name in test_modules:
             try:
-                module = __import__(module_name, fromlist=[''])
-                for name, obj in inspect.getmembers(module):
-                    if (inspect.isclass(obj) and issubclass(obj, TestCase) 
+                module = importlib.import_module(module_name)
+                for obj in vars(module).values():
+                    if (isinstance(obj, type) and issubclass(obj, TestCase) 
                             and obj != TestCase):
                         test_case_classes.append(obj)
             except ImportError as e:
@@ -303,6 +586,9 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Run tests for the ransomware intelligence system")
     parser.add_argument("modules", nargs="*", help="Test module(s) to run")
     parser.add_argument("-v", "--verbose", action="store_true", help="Verbose output")
+    parser.add_argument("--cached", action="store_true",
+                        help="Skip test classes that passed last run and whose sources "
+                             "(test module and loaded project modules) are unchanged")
     
     args = parser.parse_args()
     
@@ -311,5 +597,5 @@ if __name__ == "__main__":
         for handler in logging.root.handlers:
             handler.setLevel(logging.DEBUG)
     
-    success = run_tests(args.modules if args.modules else None)
+    success = run_tests(args.modules if args.modules else None, cached=args.cached)
     sys.exit(0 if success else 1)
\ No newline at end of file
@@ -6,5 +6,20 @@ This package contains test modules for different components
 of the system to ensure their correct operation.
 """
 
+from typing import List, Type
+
 # Test modules will be imported by the test registry when needed
-# This empty __init__.py file makes the directory a Python package
\ No newline at end of file
+
+
+def all_test_cases() -> List[Type]:
+    """
+    Get every registered test case class.
+    
+    Discovery and caching are handled by the test registry.
+    
+    Returns:
+        List of test case classes
+    """
+    # Imported here: discovery imports the test modules, which import this package
+    from tests.test_registry import get_all_test_cases
+    return get_all_test_cases()
@@ -6,9 +6,10 @@ This module contains tests for the alert trigger and notification
 mechanisms to ensure they correctly identify and notify about matches.
 """
 
-from unittest.mock import patch, MagicMock
+from types import SimpleNamespace
+from unittest.mock import patch
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Sequence, Tuple
 
 from test_framework import TestCase
 from tests.test_registry import register_test_case
@@ -17,33 +18,54 @@ from tests.test_registry import register_test_case
 from alerting.triggers import AlertTrigger
 from alerting.notifiers import ConsoleNotifier
 
+# Identifiers for testing, shared read-only across tests
+_IDENTIFIERS: Tuple[Dict[str, Any], ...] = (
+    {
+        'id': 1,
+        'client_id': 1,
+        'identifier_type': 'domain',
+        'identifier_value': 'example.com'
+    },
+    {
+        'id': 2,
+        'client_id': 1,
+        'identifier_type': 'name',
+        'identifier_value': 'Test Company'
+    }
+)
+
+
+class _StubDB:
+    """Minimal database stand-in that records the calls the alert trigger makes"""
+    
+    def __init__(self, identifiers: Sequence[Dict[str, Any]]):
+        self.identifiers = identifiers
+        self.alert_ids: List[int] = []
+        self.bulk_add_alerts_calls: List[List[Dict[str, Any]]] = []
+        self.add_alert_calls: List[Any] = []
+    
+    def get_all_identifiers(self) -> Sequence[Dict[str, Any]]:
+        return self.identifiers
+    
+    def bulk_add_alerts(self, rows: List[Dict[str, Any]]) -> List[int]:
+        self.bulk_add_alerts_calls.append(rows)
+        return self.alert_ids
+    
+    def add_alert(self, *args, **kwargs):
+        self.add_alert_calls.append((args, kwargs))
+
+
 @register_test_case
 class AlertTestCase(TestCase):
     """Tests for alert mechanisms"""
     
     def setUp(self):
         """Set up test fixtures"""
-        # Create mock database for testing
-        self.mock_db = MagicMock()
-        
         # Set up identifiers for testing
-        self.identifiers = [
-            {
-                'id': 1,
-                'client_id': 1,
-                'identifier_type': 'domain',
-                'identifier_value': 'example.com'
-            },
-            {
-                'id': 2,
-                'client_id': 1,
-                'identifier_type': 'name',
-                'identifier_value': 'Test Company'
-            }
-        ]
+        self.identifiers = _IDENTIFIERS
         
-        # Configure the mock database
-        self.mock_db.get_all_identifiers.return_value = self.identifiers
+        # Create stub database for testing
+        self.mock_db = _StubDB(self.identifiers)
         
         # Initialize the alert trigger with mock database
         self.alert_trigger = AlertTrigger(self.mock_db)
@@ -74,16 +96,58 @@ class AlertTestCase(TestCase):
         self.assertEqual(matches[0]['identifier_type'], 'domain')
         self.assertEqual(matches[0]['identifier_value'], 'example.com')
     
+    def test_check_match_domain_no_match(self):
+        """Test that unrelated domains are rejected by the domain cache"""
+        claim = {
+            "collector": "Test",
+            "threat_actor": "testgroup",
+            "name_network_identifier": "Another Business",
+            "ip_network_identifier": None,
+            "domain_network_identifier": "example.org",
+            "sector": "Technology",
+            "comment": "Test description",
+            "raw_data": "{}",
+            "timestamp": datetime.now(),
+            "claim_url": "http://example.org"
+        }
+        
+        self.alert_trigger._refresh_cache()
+        matches = self.alert_trigger.check_match(claim)
+        
+        self.assertEqual(matches, [])
+    
+    def test_process_claim_batches_alerts(self):
+        """Test that all alerts for a claim are stored in one batch"""
+        self.mock_db.alert_ids = [10, 11]
+        claim = {
+            "collector": "Test",
+            "threat_actor": "testgroup",
+            "name_network_identifier": "Test Company Ltd",
+            "ip_network_identifier": None,
+            "domain_network_identifier": "example.com",
+            "timestamp": datetime.now()
+        }
+        
+        self.alert_trigger._refresh_cache()
+        alerts = self.alert_trigger.process_claim(claim)
+        
+        # One database call covering both matches
+        self.assertEqual(len(self.mock_db.bulk_add_alerts_calls), 1)
+        self.assertEqual(self.mock_db.add_alert_calls, [])
+        rows = self.mock_db.bulk_add_alerts_calls[0]
+        self.assertEqual([row["identifier_id"] for row in rows], [1, 2])
+        self.assertEqual([alert["id"] for alert in alerts], [10, 11])
+    
     def test_console_notifier(self):
         """Test console notifier"""
         notifier = ConsoleNotifier()
         
-        # Create a mock identifier object with attributes instead of dictionary keys
-        mock_identifier = MagicMock()
-        mock_identifier.identifier_type = "domain"
-        mock_identifier.identifier_value = "example.com"
-        mock_identifier.client = MagicMock()
-        mock_identifier.client.client_name = "Test Client"
+        # Create an identifier object with attributes instead of dictionary keys
+        mock_identifier = SimpleNamespace(
+            identifier_type="domain",
+            identifier_value="example.com",
+            client=SimpleNamespace(client_name="Test Client")
+        )
         
         # Create a test alert
         alert = {
@@ -93,7 +157,7 @@ class AlertTestCase(TestCase):
         }
         
         # Mock print to prevent output during test
-        with patch('builtins.print') as mock_print:
+        with patch('builtins.print', lambda *args, **kwargs: None):
             # Send the alert
             result = notifier.send_alert(alert)
             
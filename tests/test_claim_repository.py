@@ -0,0 +1,79 @@
+# tests/test_claim_repository.py
+"""
+Test cases for the claim repository.
+
+This module contains tests for duplicate detection against a real
+(in-memory SQLite) database.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import insert
+
+from test_framework import TestCase
+from tests.test_registry import register_test_case
+from database.base import Database
+from database.models import Base, Claim
+from database.repositories.claim_repository import ClaimRepository
+
+
+class _ConcurrentWriterClaimRepository(ClaimRepository):
+    """Claim repository behaving as on a backend with concurrent writers, e.g. PostgreSQL"""
+
+    @staticmethod
+    def _ids_commit_in_order(session) -> bool:
+        return False
+
+
+def _claim(name: str, timestamp: datetime) -> dict:
+    """Build a minimal claim for the given victim name"""
+    return {
+        "collector": "Test",
+        "threat_actor": "testgroup",
+        "name_network_identifier": name,
+        "domain_network_identifier": "",
+        "raw_data": "{}",
+        "timestamp": timestamp
+    }
+
+
+@register_test_case
+class ClaimRepositoryTestCase(TestCase):
+    """Tests for claim duplicate detection"""
+
+    def setUp(self):
+        """Set up an empty in-memory database"""
+        self.db = Database("sqlite://", Base)
+        self.db.initialize()
+
+    def tearDown(self):
+        """Dispose of the database engine"""
+        self.db.engine.dispose()
+
+    def test_duplicate_rejected_after_out_of_order_insert(self):
+        """Test that a claim committed below the highest seen ID still blocks its duplicates"""
+        repo = _ConcurrentWriterClaimRepository(self.db)
+        timestamp = datetime(2024, 1, 17, 12, 0)
+
+        # Two claims stored in order, so any ID watermark is past both
+        first_id = repo.add_claim(_claim("First Company", timestamp))
+        second_id = repo.add_claim(_claim("Second Company", timestamp))
+        self.assertTrue(first_id is not None and second_id is not None)
+
+        # A claim from another writer commits late with a lower ID
+        late_id = first_id - 1000
+        row = repo._to_row(repo._validate_claim(_claim("Late Company", timestamp)))
+        row["id"] = late_id
+        self.db.execute_write(lambda session: session.execute(insert(Claim), [row]))
+
+        # Its duplicate must be rejected, not waved through as new
+        self.assertIsNone(repo.add_claim(_claim("Late Company", timestamp)))
+
+    def test_sqlite_uses_bloom_prefilter(self):
+        """Test that SQLite's in-order IDs enable the Bloom filter prefilter"""
+        repo = ClaimRepository(self.db)
+        timestamp = datetime(2024, 1, 17, 12, 0)
+
+        self.assertIsNotNone(repo.add_claim(_claim("First Company", timestamp)))
+        self.assertIsNone(repo.add_claim(_claim("First Company", timestamp)))
+        self.assertTrue(repo._seen is not None)
@@ -7,9 +7,9 @@ they correctly fetch and process data from intelligence sources.
 """
 
 import json
-from typing import List, Dict, Any
-from unittest.mock import patch, MagicMock
-from datetime import datetime
+from typing import List, Dict, Any, Tuple
+from unittest.mock import patch
+from datetime import datetime, timedelta
 
 from test_framework import TestCase
 from tests.test_registry import register_test_case
@@ -17,6 +17,42 @@ from tests.test_registry import register_test_case
 from collectors.base import BaseCollector
 from collectors.ransomlook import RansomlookCollector
 from collectors.ransomwarelive import RansomwareLiveCollector
+from collectors.ransomwatch import RansomwatchCollector
+from collectors.onion_base import OnionCollector
+from utils.error_utils import NetworkError
+
+# Mock source data for tests, shared read-only across tests
+_RANSOMLOOK_DATA: Tuple[Dict[str, Any], ...] = (
+    {
+        "post_title": "Test Company",
+        "discovered": "20250222 185730.920941",
+        "description": "Test description",
+        "link": "/companies/123456",
+        "magnet": None,
+        "screen": "screenshots/group/TestCompany.png",
+        "group_name": "testgroup"
+    },
+)
+
+_RANSOMWARELIVE_DATA: Tuple[Dict[str, Any], ...] = (
+    {
+        "activity": "Technology",
+        "attackdate": "20250222 165844.000000",
+        "claim_url": "https://example.onion/companies/123456",
+        "country": "US",
+        "description": "Test description",
+        "discovered": "20250222 172021.809152",
+        "domain": "www.testcompany.com",
+        "duplicates": [],
+        "group": "testgroup",
+        "infostealer": "",
+        "press": None,
+        "screenshot": "https://images.example.com/victims/123.png",
+        "url": "https://example.com/id/123",
+        "victim": "Test Company"
+    },
+)
+
 
 @register_test_case
 class CollectorTestCase(TestCase):
@@ -25,36 +61,8 @@ class CollectorTestCase(TestCase):
     def setUp(self):
         """Set up test fixtures"""
         # Mock data for tests
-        self.ransomlook_data = [
-            {
-                "post_title": "Test Company",
-                "discovered": "20250222 185730.920941",
-                "description": "Test description",
-                "link": "/companies/123456",
-                "magnet": None,
-                "screen": "screenshots/group/TestCompany.png",
-                "group_name": "testgroup"
-            }
-        ]
-        
-        self.ransomwarelive_data = [
-            {
-                "activity": "Technology",
-                "attackdate": "20250222 165844.000000",
-                "claim_url": "https://example.onion/companies/123456",
-                "country": "US",
-                "description": "Test description",
-                "discovered": "20250222 172021.809152",
-                "domain": "www.testcompany.com",
-                "duplicates": [],
-                "group": "testgroup",
-                "infostealer": "",
-                "press": None,
-                "screenshot": "https://images.example.com/victims/123.png",
-                "url": "https://example.com/id/123",
-                "victim": "Test Company"
-            }
-        ]
+        self.ransomlook_data = _RANSOMLOOK_DATA
+        self.ransomwarelive_data = _RANSOMWARELIVE_DATA
     
     @patch('collectors.base.BaseCollector.make_request')
     def test_ransomlook_collector(self, mock_make_request):
@@ -106,11 +114,10 @@ class CollectorTestCase(TestCase):
         self.assertEqual(claim["comment"], "Test description")
         self.assertEqual(claim["claim_url"], "https://example.onion/companies/123456")
     
-    @patch('collectors.base.BaseCollector.make_request')
-    def test_empty_response_handling(self, mock_make_request):
+    @patch('collectors.base.BaseCollector.make_request', lambda self, endpoint, params=None: None)
+    def test_empty_response_handling(self):
         """Test handling of empty responses"""
-        # Configure the mock to return None (network error)
-        mock_make_request.return_value = None
+        # make_request returns None (network error)
         
         # Test with RansomlookCollector
         collector = RansomlookCollector()
@@ -155,4 +162,61 @@ class CollectorTestCase(TestCase):
         self.assertEqual(
             collector.parse_timestamp("20250222 185730.920941").date(),
             datetime(2025, 2, 22).date()
-        )
\ No newline at end of file
+        )
+    
+    def test_raw_data_is_json(self):
+        """Test that raw_data stores the source record as parseable JSON"""
+        data = self.ransomwarelive_data
+        
+        with patch.object(BaseCollector, 'make_request', lambda self, endpoint, params=None: data):
+            collector = RansomwareLiveCollector()
+            claims = collector.collect()
+        
+        self.assertEqual(json.loads(claims[0]["raw_data"]), self.ransomwarelive_data[0])
+    
+    @patch('collectors.base.BaseCollector.stream_request')
+    def test_ransomwatch_keeps_newest_100(self, mock_stream_request):
+        """Test RansomwatchCollector returns only the 100 newest posts, newest first"""
+        mock_stream_request.return_value = iter([
+            {
+                "post_title": f"Company {day:03d}",
+                "group_name": "testgroup",
+                "discovered": (datetime(2025, 1, 1) + timedelta(days=day)).strftime("%Y-%m-%d %H:%M:%S.%f")
+            }
+            for day in range(150)
+        ])
+        
+        collector = RansomwatchCollector()
+        claims = collector.collect()
+        
+        self.assertEqual(len(claims), 100)
+        self.assertEqual(claims[0]["name_network_identifier"], "Company 149")
+        self.assertEqual(claims[-1]["name_network_identifier"], "Company 050")
+        self.assertEqual(claims[0]["timestamp"], datetime(2025, 1, 1) + timedelta(days=149))
+    
+    @patch('collectors.base.BaseCollector.stream_request')
+    def test_ransomwatch_discards_truncated_stream(self, mock_stream_request):
+        """Test RansomwatchCollector returns nothing when the post stream breaks off"""
+        def truncated_stream():
+            yield {"post_title": "Company 001", "group_name": "testgroup",
+                   "discovered": "2025-01-01 00:00:00.000000"}
+            raise NetworkError("Error reading response: connection reset")
+        
+        mock_stream_request.return_value = truncated_stream()
+        
+        collector = RansomwatchCollector()
+        self.assertEqual(collector.collect(), [])
+    
+    def test_onion_collector_uses_fallback(self):
+        """Test OnionCollector returns data from a fallback when the primary fails"""
+        collector = OnionCollector("Test", ["http://primary.onion/", "http://fallback.onion/"])
+        responses = {
+            "http://primary.onion/": {"error": "unreachable"},
+            "http://fallback.onion/": {"victims": [{"name": "Test Company"}]}
+        }
+        
+        with patch.object(OnionCollector, '_collect_via_droplet', side_effect=lambda url=None: responses[url]):
+            data = collector._collect_with_fallbacks()
+        
+        self.assertEqual(data, responses["http://fallback.onion/"])
+        self.assertEqual(collector.base_url, "http://primary.onion/")
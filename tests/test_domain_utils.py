@@ -6,10 +6,11 @@ This module contains tests for the domain-related utility functions
 to ensure they work correctly for matching and normalizing domains.
 """
 
+import itertools
 from typing import List, Dict, Any
 from test_framework import TestCase
 from tests.test_registry import register_test_case
-from utils.domain_utils import normalize_domain, is_domain_match, generate_domain_variants, DomainMatchCache
+from utils.domain_utils import normalize_domain, is_domain_match, DomainMatchCache
 
 @register_test_case
 class DomainUtilsTestCase(TestCase):
@@ -52,4 +53,52 @@ class DomainUtilsTestCase(TestCase):
         
         # Test non-matches
         self.assertFalse(is_domain_match("example.org", "example.com"))
-        self.assertFalse(is_domain_match("another.com", "example.com"))
\ No newline at end of file
+        self.assertFalse(is_domain_match("another.com", "example.com"))
+    
+    def test_normalize_domain_cached(self):
+        """Test that repeated normalization is served from the cache"""
+        normalize_domain("https://Cached.Example.com/")
+        hits = normalize_domain.cache_info().hits
+        
+        self.assertEqual(normalize_domain("https://Cached.Example.com/"), "cached.example.com")
+        self.assertEqual(normalize_domain.cache_info().hits, hits + 1)
+    
+    def test_domain_match_cache(self):
+        """Test that the domain cache finds the same matches as is_domain_match"""
+        cache = DomainMatchCache()
+        for domain in ("example.com", "www.example.org", "sub.example.net", "other.com"):
+            cache.add_domain(domain, domain)
+        
+        def matched(test_domain):
+            return sorted(metadata for _, metadata in cache.find_matches(test_domain))
+        
+        # Exact and www variants
+        self.assertEqual(matched("EXAMPLE.com"), ["example.com"])
+        self.assertEqual(matched("www.example.com"), ["example.com"])
+        self.assertEqual(matched("example.org"), ["www.example.org"])
+        
+        # Query is a subdomain or a parent of a watchlist domain
+        self.assertEqual(matched("a.b.example.com"), ["example.com"])
+        self.assertEqual(matched("example.net"), ["sub.example.net"])
+        
+        # Siblings of a www domain do not match
+        self.assertEqual(matched("mail.example.org"), [])
+        self.assertEqual(matched("unrelated.io"), [])
+    
+    def test_domain_match_cache_agrees_with_is_domain_match(self):
+        """Test the trie against is_domain_match for every pairing of small domains"""
+        labels = ("a", "www", "example", "com")
+        domains = [
+            ".".join(parts)
+            for depth in range(1, 4)
+            for parts in itertools.product(labels, repeat=depth)
+        ]
+        
+        cache = DomainMatchCache()
+        for domain in domains:
+            cache.add_domain(domain, domain)
+        
+        for test_domain in domains:
+            expected = sorted(domain for domain in domains if is_domain_match(test_domain, domain))
+            matched = sorted(metadata for _, metadata in cache.find_matches(test_domain))
+            self.assertEqual(matched, expected, f"Matches differ for {test_domain}")
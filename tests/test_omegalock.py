@@ -6,12 +6,17 @@ This module contains tests for verifying that the Omegalock parser
 correctly extracts victim data from HTML content.
 """
 
+import functools
+import re
+import sys
 from unittest.mock import patch, MagicMock
 from datetime import datetime
 
 from cli_modules.ui import clear_screen, print_header
 from test_framework import TestCase
 from tests.test_registry import register_test_case
+from utils import html_utils
+from utils.html_utils import extract_omegalock_rows
 
 # Sample HTML for testing
 SAMPLE_HTML = """
@@ -57,10 +62,95 @@ SAMPLE_HTML = """
 </html>
 """
 
+# Built-in sample offered by the interactive parser test
+BUILTIN_SAMPLE_HTML = """
+<html>
+    <head>
+        <title>0mega | Blog</title>
+    </head>
+    <body>
+        <div class="center block">
+            <h4 class="theading">Leaked Data</h4>
+            <p class="tstat">(5 cases total)</p>
+            <table class="datatable center">
+            <tr>
+                <td><b>company name</b></td>
+                <td><b>leaked</b></td>
+                <td><b>tags</b></td>
+                <td><b>total data size</b></td>
+                <td><b>last updated</b></td>
+                <td class="tab"><b>downloads</b></td>
+            </tr>
+            <tr class='trow'>
+                <td>Rotorcraft Leasing Company</td>
+                <td>100%</td>
+                <td>Helicopter support, pilot training, fueling service, maintenance</td>
+                <td>1.54 TB</td>
+                <td>2024-01-17</td>
+                <td><a href="/post/5.html" target="_blank">open</a></td>
+            </tr>
+            <tr class='trow'>
+                <td>US Liner Company & American Made LLC</td>
+                <td>100%</td>
+                <td>Industrial engineering, manufacturing, advanced materials, thermoplastic composite solutions</td>
+                <td>712 GB</td>
+                <td>2024-01-17</td>
+                <td><a href="/post/4.html" target="_blank">open</a></td>
+            </tr>
+            </table>
+        </div>
+    </body>
+</html>
+"""
+
+# Patterns used by the parser replica, compiled once
+_TITLE_RE = re.compile(r'<title>(.*?)</title>', re.IGNORECASE)
+_FALLBACK_RE = re.compile(
+    r'<td>([\w\s\.\,\&\;\-]+(?:Company|LLC|Inc|Ltd|GmbH|Corp|SA|AG|BV)?)</td>',
+    re.IGNORECASE
+)
+
+
+class Victim:
+    """Victim parsed by the parser test, converted to a dict for the collector"""
+    
+    __slots__ = ("name", "date", "group", "sector", "leak_percentage",
+                 "data_size", "link", "source_url")
+    
+    def __init__(self, name, date, group, sector=None, leak_percentage=None,
+                 data_size=None, link=None, source_url=None):
+        self.name = name
+        self.date = date
+        self.group = group
+        self.sector = sector
+        self.leak_percentage = leak_percentage
+        self.data_size = data_size
+        self.link = link
+        self.source_url = source_url
+    
+    def as_dict(self):
+        """Return the victim as the dictionary the collector expects, omitting unset fields"""
+        return {
+            field: value
+            for field in self.__slots__
+            if (value := getattr(self, field)) is not None
+        }
+
+
+@functools.cache
+def _get_collector():
+    """Get the OmegalockCollector shared by the tests, created on first use"""
+    from collectors.omegalock import OmegalockCollector
+    return OmegalockCollector()
+
+
 @register_test_case
 class OmegalockParserTestCase(TestCase):
     """Tests for the Omegalock parser implementation"""
     
+    # Prompts for the HTML source, so it must run in the terminal's process
+    parallel = False
+    
     def setUp(self):
         """Set up test fixtures"""
         # Import the parser function - we'll mock it for testing
@@ -84,8 +174,6 @@ class OmegalockParserTestCase(TestCase):
         try:
             # Import necessary modules
             from config import Config
-            import re
-            from datetime import datetime
             
             # First check if we have sample HTML - either from a file or we'll use a sample
             print("This tool tests the Omegalock parser with sample HTML.")
@@ -104,9 +192,10 @@ class OmegalockParserTestCase(TestCase):
                 # Get HTML from file
                 file_path = input("\nEnter path to HTML file: ").strip()
                 try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        html_content = f.read()
-                    print(f"\nLoaded {len(html_content)} bytes from {file_path}")
+                    with open(file_path, 'rb') as f:
+                        raw_html = f.read()
+                    html_content = raw_html.decode('utf-8')
+                    print(f"\nLoaded {len(raw_html)} bytes from {file_path}")
                 except Exception as e:
                     print(f"\nError loading file: {str(e)}")
                     input("\nPress Enter to return to the test menu...")
@@ -114,45 +203,7 @@ class OmegalockParserTestCase(TestCase):
             
             elif source_choice == "2":
                 # Use built-in sample
-                html_content = """
-                <html>
-                    <head>
-                        <title>0mega | Blog</title>
-                    </head>
-                    <body>
-                        <div class="center block">
-                            <h4 class="theading">Leaked Data</h4>
-                            <p class="tstat">(5 cases total)</p>
-                            <table class="datatable center">
-                            <tr>
-                                <td><b>company name</b></td>
-                                <td><b>leaked</b></td>
-                                <td><b>tags</b></td>
-                                <td><b>total data size</b></td>
-                                <td><b>last updated</b></td>
-                                <td class="tab"><b>downloads</b></td>
-                            </tr>
-                            <tr class='trow'>
-                                <td>Rotorcraft Leasing Company</td>
-                                <td>100%</td>
-                                <td>Helicopter support, pilot training, fueling service, maintenance</td>
-                                <td>1.54 TB</td>
-                                <td>2024-01-17</td>
-                                <td><a href="/post/5.html" target="_blank">open</a></td>
-                            </tr>
-                            <tr class='trow'>
-                                <td>US Liner Company & American Made LLC</td>
-                                <td>100%</td>
-                                <td>Industrial engineering, manufacturing, advanced materials, thermoplastic composite solutions</td>
-                                <td>712 GB</td>
-                                <td>2024-01-17</td>
-                                <td><a href="/post/4.html" target="_blank">open</a></td>
-                            </tr>
-                            </table>
-                        </div>
-                    </body>
-                </html>
-                """
+                html_content = BUILTIN_SAMPLE_HTML
                 print("\nUsing built-in sample HTML.")
             
             elif source_choice == "3":
@@ -169,7 +220,7 @@ class OmegalockParserTestCase(TestCase):
                 
                 if html:
                     html_content = html
-                    print(f"\nFetched {len(html_content)} bytes from Omegalock site.")
+                    print(f"\nFetched {len(html_content)} characters from Omegalock site.")
                 else:
                     print(f"\nError fetching HTML: {metadata.get('error', 'Unknown error')}")
                     input("\nPress Enter to return to the test menu...")
@@ -188,71 +239,49 @@ class OmegalockParserTestCase(TestCase):
                 
                 try:
                     # Extract title
-                    title_match = re.search(r'<title>(.*?)</title>', html_content, re.IGNORECASE)
+                    title_match = _TITLE_RE.search(html_content)
                     if title_match:
                         title = title_match.group(1).strip()
                     
-                    # Find data table
-                    table_match = re.search(r'<table class="datatable center">(.*?)</table>', html_content, re.DOTALL | re.IGNORECASE)
+                    # Find data table rows as (cell texts, link)
+                    victim_rows = extract_omegalock_rows(html_content)
                     
-                    if table_match:
-                        table_content = table_match.group(1)
-                        
-                        # Extract rows
-                        victim_rows = re.findall(r'<tr class=[\'"]trow[\'"]>(.*?)</tr>', table_content, re.DOTALL | re.IGNORECASE)
-                        
+                    if victim_rows is not None:
                         print(f"\nFound {len(victim_rows)} victim rows in the table")
                         
                         # Process each row
-                        for row in victim_rows:
-                            # Extract cells
-                            cells = re.findall(r'<td.*?>(.*?)</td>', row, re.DOTALL | re.IGNORECASE)
-                            
+                        for cells, link in victim_rows:
                             if len(cells) >= 5:
                                 # Extract fields from cells
-                                company_name = re.sub(r'<.*?>', '', cells[0]).strip()
-                                leak_percentage = re.sub(r'<.*?>', '', cells[1]).strip()
-                                tags = re.sub(r'<.*?>', '', cells[2]).strip()
-                                data_size = re.sub(r'<.*?>', '', cells[3]).strip()
-                                last_updated = re.sub(r'<.*?>', '', cells[4]).strip()
-                                
-                                # Extract link
-                                link_match = re.search(r'href="([^"]+)"', cells[5] if len(cells) > 5 else "", re.IGNORECASE)
-                                link = link_match.group(1) if link_match else ""
-                                
-                                company_name = re.sub(r'<[^>]*>', '', company_name).strip()
+                                company_name, leak_percentage, tags, data_size, last_updated = cells[:5]
                                 
                                 if company_name:  # Only add if we have a company name
-                                    victims.append({
-                                        "name": company_name,
-                                        "date": last_updated,
-                                        "group": "omegalock",
-                                        "sector": tags,
-                                        "leak_percentage": leak_percentage,
-                                        "data_size": data_size,
-                                        "link": link,
-                                        "source_url": url
-                                    })
+                                    victims.append(Victim(
+                                        name=company_name,
+                                        date=last_updated,
+                                        group="omegalock",
+                                        sector=tags,
+                                        leak_percentage=leak_percentage,
+                                        data_size=data_size,
+                                        link=link,
+                                        source_url=url
+                                    ))
                     else:
                         print("\nData table not found in HTML!")
                         
                         # Try fallback extraction
-                        company_patterns = re.findall(
-                            r'<td>([\w\s\.\,\&\;\-]+(?:Company|LLC|Inc|Ltd|GmbH|Corp|SA|AG|BV)?)</td>',
-                            html_content,
-                            re.IGNORECASE
-                        )
+                        company_patterns = _FALLBACK_RE.findall(html_content)
                         
                         if company_patterns:
                             print(f"\nFallback extraction found {len(company_patterns)} potential company names")
                             for company in company_patterns:
                                 company_name = company.strip()
                                 if company_name and len(company_name) > 5:
-                                    victims.append({
-                                        "name": company_name,
-                                        "date": datetime.now().strftime("%Y-%m-%d"),
-                                        "group": "omegalock"
-                                    })
+                                    victims.append(Victim(
+                                        name=company_name,
+                                        date=datetime.now().strftime("%Y-%m-%d"),
+                                        group="omegalock"
+                                    ))
                 
                 except Exception as e:
                     print(f"\nError parsing HTML: {str(e)}")
@@ -269,37 +298,42 @@ class OmegalockParserTestCase(TestCase):
             print("\nRunning parser test...")
             result = parse_omegalock_test(html_content, "http://omegalock5zxwbhswbisc42o2q2i54vdulyvtqqbudqousisjgc7j7yd.onion/")
             
-            # Display results
-            print("\n" + "=" * 70)
-            print(f"Title: {result['title']}")
-            print(f"Found {len(result['victims'])} victims")
-            print("=" * 70)
+            # Display results, buffered into a single write
+            lines = [
+                "\n" + "=" * 70 + "\n",
+                f"Title: {result['title']}\n",
+                f"Found {len(result['victims'])} victims\n",
+                "=" * 70 + "\n",
+            ]
             
             # Show victims
             for i, victim in enumerate(result['victims']):
-                print(f"\nVictim #{i+1}:")
-                print(f"  Name: {victim.get('name', 'Unknown')}")
-                print(f"  Date: {victim.get('date', 'Unknown')}")
+                lines.append(f"\nVictim #{i+1}:\n")
+                lines.append(f"  Name: {victim.name or 'Unknown'}\n")
+                lines.append(f"  Date: {victim.date or 'Unknown'}\n")
                 
                 # Show sector if available
-                if 'sector' in victim:
+                if victim.sector is not None:
                     # Truncate sector if too long
-                    sector = victim['sector']
+                    sector = victim.sector
                     if len(sector) > 60:
                         sector = sector[:57] + "..."
-                    print(f"  Sector: {sector}")
+                    lines.append(f"  Sector: {sector}\n")
                 
                 # Show leak percentage if available
-                if 'leak_percentage' in victim:
-                    print(f"  Leak: {victim['leak_percentage']}")
+                if victim.leak_percentage is not None:
+                    lines.append(f"  Leak: {victim.leak_percentage}\n")
                 
                 # Show data size if available
-                if 'data_size' in victim:
-                    print(f"  Data Size: {victim['data_size']}")
+                if victim.data_size is not None:
+                    lines.append(f"  Data Size: {victim.data_size}\n")
                 
                 # Show link if available
-                if 'link' in victim and victim['link']:
-                    print(f"  Link: {victim['link']}")
+                if victim.link:
+                    lines.append(f"  Link: {victim.link}\n")
+            
+            sys.stdout.write("".join(lines))
+            sys.stdout.flush()
             
             print("\n" + "=" * 70)
             print("Parser test completed")
@@ -308,14 +342,13 @@ class OmegalockParserTestCase(TestCase):
             print("\nTesting collector processing...")
             
             try:
-                # Import the collector
-                from collectors.omegalock import OmegalockCollector
-                
-                # Create a collector instance
-                collector = OmegalockCollector()
+                # Get the shared collector instance
+                collector = _get_collector()
                 
                 # Process the victims
-                processed = collector._process_victims(result['victims'])
+                processed = collector._process_victims(
+                    [victim.as_dict() for victim in result['victims']]
+                )
                 
                 # Display results
                 print(f"\nProcessed {len(processed)} victims into claim format")
@@ -339,15 +372,19 @@ class OmegalockParserTestCase(TestCase):
                     print(f"  Timestamp: {processed[0]['timestamp']}")
                     
                     # Test how this would look in database schema
-                    print("\nThis maps to database schema as:")
-                    print("  Threat Actor: omegalock")
-                    print(f"  IP Network Identifier: {processed[0]['ip_network_identifier'] or 'None'}")
-                    print(f"  Domain Network Identifier: {processed[0]['domain_network_identifier'] or 'None'}")
-                    print(f"  Name Network Identifier: {processed[0]['name_network_identifier']}")
-                    print(f"  Sector: {processed[0]['sector'] or 'None'}")
-                    print(f"  Comment: {processed[0]['comment'] or 'None'}")
-                    print(f"  Claim URL: {processed[0]['claim_url']}")
-                    print(f"  Timestamp: {processed[0]['timestamp']}")
+                    claim = processed[0]
+                    sys.stdout.write(
+                        "\nThis maps to database schema as:\n"
+                        "  Threat Actor: omegalock\n"
+                        f"  IP Network Identifier: {claim['ip_network_identifier'] or 'None'}\n"
+                        f"  Domain Network Identifier: {claim['domain_network_identifier'] or 'None'}\n"
+                        f"  Name Network Identifier: {claim['name_network_identifier']}\n"
+                        f"  Sector: {claim['sector'] or 'None'}\n"
+                        f"  Comment: {claim['comment'] or 'None'}\n"
+                        f"  Claim URL: {claim['claim_url']}\n"
+                        f"  Timestamp: {claim['timestamp']}\n"
+                    )
+                    sys.stdout.flush()
                 
             except Exception as e:
                 print(f"\nError testing collector: {str(e)}")
@@ -358,12 +395,27 @@ class OmegalockParserTestCase(TestCase):
         
         input("\nPress Enter to return to the test menu...")
     
+    def test_extraction_paths_agree(self):
+        """Test that the DOM and regex extraction paths return the same rows"""
+        # Entities in cell text and links must be decoded by both paths
+        entity_html = SAMPLE_HTML.replace(
+            "Test Company Inc", "Smith &amp; Sons &#8211; Caf&eacute;"
+        ).replace('/post/5.html"', '/post/5.html?a=1&amp;b=2"')
+        
+        for html_content in (SAMPLE_HTML, entity_html):
+            regex_rows = html_utils._extract_omegalock_rows_regex(html_content)
+            self.assertEqual(len(regex_rows), 2)
+            if html_utils.LexborHTMLParser is not None:
+                self.assertEqual(regex_rows, extract_omegalock_rows(html_content))
+        
+        regex_rows = html_utils._extract_omegalock_rows_regex(entity_html)
+        self.assertEqual(regex_rows[0][0][0], "Smith & Sons \u2013 Caf\u00e9")
+        self.assertEqual(regex_rows[1][1], "/post/5.html?a=1&b=2")
+    
     def test_collector_processing(self):
         """Test the OmegalockCollector processes parser output correctly"""
-        from collectors.omegalock import OmegalockCollector
-        
-        # Create a collector instance
-        collector = OmegalockCollector()
+        # Get the shared collector instance
+        collector = _get_collector()
         
         # Sample parser output (victims)
         victims = [
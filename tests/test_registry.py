@@ -7,10 +7,9 @@ automatic discovery and running of tests.
 """
 
 import importlib
+import importlib.resources
 import sys
-import os
 import logging
-import pkgutil
 from typing import Dict, List, Type, Any
 
 logger = logging.getLogger("test_registry")
@@ -18,6 +17,11 @@ logger = logging.getLogger("test_registry")
 # Dictionary to store registered test case classes
 _test_case_registry = {}
 
+# Whether the test modules have been imported, and the registered classes
+# as last returned; registering a class clears the latter
+_discovered = False
+_cached_cases = None
+
 def register_test_case(test_case_class):
     """
     Register a test case class in the registry.
@@ -28,8 +32,10 @@ def register_test_case(test_case_class):
     Returns:
         The test case class (for decorator usage)
     """
+    global _cached_cases
     _test_case_registry[test_case_class.__name__] = test_case_class
-    logger.debug(f"Registered test case: {test_case_class.__name__}")
+    _cached_cases = None
+    logger.debug("Registered test case: %s", test_case_class.__name__)
     return test_case_class
 
 def get_all_test_cases() -> List[Type]:
@@ -39,12 +45,18 @@ def get_all_test_cases() -> List[Type]:
     Returns:
         List of test case classes
     """
+    global _discovered, _cached_cases
+    
     # Import all test modules to ensure all test cases are registered
-    _import_all_test_modules()
+    if not _discovered:
+        _import_all_test_modules()
+        _discovered = True
     
     # Return the registered test cases
-    logger.debug(f"Returning {len(_test_case_registry)} registered test cases")
-    return list(_test_case_registry.values())
+    if _cached_cases is None:
+        _cached_cases = list(_test_case_registry.values())
+    logger.debug("Returning %d registered test cases", len(_cached_cases))
+    return list(_cached_cases)
 
 def get_test_case(name: str) -> Type:
     """
@@ -65,28 +77,25 @@ def _import_all_test_modules():
     This automatically finds and imports all modules in the tests package
     to ensure their test cases are registered.
     """
-    tests_dir = os.path.dirname(__file__)
-    
-    # If running as a script, __file__ might not be available
-    if not tests_dir:
-        return _import_known_modules()
-    
     try:
         # Import known test modules first
         _import_known_modules()
         
-        # Then try to dynamically discover others
-        for _, name, is_pkg in pkgutil.iter_modules([tests_dir]):
-            if name.startswith('test_') and not is_pkg:
-                module_name = f'tests.{name}'
-                if module_name not in sys.modules:
-                    try:
-                        importlib.import_module(module_name)
-                        logger.debug(f"Discovered and imported test module: {module_name}")
-                    except ImportError as e:
-                        logger.warning(f"Failed to import discovered module {module_name}: {str(e)}")
+        # Then try to dynamically discover others from the package contents
+        discovered = sorted(
+            entry.name[:-3] for entry in importlib.resources.files('tests').iterdir()
+            if entry.name.startswith('test_') and entry.name.endswith('.py')
+        )
+        for name in discovered:
+            module_name = f'tests.{name}'
+            if module_name not in sys.modules:
+                try:
+                    importlib.import_module(module_name)
+                    logger.debug("Discovered and imported test module: %s", module_name)
+                except ImportError as e:
+                    logger.warning("Failed to import discovered module %s: %s", module_name, e)
     except Exception as e:
-        logger.warning(f"Error during test module discovery: {str(e)}")
+        logger.warning("Error during test module discovery: %s", e)
         # Fall back to known modules if discovery fails
         _import_known_modules()
 
@@ -95,14 +104,11 @@ def _import_known_modules():
     known_modules = [
         'tests.test_collectors',
         'tests.test_domain_utils',
-        'tests.test_alerts'
+        'tests.test_alerts',
+        'tests.test_claim_repository',
+        'tests.test_tor_collector'
     ]
     
-    # Only try to import tor_collector if we think it might exist
-    tor_test_path = os.path.join(os.path.dirname(__file__), 'test_tor_collector.py')
-    if os.path.exists(tor_test_path):
-        known_modules.append('tests.test_tor_collector')
-    
     # Import all known modules
     for module_name in known_modules:
         _import_module(module_name)
@@ -117,6 +123,12 @@ def _import_module(module_name):
     try:
         if module_name not in sys.modules:
             importlib.import_module(module_name)
-            logger.debug(f"Imported module: {module_name}")
+            logger.debug("Imported module: %s", module_name)
+    except ModuleNotFoundError as e:
+        # Optional modules such as test_tor_collector may simply not exist
+        if e.name == module_name:
+            logger.debug("Test module not present: %s", module_name)
+        else:
+            logger.warning("Failed to import module %s: %s", module_name, e)
     except ImportError as e:
-        logger.warning(f"Failed to import module {module_name}: {str(e)}")
\ No newline at end of file
+        logger.warning("Failed to import module %s: %s", module_name, e)
\ No newline at end of file
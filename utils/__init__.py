@@ -3,9 +3,27 @@
 Utility functions for the ransomware intelligence system.
 """
 
-# Import important utility modules 
-from . import domain_utils
-from . import types
-from . import processor_utils
-from . import time_utils
-from . import error_utils
\ No newline at end of file
+import importlib
+
+# Important utility modules, imported on first attribute access so that
+# importing one utility does not load the others and their dependencies
+_LAZY_MODULES = frozenset({
+    "domain_utils",
+    "types",
+    "processor_utils",
+    "time_utils",
+    "error_utils",
+    "json_utils",
+})
+
+
+def __getattr__(name):
+    if name in _LAZY_MODULES:
+        module = importlib.import_module(f".{name}", __name__)
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | _LAZY_MODULES)
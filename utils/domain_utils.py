@@ -5,8 +5,11 @@ Utility functions for working with domain names.
 This module provides functions for normalizing and matching domains.
 """
 
+import functools
+import sys
 from typing import Optional, Set, Dict, List, Tuple, Any
 
+@functools.lru_cache(maxsize=1024)
 def is_domain_match(test_domain, watchlist_domain):
     """
     Determine if two domains match according to our matching rules.
@@ -30,25 +33,28 @@ def is_domain_match(test_domain, watchlist_domain):
     if not test_norm or not watchlist_norm:
         return False
     
+    # The length difference decides which rule can still apply
+    delta = len(test_norm) - len(watchlist_norm)
+    
     # 1. Exact match
-    if test_norm == watchlist_norm:
-        return True
-    
-    # 2. WWW prefix match
-    if test_norm.startswith("www.") and test_norm[4:] == watchlist_norm:
-        return True
-    if watchlist_norm.startswith("www.") and test_norm == watchlist_norm[4:]:
-        return True
-    
-    # 3. Subdomain relationship
-    return (test_norm.endswith("." + watchlist_norm) or 
-            watchlist_norm.endswith("." + test_norm))
+    if delta == 0:
+        return test_norm == watchlist_norm
+    
+    # 2. WWW prefix match and 3. subdomain relationship: only the longer
+    # domain can be a subdomain of the shorter one, and "www.x" ends with ".x"
+    if delta > 0:
+        return test_norm.endswith("." + watchlist_norm)
+    return watchlist_norm.endswith("." + test_norm)
 
 
+@functools.lru_cache(maxsize=65536)
 def normalize_domain(domain: Optional[str]) -> str:
     """
     Normalize domain for consistent comparison.
     
+    Results are cached and interned, so repeated lookups of the same
+    domain return the identical string object.
+    
     Args:
         domain: Domain string to normalize
         
@@ -57,6 +63,12 @@ def normalize_domain(domain: Optional[str]) -> str:
     """
     if not domain:
         return ""
+    
+    # Already normalized input, the common case, is returned as is
+    if (domain.islower() and domain[-1] != "/"
+            and not domain[0].isspace() and not domain[-1].isspace()
+            and not domain.startswith(("http://", "https://"))):
+        return sys.intern(domain)
         
     # Remove protocol
     if domain.startswith("http://"):
@@ -70,7 +82,7 @@ def normalize_domain(domain: Optional[str]) -> str:
     # Remove trailing/leading whitespace
     domain = domain.strip()
     
-    return domain.lower()
+    return sys.intern(domain.lower())
 
 
 def is_subdomain_of(potential_subdomain: str, potential_parent: str) -> bool:
@@ -101,21 +113,48 @@ def is_subdomain_of(potential_subdomain: str, potential_parent: str) -> bool:
     return prefix_end >= 0 and sub[prefix_end] == '.'
 
 
+class _TrieNode:
+    """Node of the reverse-label domain trie"""
+    
+    __slots__ = ("children", "entries", "www_entries")
+    
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        # Domains ending at this node, and those that were added with a www prefix
+        self.entries: List[Tuple[str, Any]] = []
+        self.www_entries: List[Tuple[str, Any]] = []
+
+
+def _split_labels(normalized: str) -> Tuple[List[str], bool]:
+    """
+    Split a normalized domain into labels ordered from the TLD inward.
+    
+    Args:
+        normalized: Normalized domain
+        
+    Returns:
+        Tuple of (reversed labels without a leading www, whether www was stripped)
+    """
+    labels = normalized.split('.')
+    has_www = len(labels) > 1 and labels[0] == "www"
+    if has_www:
+        labels = labels[1:]
+    labels.reverse()
+    return labels, has_www
+
+
 class DomainMatchCache:
     """
     Cache for efficient domain matching operations.
     
-    This cache preprocesses domains for faster lookups during claim processing.
+    Domains are stored in a trie keyed by their labels from the TLD inward,
+    so a lookup walks the query once to find every matching watchlist domain.
+    Matches follow the same rules as is_domain_match.
     """
     
     def __init__(self):
         """Initialize an empty domain match cache"""
-        # Map from normalized domains to original domains with metadata
-        self.exact_matches: Dict[str, List[Tuple[str, Any]]] = {}
-        # Map from parent domains to potential subdomains with metadata
-        self.parent_domains: Dict[str, List[Tuple[str, Any]]] = {}
-        # Map from domain without www to the same domain with www
-        self.www_variants: Dict[str, List[Tuple[str, Any]]] = {}
+        self._root = _TrieNode()
     
     def add_domain(self, original_domain: str, metadata: Any = None) -> None:
         """
@@ -128,31 +167,19 @@ class DomainMatchCache:
         normalized = normalize_domain(original_domain)
         if not normalized:
             return
-            
-        # Store exact match
-        if normalized not in self.exact_matches:
-            self.exact_matches[normalized] = []
-        self.exact_matches[normalized].append((original_domain, metadata))
-        
-        # Store www variant
-        if normalized.startswith("www.") and len(normalized) > 4:
-            no_www = normalized[4:]
-            if no_www not in self.www_variants:
-                self.www_variants[no_www] = []
-            self.www_variants[no_www].append((original_domain, metadata))
+        
+        labels, has_www = _split_labels(normalized)
+        node = self._root
+        for label in labels:
+            child = node.children.get(label)
+            if child is None:
+                child = node.children[label] = _TrieNode()
+            node = child
+        
+        if has_www:
+            node.www_entries.append((original_domain, metadata))
         else:
-            www_version = f"www.{normalized}"
-            if normalized not in self.www_variants:
-                self.www_variants[normalized] = []
-            self.www_variants[normalized].append((original_domain, metadata))
-        
-        # Store parent domain references for subdomain matching
-        parts = normalized.split('.')
-        if len(parts) > 2:
-            parent = '.'.join(parts[1:])
-            if parent not in self.parent_domains:
-                self.parent_domains[parent] = []
-            self.parent_domains[parent].append((original_domain, metadata))
+            node.entries.append((original_domain, metadata))
     
     def find_matches(self, test_domain: str) -> List[Tuple[str, Any]]:
         """
@@ -170,31 +197,42 @@ class DomainMatchCache:
         normalized = normalize_domain(test_domain)
         if not normalized:
             return []
-            
+        
+        labels, has_www = _split_labels(normalized)
         matches = []
+        extend = matches.extend
         
-        # Check exact matches
-        if normalized in self.exact_matches:
-            matches.extend(self.exact_matches[normalized])
+        # Walk towards the query; entries on the way are parent domains of it
+        node = self._root
+        last = len(labels) - 1
+        for i, label in enumerate(labels):
+            node = node.children.get(label)
+            if node is None:
+                return matches
+            if i < last:
+                extend(node.entries)
+                # www.parent.com only contains queries under its www label
+                if labels[i + 1] == "www":
+                    extend(node.www_entries)
         
-        # Check www variants
-        if normalized.startswith("www.") and len(normalized) > 4:
-            no_www = normalized[4:]
-            if no_www in self.exact_matches:
-                matches.extend(self.exact_matches[no_www])
-        else:
-            if normalized in self.www_variants:
-                matches.extend(self.www_variants[normalized])
-        
-        # Check subdomain relationships (test_domain could be a subdomain)
-        parts = normalized.split('.')
-        for i in range(1, len(parts)):
-            parent = '.'.join(parts[i:])
-            if parent in self.exact_matches:
-                matches.extend(self.exact_matches[parent])
-        
-        # Check parent relationships (test_domain could be a parent domain)
-        if normalized in self.parent_domains:
-            matches.extend(self.parent_domains[normalized])
-            
-        return matches
\ No newline at end of file
+        # Exact match, with or without the www prefix
+        extend(node.entries)
+        extend(node.www_entries)
+        
+        # Everything below is a subdomain of the query; for a www query
+        # only the subtree under its www label is
+        if has_www:
+            node = node.children.get("www")
+            if node is None:
+                return matches
+            extend(node.entries)
+            extend(node.www_entries)
+        
+        stack = list(node.children.values())
+        while stack:
+            child = stack.pop()
+            extend(child.entries)
+            extend(child.www_entries)
+            stack.extend(child.children.values())
+        
+        return matches
@@ -4,7 +4,6 @@ Utilities for consistent error handling and reporting.
 """
 
 import logging
-import traceback
 from typing import Type, Optional, Any
 
 # Base exception for all application-specific errors
@@ -43,17 +42,15 @@ def log_exception(logger, message: str, exception: Exception, level: str = "erro
         exception: The exception that was caught
         level: Logging level ('error', 'warning', 'critical', etc.)
     """
-    log_method = getattr(logger, level.lower())
+    level = level.lower()
+    log_method = getattr(logger, level)
     
-    # Format the message with exception details
-    error_message = f"{message}: {str(exception)}"
+    # Log the message, letting logging format it only if it is emitted
+    log_method("%s: %s", message, exception)
     
-    # Log the message
-    log_method(error_message)
-    
-    # Log traceback for errors and criticals
-    if level.lower() in ("error", "critical"):
-        logger.debug(f"Traceback for {error_message}:\n{traceback.format_exc()}")
+    # Log traceback for errors and criticals; logging formats it lazily
+    if level in ("error", "critical") and logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Traceback for %s: %s", message, exception, exc_info=True)
 
 def handle_exception(
     exception: Exception,
@@ -0,0 +1,87 @@
+# utils/html_utils.py
+"""
+Utilities for extracting data from leak site HTML.
+
+Uses selectolax's lexbor parser when it is installed and falls back to
+regular expressions otherwise.
+"""
+
+import html
+import re
+from typing import List, Optional, Tuple
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # pragma: no cover - optional dependency
+    LexborHTMLParser = None
+
+# Regex fallback patterns. Tag bodies are matched with [^>]* so a malformed
+# cell cannot make the lazy content group backtrack across the rest of the row
+_TABLE_RE = re.compile(r'<table class="datatable center">(.*?)</table>', re.DOTALL | re.IGNORECASE)
+_ROW_RE = re.compile(r'<tr class=[\'"]trow[\'"]>(.*?)</tr>', re.DOTALL | re.IGNORECASE)
+_CELL_RE = re.compile(r'<td[^>]*>(.*?)</td>', re.DOTALL | re.IGNORECASE)
+_TAG_STRIP_RE = re.compile(r'<[^>]*>')
+_HREF_RE = re.compile(r'href="([^"]+)"', re.IGNORECASE)
+
+# A whole Omegalock row in the usual shape, five plain-text cells and a link
+# cell, read in one scan; rows with markup inside cells use the patterns above
+_PLAIN_CELL = r'\s*<td[^>]*>([^<]*)</td>'
+_FUSED_ROW_RE = re.compile(
+    _PLAIN_CELL * 5
+    + r'\s*<td[^>]*>\s*<a href="([^"]+)"[^>]*>([^<]*)</a>\s*</td>\s*',
+    re.IGNORECASE
+)
+
+
+def extract_omegalock_rows(html_content: str) -> Optional[List[Tuple[List[str], str]]]:
+    """
+    Extract the victim rows of an Omegalock data table.
+    
+    The page is parsed once and each cell's text is read straight from the
+    DOM, matching the collection agent's parse_omegalock.
+    
+    Args:
+        html_content: Page HTML
+        
+    Returns:
+        List of (cell texts, link) per 'trow' row, or None if there is no data table
+    """
+    if LexborHTMLParser is None:
+        return _extract_omegalock_rows_regex(html_content)
+    
+    table = LexborHTMLParser(html_content).css_first('table.datatable.center')
+    if table is None:
+        return None
+    
+    rows = []
+    for row in table.css('tr.trow'):
+        cell_nodes = row.css('td')
+        link_node = cell_nodes[5].css_first('a[href]') if len(cell_nodes) > 5 else None
+        link = (link_node.attributes.get('href') or "") if link_node else ""
+        rows.append(([cell.text().strip() for cell in cell_nodes], link))
+    return rows
+
+
+def _extract_omegalock_rows_regex(html_content: str) -> Optional[List[Tuple[List[str], str]]]:
+    """Regex version of extract_omegalock_rows, used without selectolax"""
+    table_match = _TABLE_RE.search(html_content)
+    if not table_match:
+        return None
+    
+    # Text is entity-decoded as the DOM does, so both paths return the same strings
+    unescape = html.unescape
+    rows = []
+    # Rows are matched one at a time instead of collecting every row's HTML first
+    for row_match in _ROW_RE.finditer(table_match.group(1)):
+        row = row_match.group(1)
+        fused = _FUSED_ROW_RE.fullmatch(row)
+        if fused:
+            *texts, link, link_text = fused.groups()
+            rows.append(([unescape(text).strip() for text in texts + [link_text]], unescape(link)))
+            continue
+        
+        cells = _CELL_RE.findall(row)
+        link_match = _HREF_RE.search(cells[5]) if len(cells) > 5 else None
+        link = unescape(link_match.group(1)) if link_match else ""
+        rows.append(([unescape(_TAG_STRIP_RE.sub('', cell)).strip() for cell in cells], link))
+    return rows
@@ -0,0 +1,55 @@
+# utils/json_utils.py
+"""
+Utilities for fast JSON serialization.
+
+Uses orjson when it is installed and falls back to the standard
+library json module otherwise.
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def dumps(obj: Any) -> str:
+    """
+    Serialize an object to a JSON string.
+
+    Datetime values are written as ISO-8601 strings; any other
+    unsupported type is converted with str().
+
+    Args:
+        obj: Object to serialize
+
+    Returns:
+        JSON string
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=str).decode("utf-8")
+    return json.dumps(obj, default=_default)
+
+
+def loads(data: Any) -> Any:
+    """
+    Deserialize JSON from a string or bytes.
+
+    Args:
+        data: JSON document as str or bytes
+
+    Returns:
+        Deserialized Python object
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _default(obj: Any) -> str:
+    """Fallback serializer for the standard library encoder"""
+    if hasattr(obj, "isoformat"):
+        return obj.isoformat()
+    return str(obj)
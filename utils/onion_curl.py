@@ -9,8 +9,8 @@ This module provides a simple 'curl-like' functionality to:
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import hmac
-import hashlib
 import time
 import logging
 import os
@@ -19,6 +19,22 @@ from datetime import datetime
 
 logger = logging.getLogger("utils.onion_curl")
 
+# Shared HTTP session, so repeated fetches reuse keep-alive connections
+# to the collection agent instead of reconnecting every time
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(pool_connections=16, pool_maxsize=32)
+_SESSION.mount('http://', _ADAPTER)
+_SESSION.mount('https://', _ADAPTER)
+
+# Headers sent with every request; the API key is added per call
+_BASE_HEADERS = {"Content-Type": "application/json"}
+
+
+def _error_metadata(error: str, url: str) -> Dict[str, Any]:
+    """Build the metadata returned alongside a failed fetch"""
+    return {"error": error, "url": url, "timestamp": datetime.now().isoformat()}
+
+
 def fetch_onion_content(
     url: str,
     config,
@@ -53,11 +69,7 @@ def fetch_onion_content(
     
     # Generate API key
     timestamp = str(int(time.time()))
-    signature = hmac.new(
-        api_secret.encode(), 
-        timestamp.encode(),
-        hashlib.sha256
-    ).hexdigest()
+    signature = hmac.digest(api_secret.encode(), timestamp.encode(), "sha256").hex()
     api_key = f"{timestamp}:{signature}"
     
     # Prepare request
@@ -65,16 +77,14 @@ def fetch_onion_content(
     
     try:
         # Make request to collection agent
-        response = requests.post(
+        response = _SESSION.post(
             f"{endpoint}/collect",
-            headers={
-                "X-API-Key": api_key,
-                "Content-Type": "application/json"
-            },
+            headers={**_BASE_HEADERS, "X-API-Key": api_key},
             json={
                 "url": url, 
                 "parser": parser_type,
-                "timeout": timeout
+                "timeout": timeout,
+                "include_raw": True
             },
             timeout=timeout + 30  # Add extra time for agent processing
         )
@@ -85,9 +95,9 @@ def fetch_onion_content(
         # Check for error
         if "error" in data:
             logger.error(f"Error fetching content: {data['error']}")
-            return None, {"error": data["error"], "url": url, "timestamp": datetime.now().isoformat()}
+            return None, _error_metadata(data["error"], url)
         
-        # Extract raw HTML - this isn't directly provided by the API, but can be inferred
+        # Extract raw HTML, returned by the agent because include_raw was requested
         html_content = data.get("raw_html", "")
         
         # If raw_html isn't available, create a diagnostic message
@@ -114,16 +124,19 @@ def fetch_onion_content(
         
         # Save to file if requested
         if save_to_file:
-            if not os.path.exists(output_dir):
-                os.makedirs(output_dir)
+            os.makedirs(output_dir, exist_ok=True)
             
             # Create a filename based on the domain and timestamp
             domain = url.replace("http://", "").replace("https://", "").replace("/", "_")
-            timestamp_str = datetime.now().strftime("%Y%m%d_%H%M%S")
+            now = datetime.now()
+            timestamp_str = (
+                f"{now.year:04d}{now.month:02d}{now.day:02d}_"
+                f"{now.hour:02d}{now.minute:02d}{now.second:02d}"
+            )
             filename = f"{domain}_{timestamp_str}.html"
             filepath = os.path.join(output_dir, filename)
             
-            with open(filepath, "w", encoding="utf-8") as f:
+            with open(filepath, "w", encoding="utf-8", buffering=1 << 20) as f:
                 f.write(html_content)
             
             logger.info(f"Saved HTML to: {filepath}")
@@ -137,10 +150,10 @@ def fetch_onion_content(
         
     except requests.RequestException as e:
         logger.error(f"Request error: {e}")
-        return None, {"error": str(e), "url": url, "timestamp": datetime.now().isoformat()}
+        return None, _error_metadata(str(e), url)
     except ValueError as e:
         logger.error(f"Error parsing JSON response: {e}")
-        return None, {"error": str(e), "url": url, "timestamp": datetime.now().isoformat()}
+        return None, _error_metadata(str(e), url)
     except Exception as e:
         logger.error(f"Unexpected error: {e}")
-        return None, {"error": str(e), "url": url, "timestamp": datetime.now().isoformat()}
\ No newline at end of file
+        return None, _error_metadata(str(e), url)
\ No newline at end of file
@@ -17,6 +17,9 @@ import time
 
 logger = logging.getLogger("utils.process_utils")
 
+# PID file in the project root, resolved once at import
+_PID_FILE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ransom-monitor.pid")
+
 def get_pid_file_path():
     """
     Get the path to the PID file.
@@ -24,7 +27,46 @@ def get_pid_file_path():
     Returns:
         str: Path to the PID file
     """
-    return os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ransom-monitor.pid")
+    return _PID_FILE_PATH
+
+if sys.platform.startswith("linux") and os.path.isdir("/proc"):
+    def _alive(pid):
+        """Check for the process's /proc entry, without sending a signal"""
+        return os.path.isdir(f"/proc/{pid}")
+elif os.name == 'posix':
+    def _alive(pid):
+        """Probe the process with signal 0, which doesn't kill it"""
+        try:
+            os.kill(pid, 0)
+        except PermissionError:
+            # The process exists but belongs to another user
+            return True
+        except OSError:
+            return False
+        return True
+elif os.name == 'nt':
+    import ctypes
+    
+    _kernel32 = ctypes.windll.kernel32
+    _PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+    _STILL_ACTIVE = 259
+    
+    def _alive(pid):
+        """Query the process's exit code through the Win32 API"""
+        handle = _kernel32.OpenProcess(_PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if not handle:
+            return False
+        try:
+            exit_code = ctypes.c_ulong()
+            if not _kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code)):
+                return False
+            return exit_code.value == _STILL_ACTIVE
+        finally:
+            _kernel32.CloseHandle(handle)
+else:
+    def _alive(pid):
+        """Process checks are not supported on this platform"""
+        return False
 
 def is_process_running(pid):
     """
@@ -36,25 +78,7 @@ def is_process_running(pid):
     Returns:
         bool: True if the process is running, False otherwise
     """
-    try:
-        # POSIX-based systems (Linux, macOS)
-        if os.name == 'posix':
-            # Sending signal 0 doesn't kill the process but checks if it exists
-            os.kill(pid, 0)
-            return True
-        # Windows systems
-        elif os.name == 'nt':
-            # Check for process existence using 'tasklist' command
-            result = subprocess.run(
-                ['tasklist', '/FI', f'PID eq {pid}'], 
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
-            )
-            return str(pid) in result.stdout
-        return False
-    except OSError:
-        return False
+    return _alive(pid)
 
 def write_pid_file(pid):
     """
@@ -66,9 +90,14 @@ def write_pid_file(pid):
     Returns:
         bool: True if successful, False otherwise
     """
+    pid_file = get_pid_file_path()
+    tmp_file = f"{pid_file}.tmp"
     try:
-        with open(get_pid_file_path(), 'w') as f:
+        # Write to a temporary file and rename it into place, so readers
+        # never see a partially written PID file
+        with open(tmp_file, 'w') as f:
             f.write(str(pid))
+        os.replace(tmp_file, pid_file)
         return True
     except Exception as e:
         logger.error(f"Error writing PID file: {str(e)}")
@@ -81,14 +110,12 @@ def read_pid_file():
     Returns:
         int or None: Process ID if file exists, None otherwise
     """
-    pid_file = get_pid_file_path()
-    if not os.path.exists(pid_file):
-        return None
-        
     try:
-        with open(pid_file, 'r') as f:
+        with open(get_pid_file_path(), 'r') as f:
             pid = int(f.read().strip())
         return pid
+    except FileNotFoundError:
+        return None
     except Exception as e:
         logger.error(f"Error reading PID file: {str(e)}")
         return None
@@ -100,15 +127,14 @@ def delete_pid_file():
     Returns:
         bool: True if successful, False otherwise
     """
-    pid_file = get_pid_file_path()
-    if os.path.exists(pid_file):
-        try:
-            os.remove(pid_file)
-            return True
-        except Exception as e:
-            logger.error(f"Error deleting PID file: {str(e)}")
-            return False
-    return True  # File didn't exist, so deletion is "successful"
+    try:
+        os.remove(get_pid_file_path())
+    except FileNotFoundError:
+        pass  # File didn't exist, so deletion is "successful"
+    except Exception as e:
+        logger.error(f"Error deleting PID file: {str(e)}")
+        return False
+    return True
 
 def is_background_process_running():
     """
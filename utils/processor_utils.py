@@ -6,8 +6,27 @@ import re
 import ipaddress
 import logging
 
+try:
+    import hyperscan
+except ImportError:  # pragma: no cover - optional dependency
+    hyperscan = None
+
 logger = logging.getLogger("utils.processor_utils")
 
+# IPv4 candidate pattern; ASCII digits only so octets can be checked with int()
+_IPV4_PATTERN = r'\b(?:[0-9]{1,3}\.){3}[0-9]{1,3}\b'
+_IPV4_RE = re.compile(_IPV4_PATTERN)
+
+if hyperscan is not None:
+    _IPV4_DB = hyperscan.Database()
+    _IPV4_DB.compile(
+        expressions=[_IPV4_PATTERN.encode("ascii")],
+        ids=[0],
+        flags=[hyperscan.HS_FLAG_SOM_LEFTMOST],
+    )
+else:
+    _IPV4_DB = None
+
 def validate_ip(ip_address):
     """
     Validate if a string is a valid IP address.
@@ -18,6 +37,11 @@ def validate_ip(ip_address):
     Returns:
         bool: True if valid IP address, False otherwise
     """
+    # Plain IPv4 strings are checked directly; anything that could be
+    # IPv6 (or isn't a string) goes through the ipaddress module
+    if isinstance(ip_address, str) and ":" not in ip_address:
+        return _is_valid_ipv4(ip_address)
+    
     try:
         ipaddress.ip_address(ip_address)
         return True
@@ -39,16 +63,66 @@ def extract_ips_from_text(text):
     """
     if not text:
         return []
-        
-    # IPv4 pattern
-    ipv4_pattern = r'\b(?:\d{1,3}\.){3}\d{1,3}\b'
-    ipv4_matches = re.findall(ipv4_pattern, text)
     
-    # Validate the matches using the utility function
+    # Validate the candidates, keeping the first occurrence of each
     ips = []
-    for match in ipv4_matches:
-        if validate_ip(match) and match not in ips:
+    seen = set()
+    for match in _find_ipv4_candidates(text):
+        if match not in seen and _is_valid_ipv4(match):
+            seen.add(match)
             ips.append(match)
             
-    logger.debug(f"Extracted {len(ips)} potential IP addresses from text")
-    return ips
\ No newline at end of file
+    logger.debug("Extracted %d potential IP addresses from text", len(ips))
+    return ips
+
+
+def _find_ipv4_candidates(text):
+    """
+    Find dotted-quad candidates in text.
+    
+    Uses Hyperscan when it is installed and the re module otherwise.
+    Either way, matches are non-overlapping and in order of appearance.
+    
+    Args:
+        text (str): Text to scan
+        
+    Returns:
+        iterable: Candidate strings
+    """
+    if _IPV4_DB is None:
+        return (match.group(0) for match in _IPV4_RE.finditer(text))
+    
+    data = text.encode("utf-8")
+    spans = []
+    
+    def on_match(match_id, start, end, flags, context):
+        # Hyperscan reports every match end; keep non-overlapping ones like findall
+        if not spans or start >= spans[-1][1]:
+            spans.append((start, end))
+    
+    _IPV4_DB.scan(data, match_event_handler=on_match)
+    return [data[start:end].decode("ascii") for start, end in spans]
+
+
+def _is_valid_ipv4(candidate):
+    """
+    Check whether a string is a dotted-quad IPv4 address.
+    
+    Accepts exactly what ipaddress.IPv4Address does: four 1-3 digit
+    octets up to 255, without leading zeros.
+    
+    Args:
+        candidate (str): String to check
+        
+    Returns:
+        bool: True if the string is a valid IPv4 address
+    """
+    octets = candidate.split(".")
+    if len(octets) != 4:
+        return False
+    for octet in octets:
+        if not (0 < len(octet) <= 3 and octet.isascii() and octet.isdigit()):
+            return False
+        if (len(octet) > 1 and octet[0] == "0") or int(octet) > 255:
+            return False
+    return True
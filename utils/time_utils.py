@@ -4,10 +4,33 @@ Utilities for handling time and date operations.
 """
 
 from datetime import datetime
+import functools
 import logging
+from typing import Optional
 
 logger = logging.getLogger("utils.time_utils")
 
+# Supported formats, in the order they are tried
+_FORMATS = (
+    "%Y%m%d %H%M%S.%f",      # Original expected format
+    "%Y-%m-%d %H:%M:%S.%f",   # ISO format with microseconds
+    "%Y-%m-%d %H:%M:%S",      # ISO format without microseconds
+    "%Y-%m-%d %H:%M",         # ISO format without seconds
+    "%Y-%m-%d",               # Just date
+)
+
+# Likely format for a string of a given length, tried before the full list
+_FMT_BY_LEN = {
+    22: "%Y%m%d %H%M%S.%f",
+    26: "%Y-%m-%d %H:%M:%S.%f",
+    19: "%Y-%m-%d %H:%M:%S",
+    16: "%Y-%m-%d %H:%M",
+    10: "%Y-%m-%d",
+}
+
+# Lengths of the ISO variants that datetime.fromisoformat can parse directly
+_ISO_LENGTHS = frozenset((10, 16, 19, 26))
+
 def parse_timestamp(datetime_str):
     """
     Parse a datetime string with flexible format handling.
@@ -24,21 +47,54 @@ def parse_timestamp(datetime_str):
         logger.warning("Empty timestamp string, using current time")
         return datetime.now()
         
-    # Try different formats
-    formats_to_try = [
-        "%Y%m%d %H%M%S.%f",      # Original expected format
-        "%Y-%m-%d %H:%M:%S.%f",   # ISO format with microseconds
-        "%Y-%m-%d %H:%M:%S",      # ISO format without microseconds
-        "%Y-%m-%d %H:%M",         # ISO format without seconds
-        "%Y-%m-%d",               # Just date
-    ]
-    
-    for format_str in formats_to_try:
+    parsed = _parse_known_formats(datetime_str)
+    if parsed is not None:
+        return parsed
+    
+    # If all parsing attempts fail, use current time
+    logger.warning(f"Could not parse timestamp: {datetime_str}, using current time")
+    return datetime.now()
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_known_formats(datetime_str: str) -> Optional[datetime]:
+    """
+    Parse a timestamp in one of the supported formats.
+    
+    Timestamps repeat heavily within a batch, so results are cached.
+    
+    Args:
+        datetime_str: String representation of datetime
+        
+    Returns:
+        Parsed datetime object, or None if no format matches
+    """
+    length = len(datetime_str)
+    
+    # ISO variants go through the C implementation of fromisoformat, which
+    # accepts any date/time separator, so only hand it space-separated strings
+    if (length in _ISO_LENGTHS and datetime_str[4:5] == "-"
+            and (length == 10 or datetime_str[10] == " ")):
+        try:
+            parsed = datetime.fromisoformat(datetime_str)
+            if parsed.tzinfo is None:
+                return parsed
+        except ValueError:
+            pass
+    
+    likely_format = _FMT_BY_LEN.get(length)
+    if likely_format is not None:
+        try:
+            return datetime.strptime(datetime_str, likely_format)
+        except ValueError:
+            pass
+    
+    for format_str in _FORMATS:
+        if format_str == likely_format:
+            continue
         try:
             return datetime.strptime(datetime_str, format_str)
         except ValueError:
             continue
     
-    # If all parsing attempts fail, use current time
-    logger.warning(f"Could not parse timestamp: {datetime_str}, using current time")
-    return datetime.now()
\ No newline at end of file
+    return None
\ No newline at end of file